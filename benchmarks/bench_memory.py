@@ -0,0 +1,67 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Peak memory benchmarks.
+
+asv measures ``peakmem_*`` benchmarks as the peak resident set size of the benchmark process,
+so the results track memory regressions across commits alongside the timing benchmarks.
+The budgets that fail the test suite are in ``tests/test_memory.py``.
+"""
+import nxv
+from nxv._rendering import _root_style, _to_gv
+
+from .graphs import SIZES, graphviz_available, make_graph
+
+
+class SerializeMemory:
+    params = (SIZES, ["DiGraph", "MultiDiGraph"])
+    param_names = ["size", "graph_type"]
+    timeout = 600
+
+    def setup(self, size, graph_type):
+        self.graph = make_graph(size, graph_type=graph_type)
+        self.style = nxv.compose([_root_style, None])
+
+    def peakmem_to_gv(self, size, graph_type):
+        _to_gv(self.graph, self.style)
+
+    def peakmem_to_ordered_graph(self, size, graph_type):
+        nxv.to_ordered_graph(self.graph)
+
+    def peakmem_neighborhood(self, size, graph_type):
+        for _ in nxv.neighborhood(self.graph, [0]).nodes():
+            pass
+
+
+class RenderMemory:
+    params = ([1_000, 10_000, 100_000], ["raw", "svg"])
+    param_names = ["size", "format"]
+    timeout = 600
+
+    def setup(self, size, format):
+        if format != "raw" and not graphviz_available():
+            raise NotImplementedError("GraphViz is not installed.")
+        self.graph = make_graph(size)
+
+    def peakmem_render(self, size, format):
+        nxv.render(self.graph, format=format, algorithm="sfdp")
+
+    def track_child_max_rss(self, size, format):
+        profiles = []
+        nxv.render(self.graph, format=format, algorithm="sfdp", profile=profiles.append)
+        return profiles[0].child_max_rss or 0
+
+    track_child_max_rss.unit = "bytes"
@@ -0,0 +1,93 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmarks for serializing and rendering graphs."""
+import nxv
+from nxv._functional import _apply
+from nxv._rendering import _root_style, _to_gv
+from nxv._util import is_multi_graph
+
+from .graphs import (
+    GRAPH_TYPES,
+    SIZES,
+    graphviz_available,
+    make_graph,
+    make_style,
+    subgraph_func,
+)
+
+
+class Serialize:
+    """Time serializing graphs of every shape to GraphViz strings."""
+
+    params = (
+        SIZES,
+        ["sparse", "dense"],
+        list(GRAPH_TYPES),
+        [False, True],
+        [False, True],
+    )
+    param_names = ["size", "density", "graph_type", "subgraphs", "html_like"]
+    timeout = 600
+
+    def setup(self, size, density, graph_type, subgraphs, html_like):
+        self.graph = make_graph(size, density, graph_type)
+        self.style = nxv.compose([_root_style, make_style(html_like)])
+        self.subgraph_func = subgraph_func if subgraphs else None
+
+    def time_to_gv(self, size, density, graph_type, subgraphs, html_like):
+        _to_gv(self.graph, self.style, subgraph_func=self.subgraph_func)
+
+    def track_gv_bytes(self, size, density, graph_type, subgraphs, html_like):
+        return len(_to_gv(self.graph, self.style, subgraph_func=self.subgraph_func))
+
+
+class StyleEvaluation:
+    """Time evaluating a composed style for every element, without serializing."""
+
+    params = (SIZES, list(GRAPH_TYPES), [False, True])
+    param_names = ["size", "graph_type", "html_like"]
+    timeout = 600
+
+    def setup(self, size, graph_type, html_like):
+        self.graph = make_graph(size, "sparse", graph_type)
+        self.style = nxv.compose([_root_style, make_style(html_like)])
+
+    def time_style(self, size, graph_type, html_like):
+        for u, d in self.graph.nodes(data=True):
+            _apply(self.style.node, u, d)
+        if is_multi_graph(self.graph):
+            edges = self.graph.edges(keys=True, data=True)
+        else:
+            edges = self.graph.edges(data=True)
+        for edge in edges:
+            _apply(self.style.edge, *edge)
+
+
+class Render:
+    """Time end-to-end renders."""
+
+    params = ([1_000, 10_000], ["raw", "svg"])
+    param_names = ["size", "format"]
+    timeout = 600
+
+    def setup(self, size, format):
+        if format != "raw" and not graphviz_available():
+            raise NotImplementedError("GraphViz is not installed.")
+        self.graph = make_graph(size)
+        self.style = make_style()
+
+    def time_render(self, size, format):
+        nxv.render(self.graph, self.style, format=format, algorithm="sfdp")
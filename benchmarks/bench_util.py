@@ -0,0 +1,67 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmarks for the graph utilities."""
+import nxv
+
+from .graphs import SIZES, make_graph
+
+
+class Neighborhood:
+    params = (SIZES, [1, 3, None])
+    param_names = ["size", "radius"]
+    timeout = 600
+
+    def setup(self, size, radius):
+        self.graph = make_graph(size)
+
+    def time_neighborhood(self, size, radius):
+        # Iterate the nodes, since the neighborhood is a lazy view.
+        for _ in nxv.neighborhood(self.graph, [0], radius=radius).nodes():
+            pass
+
+
+class Boundary:
+    params = (SIZES, [1, 100])
+    param_names = ["size", "subgraphs"]
+    timeout = 600
+
+    def setup(self, size, subgraphs):
+        self.graph = make_graph(size)
+        nodes = list(self.graph.nodes())
+        chunk = max(1, len(nodes) // subgraphs)
+        self.subgraphs = [
+            self.graph.subgraph(nodes[i : i + chunk])
+            for i in range(0, len(nodes), chunk)
+        ]
+
+    def time_boundary(self, size, subgraphs):
+        for subgraph in self.subgraphs:
+            nxv.boundary(self.graph, subgraph)
+
+    def time_boundaries(self, size, subgraphs):
+        nxv.boundaries(self.graph, self.subgraphs)
+
+
+class ToOrderedGraph:
+    params = (SIZES, ["DiGraph", "MultiDiGraph"])
+    param_names = ["size", "graph_type"]
+    timeout = 600
+
+    def setup(self, size, graph_type):
+        self.graph = make_graph(size, graph_type=graph_type)
+
+    def time_to_ordered_graph(self, size, graph_type):
+        nxv.to_ordered_graph(self.graph)
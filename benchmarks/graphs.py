@@ -0,0 +1,122 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Synthetic graphs and styles for the benchmarks."""
+import random
+import shutil
+
+import networkx as nx
+
+import nxv
+import nxv.html_like as H
+
+# The number of elements (nodes plus edges) in the benchmark graphs.
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+GRAPH_TYPES = {
+    "DiGraph": nx.DiGraph,
+    "MultiDiGraph": nx.MultiDiGraph,
+}
+
+# The mean out-degree of each node for each density.
+DEGREES = {"sparse": 2, "dense": 16}
+
+
+def make_graph(size, density="sparse", graph_type="DiGraph", seed=0):
+    """
+    Create a random graph with about ``size`` elements.
+
+    :param size: The number of nodes plus edges.
+    :param density: ``"sparse"`` or ``"dense"``.
+    :param graph_type: A key of :data:`GRAPH_TYPES`.
+    :param seed: The random seed.
+    :return: A graph whose nodes have ``group`` and ``weight`` attributes and whose edges have ``weight`` attributes.
+    """
+    rng = random.Random(seed)
+    degree = DEGREES[density]
+    n = max(2, size // (degree + 1))
+    graph = GRAPH_TYPES[graph_type]()
+    graph.add_nodes_from(
+        (u, {"group": u % 32, "weight": rng.random()}) for u in range(n)
+    )
+    graph.add_edges_from(
+        (rng.randrange(n), rng.randrange(n), {"weight": rng.random()})
+        for _ in range(size - n)
+    )
+    return graph
+
+
+def subgraph_func(u, d):
+    return d["group"]
+
+
+def make_style(html_like=False):
+    """
+    Create a style with several composed layers, like a typical application style.
+
+    :param html_like: Whether the nodes should have HTML-like table labels.
+    :return: The style.
+    """
+    if html_like:
+
+        def label(u, d):
+            return H.table(
+                [
+                    H.table_row([H.table_cell(H.bold("id")), H.table_cell(u)]),
+                    H.table_row([H.table_cell("group"), H.table_cell(d["group"])]),
+                    H.table_row(
+                        [H.table_cell("weight"), H.table_cell(f"{d['weight']:.3f}")]
+                    ),
+                ],
+                attributes={"BORDER": 0},
+            )
+
+    else:
+
+        def label(u, d):
+            return f"{u}\n{d['group']}"
+
+    return nxv.compose(
+        [
+            nxv.styles.font("Helvetica", 10),
+            nxv.Style(
+                graph={"overlap": "false"},
+                node=nxv.chain(
+                    [
+                        {"shape": "box"},
+                        lambda u, d: {"label": label(u, d)},
+                        nxv.switch(
+                            lambda u, d: d["group"] % 3,
+                            {0: {"color": "red"}, 1: {"color": "blue"}},
+                            default={"color": "black"},
+                        ),
+                    ]
+                ),
+                edge=lambda u, v, *rest: {"penwidth": 1 + 2 * rest[-1]["weight"]},
+                subgraph=lambda s: {"name": f"cluster_{s}", "label": str(s)},
+            ),
+        ]
+    )
+
+
+def graphviz_available():
+    """Get whether a GraphViz installation is available to the end-to-end benchmarks."""
+    try:
+        from nxv import _graphviz
+
+        _graphviz.get_graphviz_algorithm_path(None, "dot")
+    except Exception:
+        return shutil.which("dot") is not None
+    return True
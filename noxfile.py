@@ -18,7 +18,7 @@ import tempfile
 
 import nox
 
-SOURCES = "src", "tests", "noxfile.py", "docs/conf.py"
+SOURCES = "src", "tests", "benchmarks", "noxfile.py", "docs/conf.py"
 
 nox.options.sessions = "lint", "tests", "docs"
 
@@ -70,6 +70,16 @@ def coverage(session):
     session.run("codecov", *session.posargs)
 
 
+@nox.session()
+def benchmarks(session):
+    """Run the benchmark suite against the current commit, or pass asv arguments."""
+    args = session.posargs or ["run", "--python=same", "--set-commit-hash=HEAD"]
+    install_with_constraints(session, "asv", "virtualenv")
+    session.run("poetry", "install", external=True)
+    session.run("asv", "machine", "--yes")
+    session.run("asv", *args)
+
+
 @nox.session()
 def docs(session):
     """Build the documentation."""
@@ -20,11 +20,61 @@ __maintainer__ = "Timothy Shields"
 __email__ = "Timothy.Shields@twosigma.com"
 __version__ = "0.1.3"
 
-from nxv import html_like, styles
-from nxv._functional import chain, switch
-from nxv._rendering import render
-from nxv._style import Style, compose
-from nxv._util import boundary, contrasting_color, neighborhood, to_ordered_graph
+import importlib
+import sys
+
+# The public attributes that are imported from submodules on first use, by the module that defines them.
+# This keeps ``import nxv`` fast, since NetworkX and the rendering code are only imported when they are needed.
+_LAZY_ATTRIBUTES = {
+    "html_like": "nxv.html_like",
+    "serve": "nxv.serve",
+    "styles": "nxv.styles",
+    "render_frame": "nxv._arrays",
+    "render_sparse": "nxv._arrays",
+    "BackgroundRender": "nxv._background",
+    "render_background": "nxv._background",
+    "render_progressive": "nxv._background",
+    "Renderer": "nxv._renderer",
+    "canonical_gv": "nxv._canonical",
+    "fingerprint": "nxv._canonical",
+    "chain": "nxv._functional",
+    "switch": "nxv._functional",
+    "GraphVizInstallation": "nxv._graphviz",
+    "IncrementalRenderer": "nxv._incremental",
+    "RenderProfile": "nxv._profile",
+    "StyleProfiler": "nxv._profile",
+    "add_render_hook": "nxv._profile",
+    "remove_render_hook": "nxv._profile",
+    "animate_svg": "nxv._sequence",
+    "render_sequence": "nxv._sequence",
+    "render": "nxv._rendering",
+    "render_edges": "nxv._rendering",
+    "render_iter": "nxv._rendering",
+    "optimize_svg": "nxv._svg",
+    "Style": "nxv._style",
+    "compose": "nxv._style",
+    "boundaries": "nxv._util",
+    "boundary": "nxv._util",
+    "contrasting_color": "nxv._util",
+    "contrasting_colors": "nxv._util",
+    "neighborhood": "nxv._util",
+    "reduce": "nxv._reduce",
+    "to_ordered_graph": "nxv._util",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name)
+    value = module if module_name == f"{__name__}.{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 
 class GraphVizError(Exception):
@@ -39,19 +89,57 @@ class GraphVizAlgorithmNotFoundError(Exception):
     """Raised when a `GraphViz`_ algorithm is not found."""
 
 
+class GraphVizFormatNotFoundError(Exception):
+    """Raised when a `GraphViz`_ output format is not supported by the `GraphViz`_ installation."""
+
+
+class GraphVizAttributeError(Exception):
+    """Raised when a style gives an element an attribute that `GraphViz`_ does not support, or an invalid value."""
+
+
 __all__ = [
     "render",
+    "render_edges",
+    "render_iter",
+    "render_frame",
+    "render_sparse",
+    "IncrementalRenderer",
+    "render_sequence",
+    "animate_svg",
+    "render_background",
+    "render_progressive",
+    "BackgroundRender",
+    "Renderer",
+    "canonical_gv",
+    "fingerprint",
+    "optimize_svg",
+    "RenderProfile",
+    "add_render_hook",
+    "remove_render_hook",
+    "StyleProfiler",
     "Style",
     "compose",
     "chain",
     "switch",
     "neighborhood",
     "boundary",
+    "boundaries",
+    "reduce",
     "to_ordered_graph",
     "contrasting_color",
+    "contrasting_colors",
     "styles",
     "html_like",
+    "serve",
     "GraphVizInstallationNotFoundError",
     "GraphVizAlgorithmNotFoundError",
+    "GraphVizFormatNotFoundError",
+    "GraphVizAttributeError",
+    "GraphVizInstallation",
     "GraphVizError",
 ]
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module __getattr__ is not supported before Python 3.7, so import everything eagerly.
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
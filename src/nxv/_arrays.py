@@ -0,0 +1,305 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Rendering of graphs stored as pandas DataFrames and SciPy sparse matrices."""
+import itertools
+from typing import Optional, Union
+
+from nxv import _profile
+from nxv._rendering import (
+    EDGE_OPERATORS,
+    _block,
+    _check_graphviz,
+    _graph_attrs_declaration,
+    _graph_identifier,
+    _render_gv,
+    _resolve_algorithm,
+    _resolve_format,
+    _to_gv_string,
+)
+
+
+def _escape(strings):
+    """Vectorized equivalent of the escaping in :func:`nxv._rendering._to_gv_string`."""
+    return (
+        strings.str.replace("\\", "\\\\", regex=False)
+        .str.replace('"', '\\"', regex=False)
+        .str.replace(chr(0), "", regex=False)
+        .str.replace(chr(26), "", regex=False)
+    )
+
+
+def _attribute_strings(name, column):
+    """
+    Convert a column of attribute values to ``name="value"`` strings.
+
+    String, numeric, and boolean columns are converted with vectorized string operations.
+    Object columns, which may hold colors as channel tuples or HTML-like labels,
+    are converted value by value. Missing values become empty strings, so the attribute is omitted.
+
+    :return: A pandas ``Series`` of strings.
+    """
+    import pandas as pd
+
+    missing = column.isna()
+    if column.dtype == object:
+        strings = column.map(
+            lambda value: f"{name}={_to_gv_string(value, attribute=name)}",
+            na_action="ignore",
+        )
+    else:
+        strings = f'{name}="' + _escape(column.astype(str)) + '"'
+    return pd.Series(strings, index=column.index, dtype=object).where(~missing, "")
+
+
+def _attribute_lists(frame, columns):
+    """
+    Join the attribute strings of the given columns of a frame into ``[...]`` attribute lists.
+
+    :return: A pandas ``Series`` of strings.
+    """
+    import pandas as pd
+
+    joined = pd.Series("", index=frame.index, dtype=object)
+    for name in columns:
+        strings = _attribute_strings(name, frame[name])
+        joined = joined + (", " + strings).where(strings != "", "")
+    return "[" + joined.str[2:] + "]"
+
+
+def _node_ids(count):
+    import numpy as np
+    import pandas as pd
+
+    return "node" + pd.Series(np.arange(count)).astype(str).str.zfill(4)
+
+
+def _serialize_frames(nodes, edges, source, target, directed, graph_attrs):
+    """
+    Serialize node and edge frames as a `GraphViz`_ string.
+
+    :return: A tuple ``(gv, node_count, edge_count)``.
+    """
+    import pandas as pd
+
+    graph_attrs = dict(graph_attrs or {})
+    graph_type = graph_attrs.get("type", "digraph" if directed else "graph")
+    assert graph_type in {"graph", "digraph"}
+
+    if nodes is None:
+        nodes = pd.DataFrame(index=pd.Index([]))
+    if edges is None:
+        edges = pd.DataFrame({source: [], target: []})
+    endpoints = pd.Index(pd.unique(pd.concat([edges[source], edges[target]])))
+    extra = endpoints.difference(nodes.index, sort=False)
+    if len(extra):
+        nodes = pd.concat([nodes, pd.DataFrame(index=extra)])
+    labels = pd.Series(nodes.index.astype(str), index=nodes.index, dtype=object)
+    if "label" in nodes.columns:
+        labels = nodes["label"].astype(object).where(nodes["label"].notna(), labels)
+    nodes = nodes.assign(label=labels)
+    node_columns = ["label"] + [c for c in nodes.columns if c != "label"]
+
+    ids = _node_ids(len(nodes))
+    node_lines = ids + " " + _attribute_lists(nodes, node_columns).values + ";"
+
+    positions = nodes.index.get_indexer
+    sources = ids.values[positions(edges[source])]
+    targets = ids.values[positions(edges[target])]
+    edge_columns = [c for c in edges.columns if c not in (source, target)]
+    edge_lines = (
+        pd.Series(sources, dtype=object)
+        + f" {EDGE_OPERATORS[graph_type]} "
+        + targets
+        + " "
+        + _attribute_lists(edges, edge_columns).values
+        + ";"
+    )
+
+    lines = itertools.chain(
+        [_graph_attrs_declaration(graph_attrs)],
+        node_lines.tolist(),
+        edge_lines.tolist(),
+    )
+    prefix = _graph_identifier(graph_type, graph_attrs.get("name", "G"))
+    return "\n".join(_block(prefix, lines)), len(nodes), len(edges)
+
+
+def _render_frames(
+    nodes,
+    edges,
+    *,
+    source,
+    target,
+    directed,
+    graph_attrs,
+    algorithm,
+    format,
+    graphviz_bin,
+    output,
+    profile,
+):
+    algorithm = _resolve_algorithm(algorithm)
+    format, graphviz_format = _resolve_format(format)
+    _check_graphviz(algorithm, graphviz_format, graphviz_bin)
+
+    profiler = _profile.start(profile, algorithm=algorithm, format=format)
+    with _profile.phase(profiler, "serialize"):
+        gv, node_count, edge_count = _serialize_frames(
+            nodes, edges, source, target, directed, graph_attrs
+        )
+
+    return _render_gv(
+        gv,
+        algorithm=algorithm,
+        format=format,
+        graphviz_format=graphviz_format,
+        graphviz_bin=graphviz_bin,
+        profiler=profiler,
+        profile=profile,
+        counts={"nodes": node_count, "edges": edge_count},
+        output=output,
+    )
+
+
+def render_frame(
+    nodes=None,
+    edges=None,
+    *,
+    source: str = "source",
+    target: str = "target",
+    directed: bool = True,
+    graph_attrs: Optional[dict] = None,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    output=None,
+    profile=False,
+) -> Optional[Union[bytes, str]]:
+    """
+    Render a graph stored as `pandas`_ DataFrames using `GraphViz`_, without building a `NetworkX`_ graph.
+
+    The columns of the frames are `GraphViz attributes`_: each column is converted to attribute strings at once
+    with vectorized string operations, rather than row by row through a style.
+    Missing values omit the attribute. Columns of dtype ``object`` are converted value by value,
+    so they may hold colors as RGB or RGBA channel tuples and HTML-like labels.
+    Like the root style of :func:`~nxv.render`, nodes without a ``label`` value are labeled by their index.
+
+    This requires `pandas`_.
+
+    :param nodes: An optional DataFrame indexed by node, whose columns are node attributes.
+    :param edges: An optional DataFrame with one row per edge. The ``source`` and ``target`` columns hold the
+                  endpoints of the edges, and the other columns are edge attributes.
+                  Endpoints missing from ``nodes`` are added as nodes without attributes.
+    :param source: The name of the column holding the source of each edge.
+    :param target: The name of the column holding the target of each edge.
+    :param directed: Whether the edges are directed.
+    :param graph_attrs: An optional dict of graph attributes.
+    :param algorithm: The `GraphViz`_ layout algorithm, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param output: An optional file path or binary file object to write the render output to,
+                   as in :func:`~nxv.render`.
+    :param profile: Whether to profile the render, as in :func:`~nxv.render`.
+    :return: If ``format`` is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+             otherwise, ``None``.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    """
+    return _render_frames(
+        nodes,
+        edges,
+        source=source,
+        target=target,
+        directed=directed,
+        graph_attrs=graph_attrs,
+        algorithm=algorithm,
+        format=format,
+        graphviz_bin=graphviz_bin,
+        output=output,
+        profile=profile,
+    )
+
+
+def render_sparse(
+    adjacency,
+    nodes=None,
+    *,
+    weight: Optional[str] = None,
+    directed: bool = True,
+    graph_attrs: Optional[dict] = None,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    output=None,
+    profile=False,
+) -> Optional[Union[bytes, str]]:
+    """
+    Render a graph stored as a `SciPy`_ sparse adjacency matrix using `GraphViz`_,
+    without building a `NetworkX`_ graph.
+
+    Node ``i`` is row and column ``i`` of the matrix, and each stored entry ``(i, j)`` is an edge.
+    If the graph is undirected, only the entries on or above the diagonal are edges.
+
+    This requires `pandas`_ and `SciPy`_.
+
+    :param adjacency: A square `SciPy`_ sparse matrix, or an array-like convertible to one.
+    :param nodes: An optional DataFrame of node attributes, indexed by node number, as in :func:`~nxv.render_frame`.
+    :param weight: The name of an edge attribute to set to the stored value of each entry, like ``"penwidth"``.
+                   If ``None``, the stored values are ignored.
+    :param directed: Whether the edges are directed.
+    :param graph_attrs: An optional dict of graph attributes.
+    :param algorithm: The `GraphViz`_ layout algorithm, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param output: An optional file path or binary file object to write the render output to,
+                   as in :func:`~nxv.render`.
+    :param profile: Whether to profile the render, as in :func:`~nxv.render`.
+    :return: If ``format`` is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+             otherwise, ``None``.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    """
+    import pandas as pd
+    import scipy.sparse
+
+    adjacency = scipy.sparse.coo_matrix(adjacency)
+    assert adjacency.shape[0] == adjacency.shape[1]
+    if not directed:
+        adjacency = scipy.sparse.triu(adjacency, format="coo")
+    edges = {"source": adjacency.row, "target": adjacency.col}
+    if weight is not None:
+        edges[weight] = adjacency.data
+    if nodes is None:
+        nodes = pd.DataFrame(index=pd.RangeIndex(adjacency.shape[0]))
+    else:
+        nodes = nodes.reindex(pd.RangeIndex(adjacency.shape[0]))
+    return _render_frames(
+        nodes,
+        pd.DataFrame(edges),
+        source="source",
+        target="target",
+        directed=directed,
+        graph_attrs=graph_attrs,
+        algorithm=algorithm,
+        format=format,
+        graphviz_bin=graphviz_bin,
+        output=output,
+        profile=profile,
+    )
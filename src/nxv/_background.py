@@ -0,0 +1,339 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Rendering in a background thread, for notebooks that should not block on `GraphViz`_."""
+import os
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from nxv import _graphviz, _ipython
+from nxv._rendering import (
+    _render,
+    _resolve_algorithm,
+    _resolve_format,
+    _root_style,
+    _to_gv,
+)
+from nxv._style import Style, compose
+
+# The size of SVG output above which background renders switch to PNG, since notebook frontends
+# become unresponsive when displaying very large SVGs.
+PNG_THRESHOLD = 5 * 1024 * 1024
+
+# The stages of a progressive render, in order.
+STAGES = ("coarse", "full")
+
+# Overrides for the coarse stage of a progressive render: straight edges, no labels, and no overlap removal.
+COARSE_STYLE = Style(
+    graph={
+        "splines": "false",
+        "overlap": "true",
+        "outputorder": "edgesfirst",
+    },
+    node={"label": "", "xlabel": "", "shape": "point", "width": 0.05},
+    edge={"label": "", "headlabel": "", "taillabel": "", "xlabel": ""},
+)
+
+# The graph attributes that cut the layout work of the coarse stage, for each layout algorithm,
+# since each algorithm honors different limits.
+COARSE_LIMITS = {
+    "sfdp": {"quadtree": "fast", "levels": 4, "smoothing": "none"},
+    "neato": {"maxiter": 50, "epsilon": 0.01},
+    "fdp": {"maxiter": 50},
+    "dot": {"nslimit": 1, "nslimit1": 1, "mclimit": 0.1, "searchsize": 5},
+}
+
+
+class BackgroundRender:
+    """
+    A render running in a background thread, as returned by :func:`~nxv.render_background`
+    and :func:`~nxv.render_progressive`.
+
+    :ivar handle: The IPython display handle showing the render, or ``None`` outside IPython formats.
+    :ivar output_format: The `GraphViz`_ format of the output once the render is done,
+                         which is ``"png"`` if SVG output was too large.
+    """
+
+    def __init__(self, handle, cancellation, future):
+        self.handle = handle
+        self.output_format = None
+        self._cancellation = cancellation
+        self._future = future
+
+    def cancel(self) -> bool:
+        """
+        Cancel the render, killing its `GraphViz`_ process.
+
+        :return: Whether the render was cancelled, which is ``False`` if it was already done.
+        """
+        if self._future.done():
+            return False
+        self._cancellation.cancel()
+        return True
+
+    def cancelled(self) -> bool:
+        """Returns whether the render was cancelled."""
+        return self._cancellation.cancelled
+
+    def done(self) -> bool:
+        """Returns whether the render finished, failed, or was cancelled."""
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Union[bytes, str]:
+        """
+        Wait for the render to finish.
+
+        :param timeout: The maximum number of seconds to wait, or ``None`` to wait indefinitely.
+        :return: The render output.
+        :raises concurrent.futures.TimeoutError: If the render did not finish in time.
+        :raises concurrent.futures.CancelledError: If the render was cancelled.
+        :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+        """
+        return self._future.result(timeout)
+
+
+def _render_output(
+    gv, algorithm, graphviz_format, graphviz_bin, png_threshold, cancellation
+):
+    """
+    Run `GraphViz`_ on a `GraphViz`_ string, falling back to PNG if SVG output is too large.
+
+    The layout is computed once, as positioned DOT, so falling back to PNG only repeats the drawing.
+
+    :return: A tuple ``(output, output_format)``.
+    """
+    if graphviz_format != "svg" or png_threshold is None:
+        output = _graphviz.run(
+            gv, algorithm, graphviz_format, graphviz_bin, cancellation=cancellation
+        )
+        return output, graphviz_format
+    layout = _graphviz.run(
+        gv, algorithm, "dot", graphviz_bin, cancellation=cancellation
+    ).decode("utf-8")
+    for output_format in ["svg", "png"]:
+        output = _graphviz.run(
+            layout,
+            "neato",
+            output_format,
+            graphviz_bin,
+            args=["-n2"],
+            cancellation=cancellation,
+        )
+        if len(output) <= png_threshold:
+            break
+    return output, output_format
+
+
+def render_background(
+    graph,
+    style: Optional[Style] = None,
+    *,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    subgraph_func=None,
+    png_threshold: Optional[int] = PNG_THRESHOLD,
+    placeholder: str = "Rendering...",
+) -> BackgroundRender:
+    """
+    Render a `NetworkX`_ graph using `GraphViz`_ in a background thread, without blocking.
+
+    With an ``"ipython/*"`` format, a placeholder is displayed immediately
+    and is replaced by the render output when it is done, or by an error message if it fails or is cancelled.
+    The graph should not be modified until the render is done.
+
+    :param graph: A `NetworkX`_ graph.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param algorithm: The `GraphViz`_ layout algorithm, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key, as in :func:`~nxv.render`.
+    :param png_threshold: The size in bytes above which SVG output is replaced by PNG output,
+                          or ``None`` to always keep SVG output.
+    :param placeholder: The text to display until the render is done.
+    :return: A :class:`~nxv.BackgroundRender` to wait for or cancel the render with.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    """
+    algorithm = _resolve_algorithm(algorithm)
+    format, graphviz_format = _resolve_format(format)
+    if graphviz_format != "raw":
+        # The installation is resolved before the thread starts, so that errors are raised here.
+        path = _graphviz.get_graphviz_algorithm_path(graphviz_bin, algorithm)
+        graphviz_bin = os.path.dirname(path)
+    is_ipython_format = format != graphviz_format
+    handle = _ipython.display_placeholder(placeholder) if is_ipython_format else None
+    cancellation = _graphviz.Cancellation()
+    future = Future()
+    future.set_running_or_notify_cancel()
+    background_render = BackgroundRender(handle, cancellation, future)
+
+    def work():
+        try:
+            gv = _to_gv(graph, compose([_root_style, style]), subgraph_func)
+            if graphviz_format == "raw":
+                output, output_format = gv, "raw"
+            else:
+                output, output_format = _render_output(
+                    gv,
+                    algorithm,
+                    graphviz_format,
+                    graphviz_bin,
+                    png_threshold,
+                    cancellation,
+                )
+            cancellation.check()
+        except BaseException as e:
+            if handle is not None:
+                message = "Cancelled." if cancellation.cancelled else f"Failed: {e}"
+                _ipython.update_display(handle, message, None)
+            future.set_exception(e)
+            return
+        background_render.output_format = output_format
+        if handle is not None:
+            _ipython.update_display(handle, output, f"ipython/{output_format}")
+        future.set_result(output)
+
+    threading.Thread(target=work, daemon=True).start()
+    return background_render
+
+
+def _iter_stages(
+    graph,
+    style,
+    algorithm,
+    format,
+    graphviz_bin,
+    subgraph_func,
+    coarse_algorithm,
+    cancellation,
+    handle,
+):
+    """
+    Render the stages of a progressive render in order.
+
+    :param handle: The IPython display handle to show each stage in, or ``None``.
+    :return: Generates ``(stage, output)`` pairs.
+    """
+    stages = {
+        "coarse": dict(
+            style=compose(
+                [
+                    style,
+                    COARSE_STYLE,
+                    Style(graph=COARSE_LIMITS.get(coarse_algorithm, {})),
+                ]
+            ),
+            algorithm=coarse_algorithm,
+            subgraph_func=None,
+        ),
+        "full": dict(style=style, algorithm=algorithm, subgraph_func=subgraph_func),
+    }
+    for stage in STAGES:
+        output = _render(
+            graph,
+            format=format,
+            graphviz_bin=graphviz_bin,
+            node_order=None,
+            edge_order=None,
+            sort_attributes=False,
+            optimize=False,
+            output=None,
+            profile=False,
+            stream=False,
+            cancellation=cancellation,
+            **stages[stage],
+        )
+        if handle is not None:
+            _ipython.update_display(handle, output, f"ipython/{format}")
+        yield stage, output
+
+
+def render_progressive(
+    graph,
+    style: Optional[Style] = None,
+    *,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    subgraph_func=None,
+    coarse_algorithm: str = "sfdp",
+    callback: Optional[Callable[[str, Union[bytes, str]], None]] = None,
+) -> Union[Iterator[Tuple[str, Union[bytes, str]]], BackgroundRender]:
+    """
+    Render a `NetworkX`_ graph progressively: first a fast, rough picture, and then the exact one.
+
+    The ``"coarse"`` stage renders the graph with ``coarse_algorithm``, straight edges, no labels,
+    no overlap removal, and lower layout limits, on top of the given style. The limits depend on the algorithm,
+    such as the fast quadtree approximation of ``sfdp`` and fewer iterations of ``neato``.
+    The ``"full"`` stage renders the graph exactly as :func:`~nxv.render` would.
+    With an ``"ipython/*"`` format, each stage replaces the previous one in a single display.
+
+    :param graph: A `NetworkX`_ graph.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param algorithm: The `GraphViz`_ layout algorithm of the full stage, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key, as in :func:`~nxv.render`.
+                          Subgraphs are only rendered in the full stage.
+    :param coarse_algorithm: The `GraphViz`_ layout algorithm of the coarse stage.
+    :param callback: An optional function ``f(stage, output)`` called with the output of each stage.
+                     If given, the stages are rendered in a background thread.
+    :return: Without a ``callback``, an iterator of ``(stage, output)`` pairs that renders each stage
+             when it is requested. With a ``callback``, a :class:`~nxv.BackgroundRender`
+             whose result is the output of the full stage.
+    """
+    algorithm = _resolve_algorithm(algorithm)
+    format, graphviz_format = _resolve_format(format)
+    # The placeholder is displayed by the calling thread, so it is attached to the current cell.
+    handle = None
+    if format != graphviz_format:
+        handle = _ipython.display_placeholder("Rendering...")
+    cancellation = None if callback is None else _graphviz.Cancellation()
+    stages = _iter_stages(
+        graph,
+        style,
+        algorithm,
+        graphviz_format,
+        graphviz_bin,
+        subgraph_func,
+        coarse_algorithm,
+        cancellation,
+        handle,
+    )
+    if callback is None:
+        return stages
+
+    future = Future()
+    future.set_running_or_notify_cancel()
+    background_render = BackgroundRender(handle, cancellation, future)
+
+    def work():
+        try:
+            for stage, output in stages:
+                cancellation.check()
+                callback(stage, output)
+        except BaseException as e:
+            if handle is not None:
+                message = "Cancelled." if cancellation.cancelled else f"Failed: {e}"
+                _ipython.update_display(handle, message, None)
+            future.set_exception(e)
+            return
+        background_render.output_format = graphviz_format
+        future.set_result(output)
+
+    threading.Thread(target=work, daemon=True).start()
+    return background_render
@@ -0,0 +1,145 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Canonical serialization and fingerprinting of styled graphs."""
+import hashlib
+from typing import Optional
+
+from nxv._functional import _apply
+from nxv._rendering import (
+    EDGE_OPERATORS,
+    _attributes_modifier,
+    _edges,
+    _graph_attrs_declaration,
+    _graph_identifier,
+    _graph_type,
+    _group_by_subgraph,
+    _indent,
+    _root_style,
+    _subgraph_declaration,
+)
+from nxv._style import Style, compose
+
+_DIGEST_SIZE = 32
+_DIGEST_MODULUS = 2 ** (8 * _DIGEST_SIZE)
+
+
+def _canonical_parts(graph, style, subgraph_func):
+    """
+    Serializes a graph in canonical form, split into its header and its edges.
+
+    Nodes are ordered by their rendered attributes and then by ``repr``, and are assigned ids in that order.
+    Subgraphs are ordered by their first node.
+    The endpoints of undirected edges are ordered by node id.
+    The edges are generated in graph order, since their canonical order is just the order of their lines.
+
+    :return: A tuple ``(prefix, lines, edge_lines)`` where ``prefix`` is the graph identifier,
+             ``lines`` is a list of the lines before the edges, and ``edge_lines`` generates the edge lines.
+    """
+    style = compose([_root_style, style])
+    graph_attrs = _apply(style.graph, graph, graph.graph)
+    graph_type = _graph_type(graph, graph_attrs)
+    edge_str = EDGE_OPERATORS[graph_type]
+    directed = graph_type == "digraph"
+
+    node_attrs = {}
+    keys = {}
+    for u, d in graph.nodes(data=True):
+        node_attrs[u] = _attributes_modifier(_apply(style.node, u, d), sort=True)
+        keys[u] = (node_attrs[u], repr(u))
+    nodes = sorted(graph.nodes(data=True), key=lambda node: keys[node[0]])
+    ranks = {u: i for i, (u, _) in enumerate(nodes)}
+    ids = {u: f"node{i:04}" for u, i in ranks.items()}
+    no_subgraph_nodes, subgraph_nodes = _group_by_subgraph(nodes, subgraph_func)
+
+    def node_declaration(u):
+        return f"{ids[u]} {node_attrs[u]};"
+
+    lines = [_graph_attrs_declaration(graph_attrs, sort=True)]
+    lines.extend(node_declaration(u) for u, _ in no_subgraph_nodes)
+    for subgraph, nodes in subgraph_nodes.items():
+        lines.extend(
+            _subgraph_declaration(
+                subgraph,
+                _apply(style.subgraph, subgraph),
+                (node_declaration(u) for u, _ in nodes),
+                sort=True,
+            )
+        )
+
+    def edge_lines():
+        for edge in _edges(graph):
+            u, v = edge[:2]
+            if not directed and ranks[v] < ranks[u]:
+                u, v = v, u
+            edge_attrs_str = _attributes_modifier(_apply(style.edge, *edge), sort=True)
+            yield f"{ids[u]} {edge_str} {ids[v]} {edge_attrs_str};"
+
+    prefix = _graph_identifier(graph_type, graph_attrs.get("name", "G"))
+    return prefix, lines, edge_lines()
+
+
+def canonical_gv(graph, style: Optional[Style] = None, *, subgraph_func=None) -> str:
+    """
+    Serialize a `NetworkX`_ graph as a canonical `GraphViz`_ string.
+
+    Unlike the output of ``nxv.render(graph, style, format="raw")``,
+    the canonical string does not depend on the insertion order of the nodes and edges
+    or on the order of the attributes returned by the style.
+    Nodes are ordered by their `GraphViz attributes`_, with ties broken by ``repr``,
+    and edges are ordered by their serialized form.
+
+    :param graph: A `NetworkX`_ graph.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
+                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+    :return: The canonical `GraphViz`_ string.
+    """
+    prefix, lines, edge_lines = _canonical_parts(graph, style, subgraph_func)
+    lines.extend(sorted(edge_lines))
+    return "\n".join([prefix + " {", *map(_indent, lines), "}"])
+
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE)
+
+
+def fingerprint(graph, style: Optional[Style] = None, *, subgraph_func=None) -> str:
+    """
+    Compute a fingerprint identifying the picture that rendering a `NetworkX`_ graph would produce.
+
+    Two graphs have the same fingerprint when they have the same :func:`~nxv.canonical_gv`,
+    so the fingerprint is suitable as a cache key for render results across processes and runs.
+    It is computed in a single pass over the edges, without building the `GraphViz`_ string:
+    each edge line is hashed on its own and the edge hashes are combined by addition,
+    which does not depend on their order.
+
+    :param graph: A `NetworkX`_ graph.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
+                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+    :return: The fingerprint as a hex string.
+    """
+    prefix, lines, edge_lines = _canonical_parts(graph, style, subgraph_func)
+    result = _hash(prefix.encode("utf-8"))
+    for line in lines:
+        result.update(b"\n")
+        result.update(line.encode("utf-8"))
+    edges_sum = 0
+    for line in edge_lines:
+        edges_sum += int.from_bytes(_hash(line.encode("utf-8")).digest(), "big")
+    result.update(b"\n")
+    result.update((edges_sum % _DIGEST_MODULUS).to_bytes(_DIGEST_SIZE, "big"))
+    return result.hexdigest()
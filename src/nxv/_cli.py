@@ -0,0 +1,333 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""The ``python -m nxv`` command-line renderer."""
+import argparse
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+INPUT_FORMATS = {
+    ".graphml": "graphml",
+    ".xml": "graphml",
+    ".json": "json",
+    ".edgelist": "edgelist",
+    ".edges": "edgelist",
+    ".txt": "edgelist",
+}
+
+SKIP_MODES = ("never", "mtime", "hash")
+
+
+def _non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value!r} is negative.")
+    return number
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m nxv",
+        description="Render graph files using GraphViz.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Graph files, directories of graph files, or - to read a graph from stdin.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="The output file for a single input, or the output directory for many inputs. "
+        "Defaults to writing each output next to its input, or to stdout for stdin.",
+    )
+    parser.add_argument(
+        "-f", "--format", default="svg", help="The GraphViz output format, or raw."
+    )
+    parser.add_argument(
+        "-a", "--algorithm", default="dot", help="The GraphViz layout algorithm."
+    )
+    parser.add_argument(
+        "-s",
+        "--style",
+        help="A style to import, as module.path:attribute. "
+        "The attribute may be a Style or a function returning one, and defaults to style.",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=sorted(set(INPUT_FORMATS.values())),
+        help="The input format. Defaults to detecting it from the file extension.",
+    )
+    parser.add_argument(
+        "--directed",
+        action="store_true",
+        help="Read edge lists as directed graphs.",
+    )
+    parser.add_argument("--graphviz-bin", help="The GraphViz bin directory.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_non_negative_int,
+        default=1,
+        help="The number of graphs to render in parallel. 0 means one per CPU.",
+    )
+    parser.add_argument(
+        "--skip",
+        choices=SKIP_MODES,
+        default="never",
+        help="Skip outputs that are up to date: by modification time, "
+        "or by a hash of the input and options stored next to the output.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report progress."
+    )
+    return parser
+
+
+def _output_extension(format):
+    return ".gv" if format == "raw" else "." + format.split(":", 1)[0]
+
+
+def _input_format(path, input_format):
+    if input_format:
+        return input_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in INPUT_FORMATS:
+        raise ValueError(
+            f"Cannot detect the format of {path}. Use the --input-format option."
+        )
+    return INPUT_FORMATS[extension]
+
+
+def _read_graph(data, input_format, directed):
+    import networkx as nx
+
+    if input_format == "json":
+        return nx.node_link_graph(json.loads(data.decode("utf-8")))
+    if input_format == "graphml":
+        return nx.read_graphml(io.BytesIO(data))
+    create_using = nx.DiGraph if directed else nx.Graph
+    return nx.read_edgelist(io.BytesIO(data), create_using=create_using)
+
+
+def _load_style(spec):
+    """
+    Import a style from a spec like ``module.path:attribute``.
+
+    :return: A tuple ``(style, path)``, where ``path`` is the file of the module, if any.
+    """
+    from nxv import Style
+
+    if not spec:
+        return None, None
+    module_name, _, attribute = spec.partition(":")
+    module = importlib.import_module(module_name)
+    style = getattr(module, attribute or "style")
+    if callable(style) and not isinstance(style, Style):
+        style = style()
+    return style, getattr(module, "__file__", None)
+
+
+def _hash_path(output):
+    return output + ".sha256"
+
+
+def _digest(data, options, style_path):
+    from nxv import __version__
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([__version__, options], sort_keys=True).encode("utf-8"))
+    if style_path:
+        with open(style_path, "rb") as f:
+            digest.update(f.read())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _is_up_to_date(input, output, skip, style_path):
+    if skip != "mtime" or output == "-" or not os.path.exists(output):
+        return False
+    sources = [input] + ([style_path] if style_path else [])
+    return os.path.getmtime(output) >= max(map(os.path.getmtime, sources))
+
+
+def _render_job(input, output, options):
+    """
+    Render one graph. This runs in a worker process when rendering in parallel.
+
+    :return: ``"rendered"`` or ``"skipped"``.
+    """
+    import nxv
+
+    style, style_path = _load_style(options["style"])
+    if _is_up_to_date(input, output, options["skip"], style_path):
+        return "skipped"
+    if input == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(input, "rb") as f:
+            data = f.read()
+    digest = None
+    if options["skip"] == "hash" and output != "-":
+        digest = _digest(data, options, style_path)
+        try:
+            with open(_hash_path(output)) as f:
+                if f.read().strip() == digest and os.path.exists(output):
+                    return "skipped"
+        except OSError:
+            pass
+    graph = _read_graph(
+        data,
+        _input_format(input, options["input_format"]),
+        options["directed"],
+    )
+    if output == "-":
+        destination = sys.stdout.buffer
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        destination = output
+    nxv.render(
+        graph,
+        style,
+        algorithm=options["algorithm"],
+        format=options["format"],
+        graphviz_bin=options["graphviz_bin"],
+        output=destination,
+    )
+    if output == "-":
+        sys.stdout.buffer.flush()
+        return "rendered"
+    if digest is not None:
+        with open(_hash_path(output), "w") as f:
+            f.write(digest + "\n")
+    return "rendered"
+
+
+def _find_inputs(path):
+    if not os.path.isdir(path):
+        return [(path, os.path.basename(path))]
+    inputs = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in INPUT_FORMATS:
+                full_path = os.path.join(root, name)
+                inputs.append((full_path, os.path.relpath(full_path, path)))
+    return inputs
+
+
+def _jobs(args):
+    """
+    Get the ``(input, output)`` pairs to render.
+
+    Directories are searched recursively for graph files, and their structure is mirrored in the output directory.
+    """
+    extension = _output_extension(args.format)
+    inputs = []
+    for path in args.inputs:
+        inputs.extend([(path, "-")] if path == "-" else _find_inputs(path))
+    single = len(inputs) == 1 and not any(map(os.path.isdir, args.inputs))
+    jobs = []
+    for input, relative_path in inputs:
+        if input == "-":
+            output = args.output or "-"
+        elif single and args.output:
+            output = args.output
+        else:
+            output = os.path.splitext(relative_path if args.output else input)[0]
+            output = os.path.join(args.output or "", output + extension)
+        jobs.append((input, output))
+    return jobs
+
+
+def _collisions(jobs):
+    """Get the outputs of more than one job, each mapped to the list of its inputs."""
+    inputs = {}
+    for input, output in jobs:
+        if output != "-":
+            key = os.path.normcase(os.path.abspath(output))
+            inputs.setdefault(key, (output, []))[1].append(input)
+    return {output: paths for output, paths in inputs.values() if len(paths) > 1}
+
+
+def _run_jobs(jobs, options, workers):
+    """Render the jobs, generating ``(input, output, status, error)`` as each job finishes."""
+    if workers == 1 or len(jobs) <= 1:
+        for input, output in jobs:
+            try:
+                yield input, output, _render_job(input, output, options), None
+            except Exception as e:
+                yield input, output, "failed", e
+        return
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        futures = {
+            executor.submit(_render_job, input, output, options): (input, output)
+            for input, output in jobs
+        }
+        for future in as_completed(futures):
+            input, output = futures[future]
+            try:
+                yield input, output, future.result(), None
+            except Exception as e:
+                yield input, output, "failed", e
+
+
+def main(argv=None):
+    """
+    Run the command-line renderer.
+
+    :param argv: The command-line arguments. Defaults to ``sys.argv[1:]``.
+    :return: The exit code: 0 if every graph was rendered or skipped, otherwise 1.
+    """
+    args = _parser().parse_args(argv)
+    if "-" in args.inputs and not args.input_format:
+        _parser().error("The --input-format option is required when reading stdin.")
+    options = {
+        "style": args.style,
+        "format": args.format,
+        "algorithm": args.algorithm,
+        "graphviz_bin": args.graphviz_bin,
+        "input_format": args.input_format,
+        "directed": args.directed,
+        "skip": args.skip,
+    }
+    jobs = _jobs(args)
+    collisions = _collisions(jobs)
+    if collisions:
+        _parser().error(
+            "Several inputs would be rendered to the same output: "
+            + "; ".join(
+                f"{output} from {', '.join(inputs)}"
+                for output, inputs in collisions.items()
+            )
+        )
+    failures = 0
+    results = _run_jobs(jobs, options, args.jobs)
+    for i, (input, output, status, error) in enumerate(results, 1):
+        if error is not None:
+            failures += 1
+            print(f"[{i}/{len(jobs)}] failed {input}: {error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"[{i}/{len(jobs)}] {status} {output}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def console_main():
+    sys.exit(main())
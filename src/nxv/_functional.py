@@ -14,6 +14,34 @@
 # limitations under the License.
 #
 """Utilities for composing functions."""
+import threading
+
+
+class _ProfilerState(threading.local):
+    # The :class:`~nxv.StyleProfiler` active in the current thread, if any.
+    profiler = None
+
+
+_state = _ProfilerState()
+
+
+class _DefaultBranch:
+    def __repr__(self):
+        return "<default>"
+
+
+_DEFAULT_BRANCH = _DefaultBranch()
+
+
+def _describe(func):
+    description = getattr(func, "_nxv_description", None)
+    if description is not None:
+        return description
+    name = getattr(func, "__qualname__", None) or repr(func)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return name
+    return f"{name} ({code.co_filename}:{code.co_firstlineno})"
 
 
 def _apply(func, *args, **kwargs):
@@ -28,6 +56,9 @@ def _apply(func, *args, **kwargs):
     :return: ``func(*args, **kwargs)`` if ``callable(func)``. Otherwise, returns ``func``.
     """
     if callable(func):
+        profiler = _state.profiler
+        if profiler is not None:
+            return profiler.call(func, func, args, kwargs)
         return func(*args, **kwargs)
     else:
         return func
@@ -52,6 +83,7 @@ def chain(funcs):
             result.update(_apply(f, *args, **kwargs))
         return result
 
+    func._nxv_description = f"chain of {len(funcs)} layers"
     return func
 
 
@@ -74,7 +106,13 @@ def switch(key, funcs, *, default=None):
     def func(*args, **kwargs):
         k = key(*args, **kwargs)
         if k not in funcs and default is not None:
-            return _apply(default, *args, **kwargs)
-        return _apply(funcs[k], *args, **kwargs)
-
+            branch, f = _DEFAULT_BRANCH, default
+        else:
+            branch, f = k, funcs[k]
+        profiler = _state.profiler
+        if profiler is not None:
+            return profiler.call((func, branch), _apply, (f, *args), kwargs)
+        return _apply(f, *args, **kwargs)
+
+    func._nxv_description = f"switch on {_describe(key)}"
     return func
@@ -13,13 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import itertools
+import json
 import os
 import platform
 import re
 import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import CancelledError
 from functools import lru_cache
 from subprocess import PIPE, Popen
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
+
+from nxv import _profile
 
 
 @lru_cache()
@@ -113,32 +121,303 @@ def get_graphviz_algorithm_path(graphviz_bin: Optional[str], algorithm: str) ->
     )
 
 
-def run(gv, algorithm, format, graphviz_bin):
+def get_cache_dir() -> str:
+    cache_dir = os.environ.get("NXV_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    if is_windows():
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+    return os.path.join(base, "nxv")
+
+
+def _get_installations_cache_path() -> str:
+    return os.path.join(get_cache_dir(), "graphviz-installations.json")
+
+
+def _read_installations_cache() -> dict:
+    try:
+        with open(_get_installations_cache_path()) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_installations_cache(cache: dict):
+    path = _get_installations_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so concurrent readers never see a partial file.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+    except OSError:
+        # The cache is only an optimization.
+        pass
+
+
+def _probe_output(args) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            args, stdout=PIPE, stderr=PIPE, timeout=30, universal_newlines=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout + result.stderr
+
+
+def _probe_choices(args) -> Optional[List[str]]:
+    # GraphViz lists the valid choices when it is passed "?", for example:
+    # Format: "?" not recognized. Use one of: bmp canon cmap ...
+    output = _probe_output(args)
+    if output is None or "Use one of:" not in output:
+        return None
+    return sorted(set(output.split("Use one of:", 1)[1].split()))
+
+
+class GraphVizInstallation:
     """
-    Runs a `GraphViz`_ layout algorithm on a `GraphViz`_ string to product an output with the specified format.
+    A `GraphViz`_ installation, with the version, layouts, and output formats it supports.
 
-    :param gv: A `GraphViz`_ string.
-    :param algorithm: A `GraphViz`_ layout algorithm.
-    :param format: A `GraphViz`_ output format.
-    :param graphviz_bin: The bin directory of the `GraphViz`_ installation.
-                         Defaults to the ``GRAPHVIZ_BIN`` environment variable.
-    :return: The output bytes.
-    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    Installations are probed by running ``dot`` once,
+    and the results are cached on disk until the ``dot`` binary is modified.
+    Use :meth:`find` to get the installation that :func:`~nxv.render` would use.
+
+    :ivar bin: The ``bin`` directory of the installation.
+    :ivar version: The `GraphViz`_ version string, or ``None`` if it is unknown.
+    :ivar layouts: The set of layout engines, or ``None`` if they are unknown.
+    :ivar formats: The set of output formats, or ``None`` if they are unknown.
     """
-    from nxv import GraphVizError
 
+    def __init__(
+        self,
+        bin: str,
+        *,
+        version: Optional[str] = None,
+        layouts: Optional[FrozenSet[str]] = None,
+        formats: Optional[FrozenSet[str]] = None,
+    ):
+        self.bin = bin
+        self.version = version
+        self.layouts = None if layouts is None else frozenset(layouts)
+        self.formats = None if formats is None else frozenset(formats)
+
+    @classmethod
+    def find(
+        cls, graphviz_bin: Optional[str] = None, algorithm: str = "dot"
+    ) -> "GraphVizInstallation":
+        """
+        Find the `GraphViz`_ installation that provides an algorithm.
+
+        :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation.
+                             Defaults to the ``GRAPHVIZ_BIN`` environment variable,
+                             and otherwise is autodetected as in :func:`~nxv.render`.
+        :param algorithm: The `GraphViz`_ layout algorithm the installation must provide.
+        :return: The probed installation.
+        :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+        :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the algorithm in a `GraphViz`_ installation.
+        """
+        return get_graphviz_installation(graphviz_bin, algorithm)
+
+    @classmethod
+    def probe(cls, bin: str) -> "GraphVizInstallation":
+        """
+        Probe the `GraphViz`_ installation in a ``bin`` directory, bypassing the cache.
+
+        :param bin: The ``bin`` directory of the installation.
+        :return: The probed installation. Properties that could not be probed are ``None``.
+        """
+        dot = try_get_graphviz_algorithm_path(bin, "dot")
+        if dot is None:
+            return cls(bin)
+        version_output = _probe_output([dot, "-V"]) or ""
+        version = re.search(r"version\s+(\S+)", version_output)
+        return cls(
+            bin,
+            version=version.group(1) if version else None,
+            layouts=_probe_choices([dot, "-K?"]),
+            formats=_probe_choices([dot, "-T?"]),
+        )
+
+    def to_dict(self) -> dict:
+        def sorted_or_none(values):
+            return None if values is None else sorted(values)
+
+        return {
+            "bin": self.bin,
+            "version": self.version,
+            "layouts": sorted_or_none(self.layouts),
+            "formats": sorted_or_none(self.formats),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "GraphVizInstallation":
+        return cls(
+            d["bin"], version=d["version"], layouts=d["layouts"], formats=d["formats"]
+        )
+
+    def supports_format(self, format: str) -> bool:
+        """
+        Get whether the installation supports an output format.
+
+        :param format: A `GraphViz`_ output format, optionally with a renderer, as in ``"png:cairo"``.
+        :return: Whether the format is supported. If the formats could not be probed, this is always ``True``.
+        """
+        return self.formats is None or format.split(":", 1)[0] in self.formats
+
+    def __repr__(self):
+        return f"GraphVizInstallation({self.bin!r}, version={self.version!r})"
+
+
+@lru_cache()
+def load_graphviz_installation(bin: str) -> GraphVizInstallation:
+    dot = try_get_graphviz_algorithm_path(bin, "dot")
+    if dot is None:
+        return GraphVizInstallation(bin)
+    try:
+        mtime = os.stat(dot).st_mtime
+    except OSError:
+        return GraphVizInstallation.probe(bin)
+    cache = _read_installations_cache()
+    entry = cache.get(dot)
+    if isinstance(entry, dict) and entry.get("mtime") == mtime:
+        try:
+            return GraphVizInstallation.from_dict(entry["installation"])
+        except (KeyError, TypeError):
+            pass
+    installation = GraphVizInstallation.probe(bin)
+    cache[dot] = {"mtime": mtime, "installation": installation.to_dict()}
+    _write_installations_cache(cache)
+    return installation
+
+
+@lru_cache()
+def get_graphviz_installation(
+    graphviz_bin: Optional[str], algorithm: str
+) -> GraphVizInstallation:
     algorithm_path = get_graphviz_algorithm_path(graphviz_bin, algorithm)
-    p = Popen(
-        [algorithm_path, f"-T{format}"],
-        stdin=PIPE,
-        stdout=PIPE,
-        stderr=PIPE,
-    )
-    stdin = gv.encode("utf-8")
-    stdout, stderr = p.communicate(stdin)
-    if p.returncode == 0:
-        return stdout
+    return load_graphviz_installation(os.path.dirname(algorithm_path))
+
+
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def _write_lines(stream, lines) -> int:
+    """
+    Write lines to a binary stream, encoded as UTF-8 and batched into large writes.
+
+    :return: The number of bytes written.
+    """
+    size = 0
+    batch = []
+    batch_size = 0
+    for line in lines:
+        batch.append(line)
+        batch_size += len(line) + 1
+        if batch_size >= _WRITE_BUFFER_SIZE:
+            data = ("\n".join(batch) + "\n").encode("utf-8")
+            stream.write(data)
+            size += len(data)
+            batch = []
+            batch_size = 0
+    data = "\n".join(batch).encode("utf-8")
+    stream.write(data)
+    return size + len(data)
+
+
+_READ_SIZE = 1 << 16
+
+
+def _write_input(p, gv, profile, errors):
+    """Write the input to the stdin of a process and close it, appending any unexpected exception to ``errors``."""
+    try:
+        if isinstance(gv, str):
+            data = gv.encode("utf-8")
+            p.stdin.write(data)
+            size = len(data)
+        else:
+            size = _write_lines(p.stdin, gv)
+        if profile is not None:
+            profile.gv_bytes = size
+    except BrokenPipeError:
+        # GraphViz stopped reading, which means it failed. The error is reported on stderr.
+        pass
+    except BaseException as e:
+        errors.append(e)
+        p.kill()
+    finally:
+        try:
+            p.stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def _stream_process(p, gv, profile):
+    """
+    Stream the input to the stdin of a process while generating the chunks of its stdout.
+
+    The input is written and stderr is read in background threads, so neither the input nor the output
+    is ever held in memory all at once. If the consumer stops early, the process is killed.
+
+    :return: Generates the stdout chunks, and returns stderr.
+    """
+    stderr = []
+    errors = []
+    threads = [
+        threading.Thread(
+            target=_write_input, args=(p, gv, profile, errors), daemon=True
+        ),
+        threading.Thread(target=lambda: stderr.append(p.stderr.read()), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            chunk = p.stdout.read(_READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    except BaseException:
+        p.kill()
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+        p.wait()
+        p.stdout.close()
+        p.stderr.close()
+    if errors:
+        raise errors[0]
+    return stderr[0] if stderr else b""
+
+
+def _iter_lines(text):
+    """Generate the lines of a string, split at newlines as `GraphViz`_ counts them, one line at a time."""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end < 0:
+            end = len(text)
+        yield text[start:end].rstrip("\r")
+        start = end + 1
+
+
+def _error(gv, stderr):
+    """
+    Build the error for a failed `GraphViz`_ run, quoting the offending input lines if ``gv`` is a string.
+
+    :return: A :class:`~nxv.GraphVizError`.
+    """
+    from nxv import GraphVizError
+
     message = stderr.decode("utf-8")
+    if not isinstance(gv, str):
+        return GraphVizError(message)
     line_numbers = set(
         int(match.group(1)) for match in re.finditer(r"line (\d+)", message)
     )
@@ -150,15 +429,153 @@ def run(gv, algorithm, format, graphviz_bin):
         def prefix(line_number):
             return ">>>" if line_number in line_numbers else "   "
 
+        # Only the lines up to the last line of context are split, since the input may be huge.
+        lines = itertools.islice(_iter_lines(gv), max(context_line_numbers))
         message = "\n".join(
             [
                 message,
                 "   Line |",
                 *(
                     f"{prefix(i)}{i:>4} | {line}"
-                    for i, line in enumerate(gv.splitlines(), 1)
+                    for i, line in enumerate(lines, 1)
                     if i in context_line_numbers
                 ),
             ]
         )
-    raise GraphVizError(message)
+    return GraphVizError(message)
+
+
+def _check_format(graphviz_bin, algorithm, format):
+    from nxv import GraphVizAlgorithmNotFoundError, GraphVizFormatNotFoundError
+
+    installation = get_graphviz_installation(graphviz_bin, algorithm)
+    if installation.layouts is not None and algorithm not in installation.layouts:
+        raise GraphVizAlgorithmNotFoundError(
+            f"No GraphViz layout named {algorithm} is supported by the GraphViz installation: {installation.bin}. "
+            f"Supported layouts are {sorted(installation.layouts)}."
+        )
+    if not installation.supports_format(format):
+        raise GraphVizFormatNotFoundError(
+            f"No GraphViz format named {format} is supported by the GraphViz installation: {installation.bin}. "
+            f"Supported formats are {sorted(installation.formats)}."
+        )
+
+
+class Cancellation:
+    """
+    A token for cancelling `GraphViz`_ runs from another thread.
+
+    Cancelling kills the `GraphViz`_ process of the run the token was passed to, if it is running,
+    and makes any later run with the token fail immediately.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the run, killing its `GraphViz`_ process."""
+        with self._lock:
+            self.cancelled = True
+            if self._process is not None:
+                self._process.kill()
+
+    def check(self):
+        """
+        :raises concurrent.futures.CancelledError: If the run was cancelled.
+        """
+        if self.cancelled:
+            raise CancelledError()
+
+    def _attach(self, p):
+        with self._lock:
+            self._process = p
+            if self.cancelled:
+                p.kill()
+
+
+def _iter_run(gv, algorithm, format, graphviz_bin, profile, args, cancellation=None):
+    if cancellation is not None:
+        cancellation.check()
+    with _profile.phase(profile, "spawn"):
+        algorithm_path = get_graphviz_algorithm_path(graphviz_bin, algorithm)
+        p = Popen(
+            [algorithm_path, f"-T{format}", *args],
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+    if cancellation is not None:
+        cancellation._attach(p)
+    with _profile.phase(profile, "layout"):
+        stderr = yield from _stream_process(p, gv, profile)
+    if cancellation is not None:
+        cancellation.check()
+    if p.returncode != 0:
+        raise _error(gv, stderr)
+
+
+def run_iter(gv, algorithm, format, graphviz_bin, profile=None):
+    """
+    Runs a `GraphViz`_ layout algorithm like :func:`run`, generating the output in chunks as it is produced.
+
+    The format is checked immediately, but `GraphViz`_ is only started when the first chunk is requested.
+    The ``"layout"`` phase of the profile includes the time spent consuming the chunks.
+
+    :return: An iterator of output byte chunks.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the format.
+    :raises GraphVizError: When the iterator is exhausted, if `GraphViz`_ failed to run on the given inputs.
+    """
+    _check_format(graphviz_bin, algorithm, format)
+    return _iter_run(gv, algorithm, format, graphviz_bin, profile, ())
+
+
+def run(
+    gv,
+    algorithm,
+    format,
+    graphviz_bin,
+    profile=None,
+    output=None,
+    args=(),
+    cancellation=None,
+):
+    """
+    Runs a `GraphViz`_ layout algorithm on a `GraphViz`_ string to product an output with the specified format.
+
+    :param gv: A `GraphViz`_ string, or an iterable of its lines.
+               Lines are streamed to `GraphViz`_ as they are generated,
+               but errors are only reported with the context of the offending lines if ``gv`` is a string.
+    :param algorithm: A `GraphViz`_ layout algorithm.
+    :param format: A `GraphViz`_ output format.
+    :param graphviz_bin: The bin directory of the `GraphViz`_ installation.
+                         Defaults to the ``GRAPHVIZ_BIN`` environment variable.
+    :param profile: An optional :class:`~nxv.RenderProfile` to record the ``"spawn"`` and ``"layout"`` phases in.
+    :param output: An optional file path or binary file object to write the output to, instead of returning it.
+                   `GraphViz`_ writes to file paths itself, and the output is copied to file objects in chunks.
+    :param args: Additional command-line arguments for `GraphViz`_, like ``["-n2"]``.
+    :param cancellation: An optional :class:`Cancellation` to cancel the run with.
+    :return: The output bytes, or ``None`` if ``output`` is given.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the format.
+    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    :raises concurrent.futures.CancelledError: If the run was cancelled.
+    """
+    _check_format(graphviz_bin, algorithm, format)
+    args = list(args)
+    if output is None:
+        return b"".join(
+            _iter_run(gv, algorithm, format, graphviz_bin, profile, args, cancellation)
+        )
+    if isinstance(output, (str, os.PathLike)):
+        args.append(f"-o{os.fspath(output)}")
+        for _ in _iter_run(
+            gv, algorithm, format, graphviz_bin, profile, args, cancellation
+        ):
+            pass
+        return None
+    for chunk in _iter_run(
+        gv, algorithm, format, graphviz_bin, profile, args, cancellation
+    ):
+        output.write(chunk)
+    return None
@@ -0,0 +1,289 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Incremental serialization of graphs that change a little between renders."""
+from typing import Optional, Union
+
+from nxv import _profile
+from nxv._functional import _apply
+from nxv._rendering import (
+    EDGE_OPERATORS,
+    _attributes_modifier,
+    _check_graphviz,
+    _default_subgraph_func,
+    _graph_attrs_declaration,
+    _graph_identifier,
+    _graph_type,
+    _indent,
+    _render_gv,
+    _resolve_algorithm,
+    _resolve_format,
+    _resolve_optimize,
+    _root_style,
+    _subgraph_declaration,
+)
+from nxv._style import Style, compose
+from nxv._util import is_multi_graph
+
+
+class IncrementalRenderer:
+    """
+    Renders a `NetworkX`_ graph repeatedly, re-serializing only the parts that changed since the last render.
+
+    The serialized text is cached per node, per edge, per subgraph, and for the top-level nodes and the edges.
+    After changing the graph, mark the changed elements with :meth:`mark_node`, :meth:`mark_edge`
+    and :meth:`mark_graph`, and the next render only evaluates the style for those elements
+    and reassembles the `GraphViz`_ string from the cached fragments.
+
+    Nodes keep their `GraphViz`_ ids across renders, so the ids may differ from those of :func:`~nxv.render`
+    once nodes have been removed. Changes that are not marked are not rendered.
+
+    :param graph: A `NetworkX`_ graph, which may be modified between renders.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
+                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+                          If it returns ``None`` the node is not in any subgraph.
+    """
+
+    def __init__(self, graph, style: Optional[Style] = None, *, subgraph_func=None):
+        self.graph = graph
+        self._style = compose([_root_style, style])
+        self._subgraph_func = subgraph_func or _default_subgraph_func
+        self.mark_graph()
+
+    def mark_graph(self):
+        """
+        Mark the whole graph as changed, so the next render re-serializes everything.
+
+        Call this when the graph attributes change, since they can change the graph type and the style.
+        """
+        self._stale = True
+        self._dirty_nodes = {}
+        self._dirty_edges = {}
+
+    def mark_node(self, u):
+        """
+        Mark a node as added, removed, or changed.
+
+        Removing a node also removes its edges from the render.
+
+        :param u: A `NetworkX`_ node.
+        """
+        self._dirty_nodes[u] = None
+
+    def mark_edge(self, u, v, key=None):
+        """
+        Mark an edge as added, removed, or changed.
+
+        :param u: The source node of the edge.
+        :param v: The target node of the edge.
+        :param key: The key of the edge in a multigraph. If ``None``, every edge between ``u`` and ``v`` is marked.
+        """
+        self._dirty_edges[(u, v, key)] = None
+
+    def _rebuild(self):
+        graph = self.graph
+        self._multi = is_multi_graph(graph)
+        graph_attrs = _apply(self._style.graph, graph, graph.graph)
+        graph_type = _graph_type(graph, graph_attrs)
+        self._directed = graph_type == "digraph"
+        self._edge_str = EDGE_OPERATORS[graph_type]
+        self._prefix = _graph_identifier(graph_type, graph_attrs.get("name", "G"))
+        self._header = _indent(_graph_attrs_declaration(graph_attrs))
+
+        self._ids = {}
+        self._id_count = 0
+        self._node_subgraphs = {}
+        # The unindented node lines of each subgraph, where the top-level nodes are under None.
+        self._subgraph_nodes = {}
+        self._subgraph_blocks = {}
+        self._dirty_subgraphs = set()
+        self._edge_lines = {}
+        self._incident_edges = {}
+        self._edges_block = None
+
+        for u in graph.nodes:
+            self._update_node(u)
+        for edge in graph.edges(keys=True) if self._multi else graph.edges:
+            self._update_edge(*edge)
+        self._stale = False
+
+    def _node_id(self, u):
+        node_id = self._ids.get(u)
+        if node_id is None:
+            node_id = self._ids[u] = f"node{self._id_count:04}"
+            self._id_count += 1
+        return node_id
+
+    def _update_node(self, u):
+        old_subgraph = self._node_subgraphs.pop(u, None)
+        if u in self._ids:
+            del self._subgraph_nodes[old_subgraph][u]
+            self._dirty_subgraphs.add(old_subgraph)
+        if u not in self.graph:
+            self._ids.pop(u, None)
+            for edge_key in list(self._incident_edges.get(u, ())):
+                self._remove_edge(edge_key)
+            self._incident_edges.pop(u, None)
+            return
+        # The node may have been removed and added back since the last render, without its old edges.
+        for edge_key in list(self._incident_edges.get(u, ())):
+            if not self._has_edge(*edge_key):
+                self._remove_edge(edge_key)
+        d = self.graph.nodes[u]
+        subgraph = _apply(self._subgraph_func, u, d)
+        node_attrs = _apply(self._style.node, u, d)
+        line = f"{self._node_id(u)} {_attributes_modifier(node_attrs)};"
+        self._node_subgraphs[u] = subgraph
+        self._subgraph_nodes.setdefault(subgraph, {})[u] = line
+        self._dirty_subgraphs.add(subgraph)
+
+    def _edge_key(self, u, v, key):
+        if not self._directed and (v, u, key) in self._edge_lines:
+            return v, u, key
+        return u, v, key
+
+    def _has_edge(self, u, v, key):
+        if self._multi:
+            return self.graph.has_edge(u, v, key)
+        return self.graph.has_edge(u, v)
+
+    def _remove_edge(self, edge_key):
+        if self._edge_lines.pop(edge_key, None) is None:
+            return
+        for w in edge_key[:2]:
+            self._incident_edges.get(w, set()).discard(edge_key)
+        self._edges_block = None
+
+    def _update_edge(self, u, v, key=None):
+        graph = self.graph
+        # A node added with the edge is rendered even if the edge was removed again.
+        for w in (u, v):
+            if w not in self._ids and w in graph:
+                self._update_node(w)
+        if self._multi and key is None:
+            keys = set(graph[u][v]) if graph.has_edge(u, v) else set()
+            keys.update(
+                k
+                for a, b, k in self._incident_edges.get(u, ())
+                if (a, b) == (u, v) or (not self._directed and (a, b) == (v, u))
+            )
+            for k in keys:
+                self._update_edge(u, v, k)
+            return
+        edge_key = self._edge_key(u, v, key)
+        if not self._has_edge(u, v, key):
+            self._remove_edge(edge_key)
+            return
+        a, b = edge_key[:2]
+        if self._multi:
+            edge = (a, b, key, graph.edges[a, b, key])
+        else:
+            edge = (a, b, graph.edges[a, b])
+        edge_attrs = _apply(self._style.edge, *edge)
+        line = f"{self._ids[a]} {self._edge_str} {self._ids[b]} {_attributes_modifier(edge_attrs)};"
+        self._edge_lines[edge_key] = _indent(line)
+        for w in (a, b):
+            self._incident_edges.setdefault(w, set()).add(edge_key)
+        self._edges_block = None
+
+    def _subgraph_block(self, subgraph):
+        lines = self._subgraph_nodes[subgraph].values()
+        if subgraph is not None:
+            lines = _subgraph_declaration(
+                subgraph, _apply(self._style.subgraph, subgraph), lines
+            )
+        return "\n".join(map(_indent, lines))
+
+    def to_gv(self) -> str:
+        """
+        Serialize the graph as a `GraphViz`_ string, re-serializing only the parts marked as changed.
+
+        :return: The `GraphViz`_ string.
+        """
+        if self._stale:
+            self._rebuild()
+        dirty_nodes, self._dirty_nodes = self._dirty_nodes, {}
+        dirty_edges, self._dirty_edges = self._dirty_edges, {}
+        for u in dirty_nodes:
+            self._update_node(u)
+        for edge in dirty_edges:
+            self._update_edge(*edge)
+
+        for subgraph in self._dirty_subgraphs:
+            if self._subgraph_nodes.get(subgraph):
+                self._subgraph_blocks[subgraph] = self._subgraph_block(subgraph)
+            else:
+                self._subgraph_nodes.pop(subgraph, None)
+                self._subgraph_blocks.pop(subgraph, None)
+        self._dirty_subgraphs = set()
+        if self._edges_block is None:
+            self._edges_block = "\n".join(self._edge_lines.values())
+
+        parts = [self._prefix + " {", self._header]
+        if None in self._subgraph_blocks:
+            parts.append(self._subgraph_blocks[None])
+        parts.extend(
+            self._subgraph_blocks[subgraph]
+            for subgraph in self._subgraph_nodes
+            if subgraph is not None
+        )
+        if self._edges_block:
+            parts.append(self._edges_block)
+        parts.append("}")
+        return "\n".join(parts)
+
+    def render(
+        self,
+        *,
+        algorithm: Optional[str] = None,
+        format: Optional[str] = None,
+        graphviz_bin: Optional[str] = None,
+        optimize: Union[bool, dict] = False,
+        output=None,
+        profile=False,
+    ) -> Optional[Union[bytes, str]]:
+        """
+        Render the graph using `GraphViz`_, re-serializing only the parts marked as changed.
+
+        The parameters are as in :func:`~nxv.render`.
+
+        :return: If ``format`` is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+                 otherwise, ``None``.
+        """
+        algorithm = _resolve_algorithm(algorithm)
+        format, graphviz_format = _resolve_format(format)
+        optimize = _resolve_optimize(optimize, format, graphviz_format)
+        _check_graphviz(algorithm, graphviz_format, graphviz_bin)
+
+        profiler = _profile.start(profile, algorithm=algorithm, format=format)
+        with _profile.phase(profiler, "serialize"):
+            gv = self.to_gv()
+        counts = {
+            "nodes": self.graph.number_of_nodes(),
+            "edges": self.graph.number_of_edges(),
+        }
+        return _render_gv(
+            gv,
+            algorithm=algorithm,
+            format=format,
+            graphviz_format=graphviz_format,
+            graphviz_bin=graphviz_bin,
+            profiler=profiler,
+            profile=profile,
+            counts=counts,
+            optimize=optimize,
+            output=output,
+        )
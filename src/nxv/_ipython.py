@@ -33,15 +33,11 @@ def assert_execution_context():
         )
 
 
-def display(data, format):
-    """Display SVG or image data in the current IPython execution context."""
-    assert_execution_context()
-    from IPython.display import SVG, Image, display
+def _display_object(data, format):
+    from IPython.display import SVG, Image, Pretty
 
     if format == "ipython/raw":
-        print(data)
-        return
-
+        return Pretty(data)
     formats = {"ipython/svg": SVG, "ipython/png": Image}
     constructor = formats.get(format, None)
     if constructor is None:
@@ -49,4 +45,34 @@ def display(data, format):
             f"Invalid IPython format {format!r}. "
             f"Valid IPython formats are {set(formats)}."
         )
-    display(constructor(data))
+    return constructor(data)
+
+
+def display(data, format):
+    """Display SVG or image data in the current IPython execution context."""
+    assert_execution_context()
+    from IPython.display import display
+
+    if format == "ipython/raw":
+        print(data)
+        return
+    display(_display_object(data, format))
+
+
+def display_placeholder(text):
+    """
+    Display a text placeholder in the current IPython execution context, to be replaced later.
+
+    :return: An IPython ``DisplayHandle`` for :func:`update_display`.
+    """
+    assert_execution_context()
+    from IPython.display import Pretty, display
+
+    return display(Pretty(text), display_id=True)
+
+
+def update_display(handle, data, format):
+    """Replace the content of a display handle with SVG or image data, or with text if ``format`` is ``None``."""
+    from IPython.display import Pretty
+
+    handle.update(Pretty(data) if format is None else _display_object(data, format))
@@ -0,0 +1,354 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Timing and metrics for renders."""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List
+
+from nxv import _functional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # The resource module is not available on Windows.
+    resource = None
+
+_hooks: List[Callable[["RenderProfile"], None]] = []
+
+
+def add_render_hook(hook: Callable[["RenderProfile"], None]):
+    """
+    Register a function to be called with the :class:`~nxv.RenderProfile` of every successful render.
+
+    :param hook: A function ``f(profile)``.
+    """
+    _hooks.append(hook)
+
+
+def remove_render_hook(hook: Callable[["RenderProfile"], None]):
+    """
+    Unregister a function registered with :func:`~nxv.add_render_hook`.
+
+    :param hook: A previously registered function.
+    """
+    _hooks.remove(hook)
+
+
+def _children_usage():
+    if resource is None:
+        return 0.0, None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * scale
+
+
+class _Phase:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.child_cpu, _ = _children_usage()
+        self.timed = self.profile._timed
+
+    def __exit__(self, *exc_info):
+        # The time of timed functions called during the phase is already counted in their own phase.
+        timed = self.profile._timed - self.timed
+        wall = time.perf_counter() - self.wall - timed
+        cpu = time.process_time() - self.cpu - timed
+        child_cpu, child_max_rss = _children_usage()
+        phase = self.profile._phase_times(self.name)
+        phase["wall"] += wall
+        phase["cpu"] += max(0.0, cpu)
+        phase["child_cpu"] += child_cpu - self.child_cpu
+        if child_max_rss:
+            self.profile.child_max_rss = child_max_rss
+
+
+class _NullPhase:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(profile, name):
+    """
+    Get a context manager that times a phase of a render, if the render is being profiled.
+
+    :param profile: A :class:`RenderProfile`, or ``None`` if the render is not being profiled.
+    :param name: The name of the phase.
+    :return: A context manager.
+    """
+    return _NULL_PHASE if profile is None else _Phase(profile, name)
+
+
+class RenderProfile:
+    """
+    A breakdown of where the time and memory of a call to :func:`~nxv.render` went.
+
+    :ivar phases: An ordered dict from phase name to a dict of the ``"wall"`` time, the ``"cpu"`` time
+                  of this process, and the ``"child_cpu"`` time of child processes, in seconds.
+                  The phases are ``"style"``, ``"validate"``, ``"serialize"``, ``"spawn"``, ``"layout"``,
+                  ``"optimize"``, and ``"display"``, and phases that did not run are omitted.
+                  The ``"style"`` phase includes evaluating the style for every element, wherever it happens,
+                  and its CPU time is taken to be its wall time, since timing each call must be cheap.
+                  The ``"layout"`` phase includes writing the input to and reading the output from `GraphViz`_.
+    :ivar node_count: The number of nodes in the graph.
+    :ivar edge_count: The number of edges in the graph.
+    :ivar gv_bytes: The size of the UTF-8 encoded `GraphViz`_ input.
+    :ivar output_bytes: The size of the render output.
+    :ivar child_max_rss: The peak resident set size of any child process so far, in bytes,
+                         as reported by ``resource.getrusage(RUSAGE_CHILDREN)``.
+                         This is ``None`` on platforms without the ``resource`` module.
+    """
+
+    def __init__(self, *, algorithm=None, format=None):
+        self.algorithm = algorithm
+        self.format = format
+        self.phases = OrderedDict()
+        self.node_count = None
+        self.edge_count = None
+        self.gv_bytes = None
+        self.output_bytes = None
+        self.child_max_rss = None
+        # The total wall time of the timed functions, which is excluded from the enclosing phases.
+        self._timed = 0.0
+
+    def _phase_times(self, name):
+        return self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "child_cpu": 0.0})
+
+    def phase(self, name):
+        """Get a context manager that adds the time spent in it to the phase with the given name."""
+        return _Phase(self, name)
+
+    def timed(self, name, func):
+        """
+        Wrap a maybe-function so that the time spent calling it is added to the phase with the given name,
+        instead of to the phase it is called in.
+
+        :param name: The name of the phase.
+        :param func: A value that is optionally callable.
+        :return: The wrapped function if ``func`` is callable; otherwise, ``func``.
+        """
+        if not callable(func):
+            return func
+        phase = self._phase_times(name)
+
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                phase["wall"] += elapsed
+                phase["cpu"] += elapsed
+                self._timed += elapsed
+
+        timed_func._nxv_description = _functional._describe(func)
+        return timed_func
+
+    def to_dict(self):
+        """Get the profile as a dict of plain values, suitable for a metrics pipeline."""
+        return {
+            "algorithm": self.algorithm,
+            "format": self.format,
+            "phases": {name: dict(phase) for name, phase in self.phases.items()},
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "gv_bytes": self.gv_bytes,
+            "output_bytes": self.output_bytes,
+            "child_max_rss": self.child_max_rss,
+        }
+
+    def __str__(self):
+        lines = [
+            f"nxv render profile ({self.algorithm}, {self.format}): "
+            f"{self.node_count} nodes, {self.edge_count} edges, "
+            f"{self.gv_bytes} GraphViz bytes, {self.output_bytes} output bytes",
+            f"    {'phase':<10} {'wall (s)':>10} {'cpu (s)':>10} {'child cpu (s)':>14}",
+        ]
+        for name, phase in self.phases.items():
+            lines.append(
+                f"    {name:<10} {phase['wall']:>10.4f} {phase['cpu']:>10.4f} {phase['child_cpu']:>14.4f}"
+            )
+        if self.child_max_rss is not None:
+            lines.append(f"    child peak RSS: {self.child_max_rss} bytes")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"RenderProfile({self.to_dict()!r})"
+
+
+def report(profile, target):
+    """
+    Deliver a completed profile to the render's ``profile`` target and to all registered hooks.
+
+    :param profile: The completed :class:`RenderProfile`.
+    :param target: The ``profile`` argument of the render:
+                   ``True`` to print the profile to ``sys.stderr``, or a function ``f(profile)``.
+    """
+    if target is True:
+        print(profile, file=sys.stderr)
+    elif callable(target):
+        target(profile)
+    for hook in list(_hooks):
+        hook(profile)
+
+
+def start(target, **kwargs):
+    """
+    Create a profile for a render, if the render should be profiled.
+
+    :param target: The ``profile`` argument of the render.
+    :return: A new :class:`RenderProfile` if ``target`` is set or any hooks are registered; otherwise, ``None``.
+    """
+    if target or _hooks:
+        return RenderProfile(**kwargs)
+    return None
+
+
+class _LayerStats:
+    __slots__ = ("calls", "cumulative", "own", "items")
+
+    def __init__(self):
+        self.calls = 0
+        self.cumulative = 0.0
+        self.own = 0.0
+        self.items = 0
+
+
+class StyleProfiler:
+    """
+    A context manager that profiles the style functions called in the current thread while it is active.
+
+    Every callable applied by a style, including the layers of :func:`~nxv.chain` and :func:`~nxv.compose`
+    and each branch of :func:`~nxv.switch`, is tracked separately with its call count,
+    cumulative time, own time (excluding nested layers), and the average size of the dicts it returned.
+
+    ::
+
+        with nxv.StyleProfiler():
+            nxv.render(graph, style, format="svg")
+
+    Renders in other threads, like those of :class:`~nxv.Renderer` or :func:`~nxv.render_background`,
+    are not profiled, so concurrent renders do not skew each other's statistics.
+
+    :param file: Where to print the ranked report when the context exits.
+                 Defaults to ``sys.stderr``. If ``None``, nothing is printed.
+    :param limit: The maximum number of layers in the printed report.
+    """
+
+    def __init__(self, file=sys.stderr, limit=20):
+        self.file = file
+        self.limit = limit
+        self._stats = {}
+        self._lock = threading.Lock()
+        # The stack of nested call times and the previously active profiler, for each thread.
+        self._local = threading.local()
+
+    def __enter__(self):
+        local = self._local
+        local.previous = _functional._state.profiler
+        local.child_times = []
+        _functional._state.profiler = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _functional._state.profiler = self._local.previous
+        if self.file is not None:
+            print(self.report(limit=self.limit), file=self.file)
+
+    def call(self, key, func, args, kwargs):
+        """Call ``func(*args, **kwargs)``, recording the call under ``key``."""
+        child_times = self._local.child_times
+        child_times.append(0.0)
+        start = time.perf_counter()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            child_time = child_times.pop()
+            if child_times:
+                child_times[-1] += elapsed
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = _LayerStats()
+                stats.calls += 1
+                stats.cumulative += elapsed
+                stats.own += elapsed - child_time
+                if isinstance(result, dict):
+                    stats.items += len(result)
+
+    @staticmethod
+    def _describe(key):
+        if isinstance(key, tuple):
+            func, branch = key
+            return f"{_functional._describe(func)} [{branch!r}]"
+        return _functional._describe(key)
+
+    def stats(self):
+        """
+        Get the statistics of each profiled layer, ranked by own time.
+
+        :return: A list of dicts with the ``"layer"`` description, the number of ``"calls"``,
+                 the ``"cumulative"`` and ``"own"`` time in seconds, and the ``"mean_items"`` in the returned dicts.
+        """
+        with self._lock:
+            layers = list(self._stats.items())
+        result = [
+            {
+                "layer": self._describe(key),
+                "calls": stats.calls,
+                "cumulative": stats.cumulative,
+                "own": stats.own,
+                "mean_items": stats.items / stats.calls,
+            }
+            for key, stats in layers
+        ]
+        result.sort(key=lambda row: row["own"], reverse=True)
+        return result
+
+    def report(self, limit=None):
+        """
+        Get a ranked report of the profiled layers, most expensive first.
+
+        :param limit: The maximum number of layers to include.
+        :return: The report as a str.
+        """
+        rows = self.stats()[:limit]
+        lines = [
+            "nxv style profile",
+            f"    {'own (s)':>10} {'cum (s)':>10} {'calls':>10} {'items':>6}  layer",
+        ]
+        lines.extend(
+            f"    {row['own']:>10.4f} {row['cumulative']:>10.4f} {row['calls']:>10} "
+            f"{row['mean_items']:>6.1f}  {row['layer']}"
+            for row in rows
+        )
+        return "\n".join(lines)
@@ -0,0 +1,222 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Reduction of large graphs to a node budget before rendering."""
+import bisect
+import heapq
+import itertools
+import random
+from operator import itemgetter
+from typing import Optional
+
+import networkx as nx
+
+from nxv._util import boundary
+
+STRATEGIES = ("degree", "kcore", "pagerank", "random_walk", "edge_sample")
+RESTART_PROBABILITY = 0.15
+# The number of random walk steps without visiting a new node before the walk jumps to a random node.
+STALL_STEPS = 100
+
+
+def _top(scores, max_nodes):
+    """Select the nodes with the highest scores, where ``scores`` is an iterable of ``(u, score)`` pairs."""
+    return [u for u, _ in heapq.nlargest(max_nodes, scores, key=itemgetter(1))]
+
+
+def _neighbors(graph, u):
+    if graph.is_directed():
+        return itertools.chain(graph.succ[u], graph.pred[u])
+    return iter(graph.adj[u])
+
+
+def _neighbor_lists(graph, directed):
+    """
+    Get a function that lists the neighbors of a node, either the successors if ``directed`` or all neighbors.
+
+    Each list is built the first time it is needed and then reused,
+    so that a walk that keeps returning to a hub does not list its neighbors at every step.
+    """
+    lists = {}
+
+    def neighbor_list(u):
+        neighbors = lists.get(u)
+        if neighbors is None:
+            neighbors = lists[u] = list(
+                graph.adj[u] if directed else _neighbors(graph, u)
+            )
+        return neighbors
+
+    return neighbor_list
+
+
+def _core_numbers(graph):
+    """
+    Compute the core number of each node, ignoring edge directions, parallel edges, and self-loops.
+
+    This is the bucket algorithm of Batagelj and Zaversnik, which runs in linear time.
+
+    :return: A dict from each node to its core number.
+    """
+    neighbors = {u: set(_neighbors(graph, u)) - {u} for u in graph}
+    degrees = {u: len(vs) for u, vs in neighbors.items()}
+    buckets = [set() for _ in range(max(degrees.values(), default=0) + 1)]
+    for u, degree in degrees.items():
+        buckets[degree].add(u)
+    cores = {}
+    # Removing a node lowers its neighbors to at least k, so the next node is never in a lower bucket.
+    k = 0
+    while k < len(buckets):
+        if not buckets[k]:
+            k += 1
+            continue
+        u = buckets[k].pop()
+        cores[u] = k
+        for v in neighbors[u]:
+            if v not in cores and degrees[v] > k:
+                buckets[degrees[v]].discard(v)
+                degrees[v] -= 1
+                buckets[degrees[v]].add(v)
+    return cores
+
+
+def _random_walk(graph, max_nodes, rng):
+    """
+    Visit nodes by a random walk that restarts at its start node with probability ``RESTART_PROBABILITY``,
+    and jumps to a random node when it is stuck, that is, after ``STALL_STEPS`` steps without visiting a new node.
+
+    The walk follows edges in either direction and starts at a node of maximum degree.
+    """
+    nodes = list(graph)
+    neighbor_list = _neighbor_lists(graph, directed=False)
+    start = max(graph.degree, key=itemgetter(1))[0]
+    visited = {start: None}
+    u = start
+    steps = 0
+    while len(visited) < max_nodes:
+        steps += 1
+        neighbors = neighbor_list(u)
+        if not neighbors or steps > STALL_STEPS:
+            u = start = rng.choice(nodes)
+        elif rng.random() < RESTART_PROBABILITY:
+            u = start
+        else:
+            u = rng.choice(neighbors)
+        if u not in visited:
+            visited[u] = None
+            steps = 0
+    return list(visited)
+
+
+def _edge_sample(graph, max_nodes, rng):
+    """
+    Sample edges uniformly at random and select their endpoints until the budget is reached.
+
+    An edge is sampled by picking a node with probability proportional to its (out-)degree,
+    and then one of its edges, so the edges are never listed.
+    If fewer nodes than the budget have edges, the budget is filled with isolated nodes.
+    """
+    degree = graph.out_degree if graph.is_directed() else graph.degree
+    nodes = list(graph)
+    cumulative = list(itertools.accumulate(degree(u) for u in nodes))
+    # Sampling only ever selects nodes with edges, so it stops once all of them are selected.
+    sampled = min(max_nodes, sum(1 for _, d in graph.degree if d))
+    neighbor_list = _neighbor_lists(graph, directed=True)
+    selected = {}
+    while len(selected) < sampled:
+        u = nodes[bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))]
+        selected[u] = None
+        if len(selected) < sampled:
+            selected[rng.choice(neighbor_list(u))] = None
+    for u in nodes:
+        if len(selected) >= max_nodes:
+            break
+        selected[u] = None
+    return list(selected)
+
+
+def reduce(
+    graph,
+    max_nodes: int,
+    *,
+    strategy: str = "degree",
+    marker: Optional[str] = "truncated",
+    seed=None,
+):
+    """
+    Reduce a graph to at most ``max_nodes`` of its most important nodes, so that it can be laid out quickly.
+
+    The reduced graph is the subgraph induced by the selected nodes. The strategies are:
+
+    - ``"degree"``: the nodes of highest degree.
+    - ``"kcore"``: the nodes of highest core number, that is, the most densely connected part of the graph.
+      Ties are broken by degree.
+    - ``"pagerank"``: the nodes of highest PageRank, which `NetworkX`_ computes with `SciPy`_.
+    - ``"random_walk"``: the nodes visited by a random walk with restarts from a node of highest degree.
+    - ``"edge_sample"``: the endpoints of edges sampled uniformly at random.
+
+    Each strategy takes time linear in the size of the graph, or close to it,
+    so graphs with millions of nodes can be reduced. If the graph already fits, it is not reduced.
+
+    For example:
+
+    ::
+
+        reduced = nxv.reduce(graph, 2000, strategy="kcore")
+        style = nxv.Style(node=lambda u, d: {
+            'style': 'dashed' if d.get('truncated') else 'solid',
+        })
+        nxv.render(reduced, style)
+
+    :param graph: A graph.
+    :param max_nodes: The maximum number of nodes of the reduced graph.
+    :param strategy: How to select the nodes, as one of ``"degree"``, ``"kcore"``, ``"pagerank"``,
+                     ``"random_walk"``, or ``"edge_sample"``.
+    :param marker: The node attribute set to ``True`` on the nodes that lost edges in the reduction.
+                   The reduced graph is then a copy of the induced subgraph, whose attribute dicts are copied,
+                   so the graph itself is not modified.
+                   If ``None``, no attribute is set and the reduced graph is a read-only view of the graph.
+    :param seed: The seed of the random strategies, or ``None`` for a random seed.
+    :return: The reduced graph.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy {strategy!r}. Valid strategies are {STRATEGIES}."
+        )
+    rng = random.Random(seed)
+    if graph.number_of_nodes() <= max_nodes:
+        nodes = graph.nodes
+    elif max_nodes <= 0:
+        nodes = []
+    elif strategy == "degree":
+        nodes = _top(graph.degree, max_nodes)
+    elif strategy == "kcore":
+        cores = _core_numbers(graph)
+        nodes = _top(((u, (cores[u], d)) for u, d in graph.degree), max_nodes)
+    elif strategy == "pagerank":
+        nodes = _top(nx.pagerank(graph, weight=None).items(), max_nodes)
+    elif strategy == "random_walk":
+        nodes = _random_walk(graph, max_nodes, rng)
+    else:
+        nodes = _edge_sample(graph, max_nodes, rng)
+
+    reduced = graph.subgraph(nodes)
+    if marker is None:
+        return reduced
+    truncated = boundary(graph, reduced)
+    reduced = reduced.copy()
+    for u in truncated:
+        reduced.nodes[u][marker] = True
+    return reduced
@@ -0,0 +1,256 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""A reusable renderer for long-running services."""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Union
+
+from nxv import _graphviz, _profile
+from nxv._rendering import (
+    _render_gv,
+    _resolve_algorithm,
+    _resolve_format,
+    _resolve_optimize,
+    _root_style,
+    _timed_style,
+    _to_gv,
+    _validate,
+)
+from nxv._style import Style, compose
+
+
+class Renderer:
+    """
+    Renders many `NetworkX`_ graphs with the same options, doing the per-render setup of :func:`~nxv.render` once.
+
+    The style is composed once, the `GraphViz`_ installation is resolved and checked for the format once,
+    and the strings of common attribute values are cached across renders.
+    A renderer is thread-safe, so one renderer can serve concurrent requests.
+    At most ``max_workers`` `GraphViz`_ processes run at once; other renders wait for one to finish.
+
+    A renderer can be used as a context manager, which calls :meth:`close` on exit.
+
+    For example:
+
+    ::
+
+        renderer = nxv.Renderer(style, format="svg")
+
+        def handle(request):
+            return renderer.render(request.graph)
+
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param algorithm: The `GraphViz`_ layout algorithm, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key, as in :func:`~nxv.render`.
+    :param sort_attributes: Whether to emit the attributes of each element sorted by name, as in :func:`~nxv.render`.
+    :param aggregate_multiedges: Whether to merge parallel edges, as in :func:`~nxv.render`.
+    :param validate: Whether to check the attributes of each graph before serializing it, as in :func:`~nxv.render`.
+                     Attribute values are only checked the first time the style produces them.
+    :param optimize: Whether to post-process SVG output, as in :func:`~nxv.render`.
+    :param max_workers: The maximum number of `GraphViz`_ processes to run at once,
+                        which is also the number of threads used by :meth:`submit`.
+                        Defaults to the number of CPUs.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    """
+
+    def __init__(
+        self,
+        style: Optional[Style] = None,
+        *,
+        algorithm: Optional[str] = None,
+        format: Optional[str] = None,
+        graphviz_bin: Optional[str] = None,
+        subgraph_func=None,
+        sort_attributes: bool = False,
+        aggregate_multiedges=False,
+        validate: bool = False,
+        optimize: Union[bool, dict] = False,
+        max_workers: Optional[int] = None,
+    ):
+        self.algorithm = _resolve_algorithm(algorithm)
+        self.format, self._graphviz_format = _resolve_format(format)
+        self._optimize = _resolve_optimize(optimize, self.format, self._graphviz_format)
+        self._style = compose([_root_style, style])
+        self._serialize_kwargs = dict(
+            subgraph_func=subgraph_func,
+            sort_attributes=sort_attributes,
+            aggregate_multiedges=aggregate_multiedges,
+            string_cache={},
+        )
+        self._checked = set() if validate else None
+        self.graphviz_bin = graphviz_bin
+        if self._graphviz_format != "raw":
+            path = _graphviz.get_graphviz_algorithm_path(graphviz_bin, self.algorithm)
+            self.graphviz_bin = os.path.dirname(path)
+            _graphviz._check_format(
+                self.graphviz_bin, self.algorithm, self._graphviz_format
+            )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._processes = threading.BoundedSemaphore(self.max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "renders": 0,
+            "failures": 0,
+            "in_flight": 0,
+            "nodes": 0,
+            "edges": 0,
+            "gv_bytes": 0,
+            "output_bytes": 0,
+            "phases": {},
+        }
+
+    def _count(self, key, delta):
+        with self._lock:
+            self._metrics[key] += delta
+
+    def _record(self, graph, gv, output, output_path, phases):
+        # The counters are computed from the render itself, so they do not require profiling it.
+        gv_bytes = len(gv) if gv.isascii() else len(gv.encode("utf-8"))
+        if output is not None:
+            output_bytes = (
+                len(output)
+                if isinstance(output, bytes)
+                else len(output.encode("utf-8"))
+            )
+        elif output_path is not None:
+            output_bytes = os.path.getsize(output_path)
+        else:
+            output_bytes = 0
+        with self._lock:
+            metrics = self._metrics
+            metrics["renders"] += 1
+            metrics["nodes"] += graph.number_of_nodes()
+            metrics["edges"] += graph.number_of_edges()
+            metrics["gv_bytes"] += gv_bytes
+            metrics["output_bytes"] += output_bytes
+            for name, wall in phases.items():
+                metrics["phases"][name] = metrics["phases"].get(name, 0.0) + wall
+
+    def render(
+        self, graph, *, output=None, profile=False
+    ) -> Optional[Union[bytes, str]]:
+        """
+        Render a `NetworkX`_ graph.
+
+        :param graph: A `NetworkX`_ graph.
+        :param output: An optional file path or binary file object to write the render output to,
+                       as in :func:`~nxv.render`.
+        :param profile: Whether to profile the render, as in :func:`~nxv.render`.
+        :return: If the format is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+                 otherwise, ``None``.
+        :raises GraphVizAttributeError: If ``validate`` is set and the style gives an element an invalid attribute.
+        :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+        """
+        # Renders are only profiled if asked to or if a render hook is registered,
+        # since timing every style call is a significant part of the cost of a render.
+        profiler = None
+        style = self._style
+        if profile or _profile._hooks:
+            profiler = _profile.RenderProfile(
+                algorithm=self.algorithm, format=self.format
+            )
+            profiler.node_count = graph.number_of_nodes()
+            profiler.edge_count = graph.number_of_edges()
+            style = _timed_style(style, profiler)
+        phases = {}
+        self._count("in_flight", 1)
+        try:
+            start = time.perf_counter()
+            if self._checked is not None:
+                with _profile.phase(profiler, "validate"):
+                    _validate(
+                        graph,
+                        style,
+                        self._serialize_kwargs["subgraph_func"],
+                        self._serialize_kwargs["aggregate_multiedges"],
+                        self._checked,
+                    )
+                phases["validate"] = time.perf_counter() - start
+                start = time.perf_counter()
+            with _profile.phase(profiler, "serialize"):
+                gv = _to_gv(graph, style, **self._serialize_kwargs)
+            phases["serialize"] = time.perf_counter() - start
+            with self._processes:
+                start = time.perf_counter()
+                result = _render_gv(
+                    gv,
+                    algorithm=self.algorithm,
+                    format=self.format,
+                    graphviz_format=self._graphviz_format,
+                    graphviz_bin=self.graphviz_bin,
+                    profiler=profiler,
+                    profile=profile,
+                    optimize=self._optimize,
+                    output=output,
+                )
+                phases["layout"] = time.perf_counter() - start
+        except BaseException:
+            self._count("failures", 1)
+            raise
+        finally:
+            self._count("in_flight", -1)
+        output_path = output if isinstance(output, (str, os.PathLike)) else None
+        self._record(graph, gv, result, output_path, phases)
+        return result
+
+    def submit(self, graph, *, output=None, profile=False) -> Future:
+        """
+        Render a `NetworkX`_ graph in a thread of the renderer, as in :meth:`render`.
+
+        :return: A future of the result of :meth:`render`.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            executor = self._executor
+        return executor.submit(self.render, graph, output=output, profile=profile)
+
+    def metrics(self) -> dict:
+        """
+        Get the counters of the renderer.
+
+        :return: A dict with the number of successful ``"renders"``, of ``"failures"``,
+                 and of renders currently ``"in_flight"``, the total ``"nodes"``, ``"edges"``,
+                 ``"gv_bytes"`` and ``"output_bytes"`` of the successful renders, and the total wall time
+                 in seconds of their ``"validate"``, ``"serialize"`` and ``"layout"`` phases as ``"phases"``.
+                 The ``"serialize"`` phase includes evaluating the style, and the ``"layout"`` phase
+                 includes spawning `GraphViz`_ and optimizing its output.
+                 Outputs written to file objects or displayed in IPython are not counted in ``"output_bytes"``.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["phases"] = dict(metrics["phases"])
+        return metrics
+
+    def close(self):
+        """Wait for the renders submitted with :meth:`submit` to finish, and stop the threads of the renderer."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
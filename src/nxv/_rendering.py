@@ -13,11 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from typing import Optional, Union
+import contextlib
+import itertools
+import math
+import os
+from typing import Iterable, Iterator, Optional, Union
 
 import networkx as nx
 
-from nxv import _graphviz, _ipython
+from nxv import _graphviz, _ipython, _profile, _schema, _svg
 from nxv._functional import _apply
 from nxv._style import Style, compose
 from nxv._util import is_multi_graph
@@ -34,6 +38,10 @@ COLOR_ATTRIBUTES = {
     "pencolor",
 }
 LABEL_ATTRIBUTES = {"label", "headlabel", "taillabel"}
+# The types of attribute values whose strings are memoized by string caches.
+CACHED_VALUE_TYPES = (str, int, float, bool)
+# The number of attribute strings a string cache holds before it is cleared.
+STRING_CACHE_SIZE = 1 << 16
 
 
 def _to_gv_string(value, attribute=None):
@@ -61,10 +69,31 @@ def _to_gv_string(value, attribute=None):
     return f'"{value}"'
 
 
-def _attributes_modifier(attrs):
-    attrs_str = ", ".join(
-        f"{k}={_to_gv_string(v, attribute=k)}" for k, v in attrs.items()
-    )
+def _attribute_string(name, value, cache):
+    """
+    Convert an attribute to a ``name="value"`` string, memoizing strings of scalar values in ``cache``.
+
+    The type of the value is part of the cache key, since ``1``, ``1.0`` and ``True`` are equal but print differently.
+    The cache is cleared when it is full, so it keeps the strings of the most common values.
+    """
+    if type(value) not in CACHED_VALUE_TYPES:
+        return f"{name}={_to_gv_string(value, attribute=name)}"
+    key = (name, type(value), value)
+    string = cache.get(key)
+    if string is None:
+        string = f"{name}={_to_gv_string(value, attribute=name)}"
+        if len(cache) >= STRING_CACHE_SIZE:
+            cache.clear()
+        cache[key] = string
+    return string
+
+
+def _attributes_modifier(attrs, sort=False, cache=None):
+    items = sorted(attrs.items()) if sort else attrs.items()
+    if cache is None:
+        attrs_str = ", ".join(f"{k}={_to_gv_string(v, attribute=k)}" for k, v in items)
+    else:
+        attrs_str = ", ".join(_attribute_string(k, v, cache) for k, v in items)
     return f"[{attrs_str}]"
 
 
@@ -73,8 +102,8 @@ def _graph_identifier(graph_type, name):
     return f"{graph_type} {_to_gv_string(name)}"
 
 
-def _graph_attrs_declaration(attrs):
-    return f"graph {_attributes_modifier(attrs)};"
+def _graph_attrs_declaration(attrs, sort=False):
+    return f"graph {_attributes_modifier(attrs, sort=sort)};"
 
 
 def _indent(value):
@@ -82,83 +111,267 @@ def _indent(value):
 
 
 def _block(prefix, lines):
-    begin = (prefix + " {") if prefix else "{"
-    end = "}"
-    return [begin] + list(map(_indent, lines)) + [end]
+    yield (prefix + " {") if prefix else "{"
+    yield from map(_indent, lines)
+    yield "}"
 
 
-def _default_subgraph_func(u, d):
-    return None
+def _graph_type(graph, graph_attrs):
+    graph_type = graph_attrs.get(
+        "type", "digraph" if nx.is_directed(graph) else "graph"
+    )
+    assert graph_type in {"graph", "digraph"}
+    return graph_type
+
+
+EDGE_OPERATORS = {"graph": "--", "digraph": "->"}
 
 
-def _to_gv(graph, style: Style, subgraph_func=None):
+def _edges(graph, aggregate_multiedges=False):
+    if is_multi_graph(graph):
+        if aggregate_multiedges:
+            if aggregate_multiedges is True:
+                aggregate_multiedges = _aggregate_edges
+            return _aggregated_edges(graph, aggregate_multiedges)
+        return graph.edges(keys=True, data=True)
+    return graph.edges(data=True)
+
+
+def _aggregate_edges(u, v, ds):
+    """The default reducer of ``aggregate_multiedges``: counts the edges, sums their weights, and lists their labels."""
+    return {
+        "count": len(ds),
+        "weight": sum(d.get("weight", 1) for d in ds),
+        "labels": [d["label"] for d in ds if "label" in d],
+    }
+
+
+def _aggregated_edges(graph, reducer):
     """
-    Serializes a `NetworkX`_ graph as a `GraphViz`_ string.
+    Generates one ``(u, v, keys, d)`` edge per pair of adjacent nodes of a multigraph,
+    where ``keys`` is the tuple of the keys of the parallel edges and ``d`` is the reduction of their attribute dicts.
 
-    :param graph: A `NetworkX`_ ``Graph``, ``DiGraph``, ``MultiGraph``, or ``MultiDiGraph``.
-    :param style: A :class:`~nxv.Style` object.
-    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
-                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
-    :return: The raw `GraphViz`_ string format to pass as input to one of the GraphViz layout algorithms.
+    The adjacency is read in place, so the graph is not copied.
     """
+    seen = set()
+    for u, neighbors in graph.adj.items():
+        for v, key_dict in neighbors.items():
+            if v not in seen:
+                yield u, v, tuple(key_dict), reducer(u, v, list(key_dict.values()))
+        if not graph.is_directed():
+            seen.add(u)
 
-    if subgraph_func is None:
-        subgraph_func = _default_subgraph_func
 
-    graph_attrs = _apply(style.graph, graph, graph.graph)
-    graph_type = graph_attrs.get(
-        "type", "digraph" if nx.is_directed(graph) else "graph"
-    )
-    assert graph_type in {"graph", "digraph"}
-    edge_str = {"graph": "--", "digraph": "->"}[graph_type]
-    ids = {u: f"node{i:04}" for i, u in enumerate(graph.nodes())}
+def _default_subgraph_func(u, d):
+    return None
+
 
+def _group_by_subgraph(nodes, subgraph_func):
+    if subgraph_func is None:
+        subgraph_func = _default_subgraph_func
     no_subgraph_nodes = []
     subgraph_nodes = {}
-    for u, d in graph.nodes(data=True):
+    for u, d in nodes:
         subgraph = _apply(subgraph_func, u, d)
         if subgraph is None:
             no_subgraph_nodes.append((u, d))
         else:
             subgraph_nodes.setdefault(subgraph, []).append((u, d))
+    return no_subgraph_nodes, subgraph_nodes
+
+
+def _subgraph_declaration(subgraph, attrs, node_lines, sort=False):
+    return _block(
+        _graph_identifier("subgraph", attrs.get("name", str(subgraph))),
+        itertools.chain([_graph_attrs_declaration(attrs, sort=sort)], node_lines),
+    )
+
+
+def _iter_gv(
+    graph,
+    style: Style,
+    subgraph_func=None,
+    *,
+    node_order=None,
+    edge_order=None,
+    sort_attributes=False,
+    aggregate_multiedges=False,
+    string_cache=None,
+):
+    """
+    Serializes a `NetworkX`_ graph as a sequence of `GraphViz`_ lines.
+
+    The lines are generated lazily, so the full `GraphViz`_ string is never held in memory.
+
+    :param graph: A `NetworkX`_ ``Graph``, ``DiGraph``, ``MultiGraph``, or ``MultiDiGraph``.
+    :param style: A :class:`~nxv.Style` object.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
+                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+    :param node_order: An optional sort key function ``f(u, d)`` for the nodes.
+    :param edge_order: An optional sort key function ``f(u, v, d)`` for the edges.
+                       If the graph has multi-edges, the signature should be ``f(u, v, k, d)`` instead.
+    :param sort_attributes: Whether to emit the attributes of each element sorted by name.
+    :param aggregate_multiedges: Whether to merge the parallel edges of a multigraph into one edge ``(u, v, keys, d)``,
+                                 or a reducer function ``f(u, v, ds)`` that merges their attribute dicts.
+    :param string_cache: An optional dict in which to memoize the strings of node and edge attributes
+                         across serializations.
+    :return: Generates the lines of the `GraphViz`_ string, without line terminators.
+    """
+    graph_attrs = _apply(style.graph, graph, graph.graph)
+    graph_type = _graph_type(graph, graph_attrs)
+    edge_str = EDGE_OPERATORS[graph_type]
+    nodes = graph.nodes(data=True)
+    if node_order is not None:
+        nodes = sorted(nodes, key=lambda node: node_order(*node))
+    ids = {u: f"node{i:04}" for i, (u, _) in enumerate(nodes)}
+    no_subgraph_nodes, subgraph_nodes = _group_by_subgraph(nodes, subgraph_func)
 
     def node_declaration(u, d):
         node_attrs = _apply(style.node, u, d)
-        return f"{ids[u]} {_attributes_modifier(node_attrs)};"
+        node_attrs_str = _attributes_modifier(
+            node_attrs, sort=sort_attributes, cache=string_cache
+        )
+        return f"{ids[u]} {node_attrs_str};"
 
     def edge_declaration(*edge):
         u, v = edge[:2]
         edge_attrs = _apply(style.edge, *edge)
-        return f"{ids[u]} {edge_str} {ids[v]} {_attributes_modifier(edge_attrs)};"
-
-    def subgraph_declaration(subgraph, nodes, attrs):
-        return _block(
-            _graph_identifier("subgraph", attrs.get("name", str(subgraph))),
-            [_graph_attrs_declaration(attrs)]
-            + [node_declaration(u, d) for u, d in nodes],
+        edge_attrs_str = _attributes_modifier(
+            edge_attrs, sort=sort_attributes, cache=string_cache
         )
+        return f"{ids[u]} {edge_str} {ids[v]} {edge_attrs_str};"
+
+    edges = _edges(graph, aggregate_multiedges)
+    if edge_order is not None:
+        edges = sorted(edges, key=lambda edge: edge_order(*edge))
+
+    def body():
+        yield _graph_attrs_declaration(graph_attrs, sort=sort_attributes)
+        for u, d in no_subgraph_nodes:
+            yield node_declaration(u, d)
+        for subgraph, nodes in subgraph_nodes.items():
+            yield from _subgraph_declaration(
+                subgraph,
+                _apply(style.subgraph, subgraph),
+                (node_declaration(u, d) for u, d in nodes),
+                sort=sort_attributes,
+            )
+        for edge in edges:
+            yield edge_declaration(*edge)
 
-    edges_kwargs = (
-        {"keys": True, "data": True} if is_multi_graph(graph) else {"data": True}
-    )
+    return _block(_graph_identifier(graph_type, graph_attrs.get("name", "G")), body())
 
-    lines = _block(
-        _graph_identifier(graph_type, graph_attrs.get("name", "G")),
-        (
-            [_graph_attrs_declaration(graph_attrs)]
-            + [node_declaration(u, d) for u, d in no_subgraph_nodes]
-            + [
-                line
-                for subgraph, nodes in subgraph_nodes.items()
-                for line in subgraph_declaration(
-                    subgraph, nodes, _apply(style.subgraph, subgraph)
-                )
-            ]
-            + [edge_declaration(*edge) for edge in graph.edges(**edges_kwargs)]
-        ),
+
+def _validate(
+    graph, style: Style, subgraph_func=None, aggregate_multiedges=False, checked=None
+):
+    """
+    Check the attributes that the style gives the graph, and a sample of its nodes, edges and subgraphs,
+    against the `GraphViz attributes`_ schema.
+
+    :param checked: An optional set of the attributes checked so far with the same style, which are not checked again.
+    :raises GraphVizAttributeError: If an attribute is unknown or has an invalid value.
+    """
+    if checked is None:
+        checked = set()
+
+    def check(attrs, kind, element):
+        _schema.check_attributes(attrs, kind, element, checked)
+
+    check(_apply(style.graph, graph, graph.graph), "graph", "the graph")
+    subgraphs = {}
+    for u, d in _schema.sample(graph.nodes(data=True), graph.number_of_nodes()):
+        check(_apply(style.node, u, d), "node", f"node {u!r}")
+        if subgraph_func is not None:
+            subgraph = _apply(subgraph_func, u, d)
+            if subgraph is not None:
+                subgraphs.setdefault(subgraph, None)
+    for subgraph in itertools.islice(subgraphs, _schema.SAMPLE_SIZE):
+        check(_apply(style.subgraph, subgraph), "subgraph", f"subgraph {subgraph!r}")
+    edges = _edges(graph, aggregate_multiedges)
+    for edge in _schema.sample(edges, graph.number_of_edges()):
+        check(_apply(style.edge, *edge), "edge", f"edge {edge[:-1]!r}")
+
+
+def _to_gv(graph, style: Style, subgraph_func=None, **kwargs):
+    """
+    Serializes a `NetworkX`_ graph as a `GraphViz`_ string.
+
+    :param graph: A `NetworkX`_ ``Graph``, ``DiGraph``, ``MultiGraph``, or ``MultiDiGraph``.
+    :param style: A :class:`~nxv.Style` object.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
+                          where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+    :param kwargs: Additional ordering options passed to :func:`_iter_gv`.
+    :return: The raw `GraphViz`_ string format to pass as input to one of the GraphViz layout algorithms.
+    """
+    return "\n".join(_iter_gv(graph, style, subgraph_func, **kwargs))
+
+
+def _timed_style(style: Style, profiler) -> Style:
+    """Wrap the functions of a style so the time spent evaluating them is profiled as the ``"style"`` phase."""
+    if profiler is None:
+        return style
+    return Style(
+        graph=profiler.timed("style", style.graph),
+        node=profiler.timed("style", style.node),
+        edge=profiler.timed("style", style.edge),
+        subgraph=profiler.timed("style", style.subgraph),
     )
 
-    return "\n".join(lines)
+
+def _resolve_algorithm(algorithm):
+    if algorithm is None:
+        algorithm = "dot"
+    if not algorithm or not isinstance(algorithm, str):
+        raise ValueError(
+            "The algorithm parameter must be the str name of a valid GraphViz algorithm."
+        )
+    return algorithm
+
+
+def _resolve_format(format):
+    """
+    Resolve the format of a render.
+
+    :param format: The ``format`` argument of the render.
+    :return: A tuple ``(format, graphviz_format)``, where ``format`` has its default applied
+             and ``graphviz_format`` has any ``"ipython/"`` prefix removed.
+    """
+    if format is None:
+        if _ipython.is_execution_context():
+            format = "ipython/svg"
+        else:
+            raise ValueError(
+                "You must specify a format when not in an IPython execution context."
+            )
+
+    is_ipython_format = format.startswith("ipython/")
+    if is_ipython_format:
+        _ipython.assert_execution_context()
+    graphviz_format = format.split("/", 1)[1] if is_ipython_format else format
+    return format, graphviz_format
+
+
+def _check_graphviz(algorithm, graphviz_format, graphviz_bin):
+    """Check that `GraphViz`_ supports the algorithm and format of a render, before the graph is serialized."""
+    if graphviz_format != "raw":
+        _graphviz._check_format(graphviz_bin, algorithm, graphviz_format)
+
+
+def _resolve_optimize(optimize, format, graphviz_format):
+    """
+    Resolve the ``optimize`` option of :func:`render`.
+
+    :return: A dict of keyword arguments for :func:`~nxv.optimize_svg`, or ``None`` to skip optimization.
+    """
+    if optimize is False or optimize is None:
+        return None
+    options = {} if optimize is True else dict(optimize)
+    if graphviz_format.split(":", 1)[0] != "svg":
+        raise ValueError(f"SVG optimization requires an SVG format, not {format!r}.")
+    if options.get("compress") and format != graphviz_format:
+        raise ValueError("Compressed SVG cannot be displayed in IPython.")
+    return options
 
 
 def render(
@@ -169,6 +382,14 @@ def render(
     format: Optional[str] = None,
     graphviz_bin: Optional[str] = None,
     subgraph_func=None,
+    node_order=None,
+    edge_order=None,
+    sort_attributes: bool = False,
+    aggregate_multiedges=False,
+    validate: bool = False,
+    optimize: Union[bool, dict] = False,
+    output=None,
+    profile=False,
 ) -> Optional[bytes]:
     """
     Render a `NetworkX`_ graph using `GraphViz`_.
@@ -180,6 +401,31 @@ def render(
     :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key,
                           where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
                           If it returns ``None`` the node is not in any subgraph.
+    :param node_order: An optional sort key function ``f(u, d)`` that determines the order in which nodes are emitted,
+                       where ``u`` is a `NetworkX`_ node and ``d`` is its attribute dict.
+                       Defaults to the iteration order of the graph.
+    :param edge_order: An optional sort key function ``f(u, v, d)`` that determines the order in which edges are
+                       emitted, where ``(u, v)`` is a `NetworkX`_ edge and ``d`` is its attribute dict.
+                       If the graph has multi-edges, the signature should be ``f(u, v, k, d)`` instead,
+                       where ``k`` is the edge key.
+                       Defaults to the iteration order of the graph.
+    :param sort_attributes: Whether to emit the `GraphViz attributes`_ of each element sorted by name.
+                            Together with ``node_order`` and ``edge_order``, this makes the output deterministic
+                            without the copy made by :func:`~nxv.to_ordered_graph`.
+    :param aggregate_multiedges: Whether to merge the parallel edges between each pair of nodes of a multigraph
+                                 into a single edge, which is much faster to lay out when there are many of them.
+                                 Merged edges are passed to the edge style and to ``edge_order`` as
+                                 ``(u, v, keys, d)``, where ``keys`` is the tuple of the keys of the merged edges.
+                                 If ``True``, ``d`` holds the number of merged edges as ``"count"``,
+                                 the sum of their ``"weight"`` attributes as ``"weight"``, where a missing weight
+                                 counts as 1, and the list of their ``"label"`` attributes as ``"labels"``.
+                                 If a function ``f(u, v, ds)``, ``d`` is its result for the list ``ds``
+                                 of the attribute dicts of the merged edges.
+                                 The graph is not copied. Ignored for graphs without multi-edges.
+    :param validate: Whether to check the `GraphViz attributes`_ that the style gives the graph and a sample of its
+                     nodes, edges and subgraphs against a schema of the attributes that `GraphViz`_ supports,
+                     before serializing the graph. This catches misspelled attribute names and invalid values,
+                     like a ``penwidth`` that is not a number, without waiting for `GraphViz`_ to parse the graph.
     :param algorithm: The `GraphViz`_ layout algorithm.
                       Valid options include
                       ``"circo"``, ``"dot"``, ``"fdp"``, ``"neato"``, ``"osage"``, ``"sfdp"``, ``"twopi"``.
@@ -194,44 +440,471 @@ def render(
                          If neither this parameter nor the ``GRAPHVIZ_BIN`` environment variable is set,
                          then nxv will try to autodetect the ``bin`` directory of the `GraphViz`_ installation.
                          This behavior is for convenience and should not be relied on in production settings.
-    :return: If ``format`` is not an ``"ipython/*"`` format, the render output; otherwise, ``None``.
+    :param optimize: Whether to post-process SVG output with :func:`~nxv.optimize_svg`.
+                     If a dict, it is passed to :func:`~nxv.optimize_svg` as keyword arguments.
+                     Only valid with SVG formats.
+    :param output: An optional file path or binary file object, like a socket file or an HTTP response,
+                   to write the render output to instead of returning it.
+                   The output is streamed in chunks, so it is never held in memory all at once.
+                   Not valid with ``"ipython/*"`` formats.
+    :param profile: Whether to profile the render.
+                    If ``True``, a breakdown of the time spent in each phase of the render is printed to
+                    ``sys.stderr``. If a function ``f(profile)``, it is called with the
+                    :class:`~nxv.RenderProfile` instead.
+                    Renders are also profiled whenever hooks are registered with :func:`~nxv.add_render_hook`.
+    :return: If ``format`` is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+             otherwise, ``None``.
     :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
     :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizAttributeError: If ``validate`` is set and the style gives an element an invalid attribute.
     :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
     """
-    if algorithm is None:
-        algorithm = "dot"
-    if not algorithm or not isinstance(algorithm, str):
-        raise ValueError(
-            "The algorithm parameter must be the str name of a valid GraphViz algorithm."
+    return _render(
+        graph,
+        style,
+        algorithm=algorithm,
+        format=format,
+        graphviz_bin=graphviz_bin,
+        subgraph_func=subgraph_func,
+        node_order=node_order,
+        edge_order=edge_order,
+        sort_attributes=sort_attributes,
+        aggregate_multiedges=aggregate_multiedges,
+        validate=validate,
+        optimize=optimize,
+        output=output,
+        profile=profile,
+        stream=False,
+    )
+
+
+def render_iter(
+    graph: Union[nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph],
+    style: Optional[Style] = None,
+    *,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    subgraph_func=None,
+    node_order=None,
+    edge_order=None,
+    sort_attributes: bool = False,
+    aggregate_multiedges=False,
+    validate: bool = False,
+    optimize: Union[bool, dict] = False,
+    profile=False,
+) -> Iterator[bytes]:
+    """
+    Render a `NetworkX`_ graph using `GraphViz`_, generating the output in chunks as `GraphViz`_ produces it.
+
+    This is suited to streaming web responses. The graph is serialized immediately,
+    but `GraphViz`_ is only started when the first chunk is requested, and is killed if the iterator is closed early.
+    The parameters are as in :func:`~nxv.render`, except that ``"ipython/*"`` formats are not valid
+    and ``format`` is always required.
+
+    :return: An iterator of the chunks of the render output, as bytes.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizError: When the iterator is exhausted, if `GraphViz`_ failed to run on the given inputs.
+    """
+    return _render(
+        graph,
+        style,
+        algorithm=algorithm,
+        format=format,
+        graphviz_bin=graphviz_bin,
+        subgraph_func=subgraph_func,
+        node_order=node_order,
+        edge_order=edge_order,
+        sort_attributes=sort_attributes,
+        aggregate_multiedges=aggregate_multiedges,
+        validate=validate,
+        optimize=optimize,
+        output=None,
+        profile=profile,
+        stream=True,
+    )
+
+
+def _render(
+    graph,
+    style,
+    *,
+    algorithm,
+    format,
+    graphviz_bin,
+    subgraph_func,
+    node_order,
+    edge_order,
+    sort_attributes,
+    optimize,
+    output,
+    profile,
+    stream,
+    aggregate_multiedges=False,
+    validate=False,
+    cancellation=None,
+):
+    if stream and format is None:
+        raise ValueError("A format is required to render to an iterator.")
+    algorithm = _resolve_algorithm(algorithm)
+    format, graphviz_format = _resolve_format(format)
+    optimize = _resolve_optimize(optimize, format, graphviz_format)
+    _check_graphviz(algorithm, graphviz_format, graphviz_bin)
+
+    profiler = _profile.start(profile, algorithm=algorithm, format=format)
+    if profiler is not None:
+        profiler.node_count = graph.number_of_nodes()
+        profiler.edge_count = graph.number_of_edges()
+
+    with _profile.phase(profiler, "style"):
+        style = _timed_style(compose([_root_style, style]), profiler)
+    if validate:
+        with _profile.phase(profiler, "validate"):
+            _validate(graph, style, subgraph_func, aggregate_multiedges)
+    with _profile.phase(profiler, "serialize"):
+        gv = _to_gv(
+            graph,
+            style,
+            subgraph_func=subgraph_func,
+            node_order=node_order,
+            edge_order=edge_order,
+            sort_attributes=sort_attributes,
+            aggregate_multiedges=aggregate_multiedges,
         )
 
-    if format is None:
-        if _ipython.is_execution_context():
-            format = "ipython/svg"
-        else:
-            raise ValueError(
-                "You must specify a format when not in an IPython execution context."
-            )
+    return _render_gv(
+        gv,
+        algorithm=algorithm,
+        format=format,
+        graphviz_format=graphviz_format,
+        graphviz_bin=graphviz_bin,
+        profiler=profiler,
+        profile=profile,
+        optimize=optimize,
+        output=output,
+        stream=stream,
+        cancellation=cancellation,
+    )
 
-    is_ipython_format = format.startswith("ipython/")
-    if is_ipython_format:
-        _ipython.assert_execution_context()
-    graphviz_format = format.split("/", 1)[1] if is_ipython_format else format
 
-    style = compose([_root_style, style])
-    gv = _to_gv(graph, style, subgraph_func=subgraph_func)
+def _render_gv(
+    gv,
+    *,
+    algorithm,
+    format,
+    graphviz_format,
+    graphviz_bin,
+    profiler,
+    profile,
+    counts=None,
+    optimize=None,
+    output=None,
+    stream=False,
+    cancellation=None,
+):
+    """
+    Lay out and output serialized `GraphViz`_ input. This is the part of the render pipeline after serialization.
+
+    :param gv: A `GraphViz`_ string, or an iterable of its lines.
+    :param counts: An optional dict of the ``"nodes"`` and ``"edges"`` counted while generating ``gv``.
+    :param optimize: An optional dict of keyword arguments for :func:`~nxv.optimize_svg`.
+    :param output: An optional file path or binary file object to write the output to.
+    :param stream: Whether to return an iterator of output chunks.
+    :param cancellation: An optional :class:`~nxv._graphviz.Cancellation` to cancel the render with,
+                         when rendering to a return value.
+    :return: The render output, as returned by :func:`render`, or an iterator of its chunks if ``stream``.
+    """
+    if output is not None or stream:
+        if format != graphviz_format:
+            raise ValueError(
+                f"The {format!r} format cannot be rendered to an output or an iterator."
+            )
+        return _render_gv_chunks(
+            gv,
+            algorithm=algorithm,
+            graphviz_format=graphviz_format,
+            graphviz_bin=graphviz_bin,
+            profiler=profiler,
+            profile=profile,
+            counts=counts,
+            optimize=optimize,
+            output=output,
+            stream=stream,
+        )
 
     if graphviz_format == "raw":
+        gv = _join_raw(gv, profiler)
         output = gv
     else:
-        output = _graphviz.run(gv, algorithm, graphviz_format, graphviz_bin)
+        output = _graphviz.run(
+            gv,
+            algorithm,
+            graphviz_format,
+            graphviz_bin,
+            profile=profiler,
+            cancellation=cancellation,
+        )
+    if optimize is not None:
+        with _profile.phase(profiler, "optimize"):
+            output = _svg.optimize_svg(output, **optimize)
+    if graphviz_format == "raw":
+        # Raw output is the GraphViz string, whose UTF-8 encoded size is already measured.
+        _record(profiler, counts, profiler and profiler.gv_bytes)
+    else:
+        _record(profiler, counts, len(output))
+
+    if format != graphviz_format:
+        with _profile.phase(profiler, "display"):
+            _ipython.display(output, format)
+        output = None
+
+    if profiler is not None:
+        _profile.report(profiler, profile)
+    return output
+
+
+def _join_raw(gv, profiler):
+    if not isinstance(gv, str):
+        with _profile.phase(profiler, "serialize"):
+            gv = "\n".join(gv)
+    if profiler is not None:
+        profiler.gv_bytes = len(gv.encode("utf-8"))
+    return gv
+
+
+def _record(profiler, counts, output_bytes):
+    if profiler is None:
+        return
+    profiler.output_bytes = output_bytes
+    if counts is not None:
+        profiler.node_count = counts["nodes"]
+        profiler.edge_count = counts["edges"]
+
+
+def _report_after(chunks, profiler, profile, counts):
+    """Generate the output chunks, and record and report the profile once they are exhausted."""
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        yield chunk
+    _record(profiler, counts, size)
+    _profile.report(profiler, profile)
+
+
+@contextlib.contextmanager
+def _removed_on_error(path):
+    """Remove the partially written output file at ``path`` if writing it fails, so it is not mistaken for a render."""
+    try:
+        yield
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        raise
+
+
+def _render_gv_chunks(
+    gv,
+    *,
+    algorithm,
+    graphviz_format,
+    graphviz_bin,
+    profiler,
+    profile,
+    counts,
+    optimize,
+    output,
+    stream,
+):
+    """
+    Lay out serialized `GraphViz`_ input, streaming the output in chunks instead of returning it.
 
-    if is_ipython_format:
-        _ipython.display(output, format)
+    With a file path and no post-processing, `GraphViz`_ writes the file itself.
+    Otherwise, the output is piped through in chunks, so it is never held in memory all at once.
+    Any SVG optimization runs on the chunks as they arrive, so its time is part of the ``"layout"`` phase.
+
+    :return: An iterator of the output chunks if ``stream``, otherwise ``None``.
+    """
+    is_path = isinstance(output, (str, os.PathLike))
+    if is_path and graphviz_format != "raw" and optimize is None:
+        with _removed_on_error(output):
+            _graphviz.run(
+                gv,
+                algorithm,
+                graphviz_format,
+                graphviz_bin,
+                profile=profiler,
+                output=output,
+            )
+        _record(profiler, counts, os.path.getsize(output))
+        if profiler is not None:
+            _profile.report(profiler, profile)
         return None
+
+    if graphviz_format == "raw":
+        chunks = [_join_raw(gv, profiler).encode("utf-8")]
+    else:
+        chunks = _graphviz.run_iter(
+            gv, algorithm, graphviz_format, graphviz_bin, profile=profiler
+        )
+    if optimize is not None:
+        chunks = _svg._iter_optimize_svg(chunks, **optimize)
+    if profiler is not None:
+        chunks = _report_after(chunks, profiler, profile, counts)
+    if stream:
+        return iter(chunks)
+    if is_path:
+        with _removed_on_error(output), open(output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
     else:
-        return output
+        for chunk in chunks:
+            output.write(chunk)
+    return None
+
+
+def _iter_gv_from_iterables(
+    nodes,
+    edges,
+    style: Style,
+    *,
+    directed=True,
+    multi=False,
+    graph_attrs=None,
+    counts=None,
+):
+    """
+    Serializes nodes and edges from iterables as a sequence of `GraphViz`_ lines, in a single pass.
+
+    Nodes that appear in ``edges`` but not in ``nodes`` are declared, with an empty attribute dict,
+    just before the first edge that references them.
+    The only state kept is the map from each node to its `GraphViz`_ id.
+
+    :param nodes: An iterable of ``(u, d)`` pairs.
+    :param edges: An iterable of ``(u, v, d)`` triples, or of ``(u, v, k, d)`` tuples if ``multi``.
+    :param style: A :class:`~nxv.Style` object.
+    :param directed: Whether the edges are directed.
+    :param multi: Whether the edges have keys.
+    :param graph_attrs: The attribute dict of the graph, passed to the graph style as ``d``.
+    :param counts: An optional dict in which to count the ``"nodes"`` and ``"edges"``.
+    :return: Generates the lines of the `GraphViz`_ string, without line terminators.
+    """
+    if counts is None:
+        counts = {}
+    counts["nodes"] = counts["edges"] = 0
+    edge_length = 4 if multi else 3
+    graph_attrs = _apply(style.graph, None, graph_attrs or {})
+    graph_type = graph_attrs.get("type", "digraph" if directed else "graph")
+    assert graph_type in {"graph", "digraph"}
+    edge_str = EDGE_OPERATORS[graph_type]
+    ids = {}
+
+    def node_declaration(u, d):
+        id = ids.get(u)
+        if id is None:
+            id = ids[u] = f"node{len(ids):04}"
+        return f"{id} {_attributes_modifier(_apply(style.node, u, d))};"
+
+    def body():
+        yield _graph_attrs_declaration(graph_attrs)
+        for u, d in nodes:
+            yield node_declaration(u, d)
+        for edge in edges:
+            if len(edge) != edge_length:
+                raise ValueError(
+                    f"Expected edges with {edge_length} elements, but got {edge!r}. "
+                    f"Edges must be (u, v, k, d) if multi is True, and (u, v, d) otherwise."
+                )
+            u, v = edge[:2]
+            for w in (u, v):
+                if w not in ids:
+                    yield node_declaration(w, {})
+            edge_attrs = _apply(style.edge, *edge)
+            yield f"{ids[u]} {edge_str} {ids[v]} {_attributes_modifier(edge_attrs)};"
+            counts["edges"] += 1
+        counts["nodes"] = len(ids)
+
+    return _block(_graph_identifier(graph_type, graph_attrs.get("name", "G")), body())
+
+
+def render_edges(
+    nodes: Optional[Iterable] = None,
+    edges: Optional[Iterable] = None,
+    style: Optional[Style] = None,
+    *,
+    directed: bool = True,
+    multi: bool = False,
+    graph_attrs: Optional[dict] = None,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    graphviz_bin: Optional[str] = None,
+    output=None,
+    profile=False,
+) -> Optional[Union[bytes, str]]:
+    """
+    Render nodes and edges from iterables using `GraphViz`_, without building a `NetworkX`_ graph.
+
+    The iterables are consumed once, and the `GraphViz`_ input is streamed to `GraphViz`_ as it is generated,
+    so memory use is bounded by the map from each node to its `GraphViz`_ id.
+    This makes it possible to render very large graphs straight from sources like database cursors or file readers.
+
+    The style is applied exactly as in :func:`~nxv.render`. The graph style is called as ``f(g, d)``
+    with ``g`` as ``None`` and ``d`` as ``graph_attrs``.
+
+    :param nodes: An optional iterable of ``(u, d)`` pairs, where ``u`` is a node and ``d`` is its attribute dict.
+                  Nodes that only appear in ``edges`` are styled with an empty attribute dict.
+    :param edges: An optional iterable of ``(u, v, d)`` triples, where ``(u, v)`` is an edge and ``d`` is its
+                  attribute dict. If ``multi`` is ``True``, an iterable of ``(u, v, k, d)`` tuples instead,
+                  where ``k`` is the edge key.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param directed: Whether the edges are directed.
+    :param multi: Whether the edges have keys.
+    :param graph_attrs: An optional attribute dict for the graph.
+    :param algorithm: The `GraphViz`_ layout algorithm, as in :func:`~nxv.render`.
+    :param format: The `GraphViz`_ output format, as in :func:`~nxv.render`.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param output: An optional file path or binary file object to write the render output to,
+                   as in :func:`~nxv.render`.
+    :param profile: Whether to profile the render, as in :func:`~nxv.render`.
+                    Since serialization is streamed, its time is part of the ``"layout"`` phase
+                    unless ``format`` is ``"raw"``.
+    :return: If ``format`` is not an ``"ipython/*"`` format and there is no ``output``, the render output;
+             otherwise, ``None``.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    """
+    algorithm = _resolve_algorithm(algorithm)
+    format, graphviz_format = _resolve_format(format)
+    _check_graphviz(algorithm, graphviz_format, graphviz_bin)
+
+    profiler = _profile.start(profile, algorithm=algorithm, format=format)
+    with _profile.phase(profiler, "style"):
+        style = _timed_style(compose([_root_style, style]), profiler)
+    counts = {}
+    lines = _iter_gv_from_iterables(
+        nodes or (),
+        edges or (),
+        style,
+        directed=directed,
+        multi=multi,
+        graph_attrs=graph_attrs,
+        counts=counts,
+    )
+    return _render_gv(
+        lines,
+        algorithm=algorithm,
+        format=format,
+        graphviz_format=graphviz_format,
+        graphviz_bin=graphviz_bin,
+        profiler=profiler,
+        profile=profile,
+        counts=counts,
+        output=output,
+    )
 
 
 def _clamp(a, b, value):
@@ -239,7 +912,11 @@ def _clamp(a, b, value):
 
 
 def _to_byte(value):
-    return _clamp(0, 255, int(256 * float(value)))
+    value = float(value)
+    # A NaN channel is missing, and counts as 0.
+    if math.isnan(value):
+        return 0
+    return _clamp(0, 255, int(256 * value))
 
 
 def color(channels):
@@ -251,3 +928,22 @@ def color(channels):
     """
     assert len(channels) in (3, 4)
     return "#" + "".join(f"{_to_byte(value):02X}" for value in channels)
+
+
+def colors(channels):
+    """
+    Convert an array of RGB or RGBA color channel values to `GraphViz`_ color strings.
+
+    This is the bulk equivalent of :func:`color`, and requires `NumPy`_.
+
+    :param channels: An array-like of shape ``(N, 3)`` or ``(N, 4)``. Values should be in the range [0, 1].
+    :return: A list of ``N`` `GraphViz`_ color strings.
+    """
+    import numpy as np
+
+    channels = np.nan_to_num(np.asarray(channels, dtype=float))
+    assert channels.ndim == 2 and channels.shape[1] in (3, 4)
+    width = 2 * channels.shape[1]
+    data = np.clip(np.trunc(256 * channels), 0, 255).astype(np.uint8)
+    digits = data.tobytes().hex().upper()
+    return ["#" + digits[i : i + width] for i in range(0, len(digits), width)]
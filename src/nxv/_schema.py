@@ -0,0 +1,380 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+A schema of `GraphViz attributes`_, for checking styles before `GraphViz`_ runs.
+
+Each attribute maps to the kinds of element that use it, as in the `GraphViz attributes`_ documentation:
+``G`` for graphs, ``S`` for subgraphs, ``C`` for clusters, ``N`` for nodes, and ``E`` for edges,
+and to the type of its values.
+"""
+import difflib
+import itertools
+import math
+import numbers
+import re
+
+# name: (used by, type)
+ATTRIBUTES = {
+    "_background": ("G", "string"),
+    "area": ("NC", "double"),
+    "arrowhead": ("E", "arrowType"),
+    "arrowsize": ("E", "double"),
+    "arrowtail": ("E", "arrowType"),
+    "bb": ("GC", "string"),
+    "beautify": ("G", "bool"),
+    "bgcolor": ("GC", "color"),
+    "center": ("G", "bool"),
+    "charset": ("G", "string"),
+    "class": ("GCNE", "string"),
+    "cluster": ("CS", "bool"),
+    "clusterrank": ("G", "clusterMode"),
+    "color": ("CNE", "color"),
+    "colorscheme": ("GCNE", "string"),
+    "comment": ("GNE", "string"),
+    "compound": ("G", "bool"),
+    "concentrate": ("G", "bool"),
+    "constraint": ("E", "bool"),
+    "Damping": ("G", "double"),
+    "decorate": ("E", "bool"),
+    "defaultdist": ("G", "double"),
+    "dim": ("G", "int"),
+    "dimen": ("G", "int"),
+    "dir": ("E", "dirType"),
+    "diredgeconstraints": ("G", "string"),
+    "distortion": ("N", "double"),
+    "dpi": ("G", "double"),
+    "edgehref": ("E", "string"),
+    "edgetarget": ("E", "string"),
+    "edgetooltip": ("E", "string"),
+    "edgeURL": ("E", "string"),
+    "epsilon": ("G", "double"),
+    "esep": ("G", "string"),
+    "fillcolor": ("CNE", "color"),
+    "fixedsize": ("N", "string"),
+    "fontcolor": ("GCNE", "color"),
+    "fontname": ("GCNE", "string"),
+    "fontnames": ("G", "string"),
+    "fontpath": ("G", "string"),
+    "fontsize": ("GCNE", "double"),
+    "forcelabels": ("G", "bool"),
+    "gradientangle": ("GCN", "int"),
+    "group": ("N", "string"),
+    "head_lp": ("E", "string"),
+    "headclip": ("E", "bool"),
+    "headhref": ("E", "string"),
+    "headlabel": ("E", "string"),
+    "headport": ("E", "string"),
+    "headtarget": ("E", "string"),
+    "headtooltip": ("E", "string"),
+    "headURL": ("E", "string"),
+    "height": ("N", "double"),
+    "href": ("GCNE", "string"),
+    "id": ("GCNE", "string"),
+    "image": ("N", "string"),
+    "imagepath": ("G", "string"),
+    "imagepos": ("N", "string"),
+    "imagescale": ("N", "string"),
+    "inputscale": ("G", "double"),
+    "K": ("GC", "double"),
+    "label": ("GCNE", "string"),
+    "label_scheme": ("G", "int"),
+    "labelangle": ("E", "double"),
+    "labeldistance": ("E", "double"),
+    "labelfloat": ("E", "bool"),
+    "labelfontcolor": ("E", "color"),
+    "labelfontname": ("E", "string"),
+    "labelfontsize": ("E", "double"),
+    "labelhref": ("E", "string"),
+    "labeljust": ("GC", "string"),
+    "labelloc": ("GCN", "string"),
+    "labeltarget": ("E", "string"),
+    "labeltooltip": ("E", "string"),
+    "labelURL": ("E", "string"),
+    "landscape": ("G", "bool"),
+    "layer": ("CNE", "string"),
+    "layerlistsep": ("G", "string"),
+    "layers": ("G", "string"),
+    "layerselect": ("G", "string"),
+    "layersep": ("G", "string"),
+    "layout": ("G", "string"),
+    "len": ("E", "double"),
+    "levels": ("G", "int"),
+    "levelsgap": ("G", "double"),
+    "lhead": ("E", "string"),
+    "lheight": ("GC", "double"),
+    "linelength": ("G", "int"),
+    "lp": ("GCE", "string"),
+    "ltail": ("E", "string"),
+    "lwidth": ("GC", "double"),
+    "margin": ("GCN", "string"),
+    "maxiter": ("G", "int"),
+    "mclimit": ("G", "double"),
+    "mindist": ("G", "double"),
+    "minlen": ("E", "int"),
+    "mode": ("G", "string"),
+    "model": ("G", "string"),
+    "mosek": ("G", "bool"),
+    "newrank": ("G", "bool"),
+    "nodesep": ("G", "double"),
+    "nojustify": ("GCNE", "bool"),
+    "normalize": ("G", "string"),
+    "notranslate": ("G", "bool"),
+    "nslimit": ("G", "double"),
+    "nslimit1": ("G", "double"),
+    "oneblock": ("G", "bool"),
+    "ordering": ("GN", "string"),
+    "orientation": ("GN", "string"),
+    "outputorder": ("G", "outputMode"),
+    "overlap": ("G", "string"),
+    "overlap_scaling": ("G", "double"),
+    "overlap_shrink": ("G", "bool"),
+    "pack": ("G", "string"),
+    "packmode": ("G", "string"),
+    "pad": ("G", "string"),
+    "page": ("G", "string"),
+    "pagedir": ("G", "pagedir"),
+    "pencolor": ("C", "color"),
+    "penwidth": ("CNE", "double"),
+    "peripheries": ("CN", "int"),
+    "pin": ("N", "bool"),
+    "pos": ("NE", "string"),
+    "quadtree": ("G", "string"),
+    "quantum": ("G", "double"),
+    "rank": ("S", "rankType"),
+    "rankdir": ("G", "rankdir"),
+    "ranksep": ("G", "string"),
+    "ratio": ("G", "string"),
+    "rects": ("N", "string"),
+    "regular": ("N", "bool"),
+    "remincross": ("G", "bool"),
+    "repulsiveforce": ("G", "double"),
+    "resolution": ("G", "double"),
+    "root": ("GN", "string"),
+    "rotate": ("G", "int"),
+    "rotation": ("G", "double"),
+    "samehead": ("E", "string"),
+    "sametail": ("E", "string"),
+    "samplepoints": ("N", "int"),
+    "scale": ("G", "string"),
+    "searchsize": ("G", "int"),
+    "sep": ("G", "string"),
+    "shape": ("N", "shape"),
+    "shapefile": ("N", "string"),
+    "showboxes": ("GNE", "int"),
+    "sides": ("N", "int"),
+    "size": ("G", "string"),
+    "skew": ("N", "double"),
+    "smoothing": ("G", "string"),
+    "sortv": ("GCN", "int"),
+    "splines": ("G", "string"),
+    "start": ("G", "string"),
+    "style": ("GCNE", "style"),
+    "stylesheet": ("G", "string"),
+    "tail_lp": ("E", "string"),
+    "tailclip": ("E", "bool"),
+    "tailhref": ("E", "string"),
+    "taillabel": ("E", "string"),
+    "tailport": ("E", "string"),
+    "tailtarget": ("E", "string"),
+    "tailtooltip": ("E", "string"),
+    "tailURL": ("E", "string"),
+    "target": ("GCNE", "string"),
+    "TBbalance": ("G", "string"),
+    "tooltip": ("CNE", "string"),
+    "truecolor": ("G", "bool"),
+    "URL": ("GCNE", "string"),
+    "vertices": ("N", "string"),
+    "viewport": ("G", "string"),
+    "voro_margin": ("G", "double"),
+    "weight": ("E", "double"),
+    "width": ("N", "double"),
+    "xdotversion": ("G", "string"),
+    "xlabel": ("NE", "string"),
+    "xlp": ("NE", "string"),
+    "z": ("N", "double"),
+}
+# The graph attributes that nxv reads itself, for the graph type and the graph and subgraph names.
+NXV_ATTRIBUTES = {"graph": {"type", "name"}, "subgraph": {"name"}}
+# The letters of the kinds of element that may use an attribute on each kind of element.
+KIND_USAGES = {"graph": "G", "subgraph": "GSC", "node": "N", "edge": "E"}
+
+SHAPES = set(
+    """
+    box polygon ellipse oval circle point egg triangle plaintext plain diamond trapezium parallelogram house
+    pentagon hexagon septagon octagon doublecircle doubleoctagon tripleoctagon invtriangle invtrapezium invhouse
+    Mdiamond Msquare Mcircle rect rectangle square star none underline cylinder note tab folder box3d component
+    promoter cds terminator utr primersite restrictionsite fivepoverhang threepoverhang noverhang assembly
+    signature insulator ribosite rnastab proteasesite proteinstab rpromoter rarrow larrow lpromoter
+    record Mrecord custom epsf
+    """.split()
+)
+STYLES = set(
+    """
+    solid dashed dotted bold invis filled striped wedged diagonals rounded radial tapered setlinewidth
+    """.split()
+)
+ENUMS = {
+    "clusterMode": {"local", "global", "none"},
+    "dirType": {"forward", "back", "both", "none"},
+    "outputMode": {"breadthfirst", "nodesfirst", "edgesfirst"},
+    "pagedir": {"BL", "BR", "TL", "TR", "RB", "RT", "LB", "LT"},
+    "rankType": {"same", "min", "source", "max", "sink"},
+    "rankdir": {"TB", "LR", "BT", "RL"},
+}
+DESCRIPTIONS = {
+    "arrowType": "an arrow shape like 'normal' or 'odiamond'",
+    "bool": "a boolean",
+    "color": "a color name, a hex color, or a tuple of channels",
+    "double": "a number",
+    "int": "an integer",
+    "shape": "a node shape",
+    "style": "a comma-separated list of styles",
+}
+
+# The number of nodes, and of edges, whose attributes are checked in a render.
+SAMPLE_SIZE = 1000
+# The types of attribute values that are remembered once checked, and how many are remembered.
+CHECKED_VALUE_TYPES = (str, int, float, bool)
+CHECKED_SIZE = 1 << 16
+
+_INT = re.compile(r"\s*[-+]?\d+\s*")
+_DOUBLE = re.compile(r"\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*")
+_ARROW = re.compile(
+    r"((o?[lr]?(box|crow|curve|icurve|diamond|dot|inv|none|normal|tee|vee))+"
+    r"|ediamond|open|halfopen|empty|invempty)"
+)
+_STYLE_ITEM = re.compile(r"\s*(\w+)\s*(\([^)]*\))?\s*")
+
+
+def _is_number(value, pattern):
+    # Any real number is accepted, like the NumPy scalars of DataFrame columns, which nxv serializes as numbers.
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, numbers.Real):
+        if pattern is _INT:
+            return isinstance(value, numbers.Integral)
+        return not math.isnan(value)
+    return isinstance(value, str) and pattern.fullmatch(value) is not None
+
+
+def _is_bool(value):
+    # NumPy booleans are not integers, so they are recognized by name ("bool_", or "bool" since NumPy 2).
+    if isinstance(value, (bool, numbers.Integral)):
+        return True
+    if type(value).__module__ == "numpy" and type(value).__name__ in {"bool_", "bool"}:
+        return True
+    return isinstance(value, str) and (
+        value.lower() in {"true", "false", "yes", "no"}
+        or _INT.fullmatch(value) is not None
+    )
+
+
+def _is_color(value):
+    # Colors are strings, or sequences of RGB or RGBA channels like tuples and NumPy arrays.
+    if isinstance(value, str):
+        return True
+    try:
+        return len(value) in (3, 4)
+    except TypeError:
+        return False
+
+
+def _is_valid(value, value_type):
+    if value_type == "string":
+        return True
+    if value_type == "bool":
+        return _is_bool(value)
+    if value_type == "int":
+        return _is_number(value, _INT)
+    if value_type == "double":
+        return _is_number(value, _DOUBLE)
+    if value_type == "color":
+        return _is_color(value)
+    if not isinstance(value, str):
+        return False
+    if value_type == "shape":
+        return value in SHAPES
+    if value_type == "arrowType":
+        return _ARROW.fullmatch(value) is not None
+    if value_type == "style":
+        items = value.split(",") if value.strip() else []
+        return all(
+            match is not None and match.group(1) in STYLES
+            for match in map(_STYLE_ITEM.fullmatch, items)
+        )
+    return value in ENUMS[value_type]
+
+
+def _describe_type(type):
+    if type in ENUMS:
+        return "one of " + ", ".join(repr(value) for value in sorted(ENUMS[type]))
+    return DESCRIPTIONS[type]
+
+
+def _check_attribute(name, value, kind, element):
+    from nxv import GraphVizAttributeError
+
+    if name in NXV_ATTRIBUTES.get(kind, ()):
+        return
+    usages = set(KIND_USAGES[kind])
+    schema = ATTRIBUTES.get(name)
+    if schema is None or not set(schema[0]) & usages:
+        if schema is None:
+            message = f"Unknown {kind} attribute {name!r} on {element}."
+        else:
+            message = (
+                f"The {name!r} attribute is not used by {kind}s, but is on {element}."
+            )
+        names = [n for n, (used_by, _) in ATTRIBUTES.items() if set(used_by) & usages]
+        suggestions = difflib.get_close_matches(name, names, n=1)
+        if suggestions:
+            message += f" Did you mean {suggestions[0]!r}?"
+        raise GraphVizAttributeError(message)
+    if value is None or isinstance(value, str) and value == "":
+        return
+    if not _is_valid(value, schema[1]):
+        raise GraphVizAttributeError(
+            f"Invalid value {value!r} for the {kind} attribute {name!r} on {element}. "
+            f"Expected {_describe_type(schema[1])}."
+        )
+
+
+def check_attributes(attrs, kind, element, checked=None):
+    """
+    Check the attributes of an element against the schema.
+
+    :param attrs: The attribute dict of the element.
+    :param kind: The kind of the element: ``"graph"``, ``"subgraph"``, ``"node"``, or ``"edge"``.
+    :param element: A description of the element for error messages, like ``"node 3"``.
+    :param checked: An optional set of the valid scalar attributes checked so far, which are not checked again.
+    :raises GraphVizAttributeError: If an attribute is unknown, is not used by this kind of element,
+                                    or has an invalid value.
+    """
+    for name, value in attrs.items():
+        if checked is None or type(value) not in CHECKED_VALUE_TYPES:
+            _check_attribute(name, value, kind, element)
+            continue
+        key = (kind, name, type(value), value)
+        if key not in checked:
+            _check_attribute(name, value, kind, element)
+            if len(checked) >= CHECKED_SIZE:
+                checked.clear()
+            checked.add(key)
+
+
+def sample(iterable, count, size=SAMPLE_SIZE):
+    """Take about ``size`` items spread evenly over an iterable of ``count`` items."""
+    return itertools.islice(iterable, 0, None, max(1, count // size))
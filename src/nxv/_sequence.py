@@ -0,0 +1,239 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Rendering sequences of graph snapshots with a shared layout."""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import networkx as nx
+
+from nxv import _graphviz
+from nxv._rendering import (
+    _iter_gv,
+    _resolve_algorithm,
+    _resolve_format,
+    _root_style,
+    _to_gv,
+)
+from nxv._style import Style, compose
+
+LAYOUTS = ("union", "seeded")
+POINTS_PER_INCH = 72
+
+_SVG_ROOT = re.compile(rb"<svg\b[^>]*>")
+_SVG_SIZE = re.compile(rb'\s(width|height)="([\d.]+)pt"')
+# Element ids, and the references to them from url(#...) paints and from href and xlink:href attributes.
+_SVG_ID = re.compile(rb"""\sid="|url\(['"]?#|href="#""")
+
+
+def _union_positions(snapshots, style, subgraph_func, algorithm, graphviz_bin):
+    """
+    Lay out the union of the snapshots once.
+
+    :return: A tuple ``(positions, size)`` where ``positions`` maps each node to its center in points,
+             and ``size`` is the ``(width, height)`` of the layout in points.
+    """
+    union = nx.compose_all(snapshots)
+    gv = _to_gv(union, compose([_root_style, style]), subgraph_func)
+    plain = _graphviz.run(gv, algorithm, "plain", graphviz_bin).decode("utf-8")
+    ids = {f"node{i:04}": u for i, u in enumerate(union.nodes)}
+    positions = {}
+    size = (0.0, 0.0)
+    for line in plain.splitlines():
+        fields = line.split()
+        if fields and fields[0] == "graph":
+            size = (
+                float(fields[2]) * POINTS_PER_INCH,
+                float(fields[3]) * POINTS_PER_INCH,
+            )
+        elif fields and fields[0] == "node":
+            x, y = float(fields[2]), float(fields[3])
+            positions[ids[fields[1]]] = (x * POINTS_PER_INCH, y * POINTS_PER_INCH)
+    return positions, size
+
+
+def _frame_gv(snapshot, style, subgraph_func, positions, size, layout):
+    """
+    Serialize a snapshot with every node positioned as in the union layout.
+
+    Two invisible anchor nodes are pinned to the corners of the union layout,
+    so every frame has the same bounding box and nodes stay in place across frames.
+    """
+    # neato -n2 reads positions in points and keeps every node in place.
+    # Otherwise, neato reads positions in inches and only keeps the pinned anchors in place.
+    scale = 1 if layout == "union" else 1 / POINTS_PER_INCH
+    anchor_pin = "" if layout == "union" else "!"
+
+    def pos(x, y, pin=""):
+        return f"{x * scale:.2f},{y * scale:.2f}{pin}"
+
+    def node_pos(u, d):
+        return {"pos": pos(*positions[u])} if u in positions else {}
+
+    frame_style = compose([_root_style, style, Style(node=node_pos)])
+    lines = list(_iter_gv(snapshot, frame_style, subgraph_func))
+    anchor = 'style="invis", shape="point", width="0", height="0", label=""'
+    lines[-1:-1] = [
+        f'    anchor0 [{anchor}, pos="{pos(0, 0, anchor_pin)}"];',
+        f'    anchor1 [{anchor}, pos="{pos(*size, anchor_pin)}"];',
+    ]
+    return "\n".join(lines)
+
+
+def _frame_path(output, index, format):
+    if "{index" in output:
+        return output.format(index=index)
+    extension = "gv" if format == "raw" else format.split(":", 1)[0]
+    return os.path.join(output, f"{index:04}.{extension}")
+
+
+def animate_svg(frames: Sequence[bytes], *, frame_duration: float = 1.0) -> bytes:
+    """
+    Combine SVG frames into one animated SVG that shows each frame in turn, in a loop.
+
+    The animation uses SVG ``<animate>`` elements, so it plays in browsers without any script.
+    Viewers that do not support animation show the first frame.
+
+    The ids of each frame are prefixed with the frame index, along with the references to them,
+    so that gradients, clip paths and links of different frames do not collide.
+
+    :param frames: The SVG frames, as bytes.
+    :param frame_duration: How long each frame is shown, in seconds.
+    :return: The animated SVG.
+    """
+    count = len(frames)
+    if not count:
+        raise ValueError("At least one frame is required to animate.")
+    key_times = ";".join(f"{i / count:.6g}" for i in range(count))
+    width = height = 0.0
+    groups = []
+    for i, frame in enumerate(frames):
+        match = _SVG_ROOT.search(frame)
+        root = match.group()
+        for name, value in _SVG_SIZE.findall(root):
+            if name == b"width":
+                width = max(width, float(value))
+            else:
+                height = max(height, float(value))
+        # Nested sizes are in the user units of the animation, not in points.
+        root = _SVG_SIZE.sub(rb' \1="\2"', root)
+        prefix = f"f{i}_".encode("utf-8")
+        body = _SVG_ID.sub(lambda m: m.group() + prefix, frame[match.end() :])
+        values = ";".join("visible" if j == i else "hidden" for j in range(count))
+        animation = (
+            f'<g visibility="{"visible" if i == 0 else "hidden"}">'
+            f'<animate attributeName="visibility" values="{values}" keyTimes="{key_times}" '
+            f'dur="{count * frame_duration:g}s" calcMode="discrete" repeatCount="indefinite"/>'
+        )
+        groups.append(animation.encode("utf-8") + root + body.strip() + b"</g>")
+    header = (
+        f'<svg width="{width:g}pt" height="{height:g}pt" viewBox="0 0 {width:g} {height:g}" '
+        'xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+    )
+    return b"\n".join([header.encode("utf-8"), *groups, b"</svg>"])
+
+
+def _resolve_sequence_format(format, layout, animate):
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}. Valid layouts are {LAYOUTS}.")
+    if format is None:
+        raise ValueError("A format is required to render a sequence.")
+    format, graphviz_format = _resolve_format(format)
+    if format != graphviz_format:
+        raise ValueError(f"The {format!r} format cannot be used to render a sequence.")
+    if animate and graphviz_format.split(":", 1)[0] != "svg":
+        raise ValueError("Animations require an SVG format.")
+    return graphviz_format
+
+
+def render_sequence(
+    snapshots: Sequence[nx.Graph],
+    style: Optional[Style] = None,
+    *,
+    algorithm: Optional[str] = None,
+    format: Optional[str] = None,
+    layout: str = "union",
+    graphviz_bin: Optional[str] = None,
+    subgraph_func=None,
+    output: Optional[str] = None,
+    animate: bool = False,
+    frame_duration: float = 1.0,
+    workers: Optional[int] = None,
+) -> Optional[Union[List[bytes], bytes]]:
+    """
+    Render a sequence of `NetworkX`_ graph snapshots as frames in which nodes keep their positions.
+
+    The union of the snapshots is laid out once with ``algorithm``. Each frame is then laid out with ``neato``
+    starting from the union layout, so a node is in the same place in every frame it appears in.
+    The frames are rendered in parallel, one `GraphViz`_ process per frame.
+
+    :param snapshots: A sequence of `NetworkX`_ graphs.
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param algorithm: The `GraphViz`_ layout algorithm for the union layout. Defaults to ``"dot"``.
+    :param format: The `GraphViz`_ output format of the frames, like ``"svg"`` or ``"png"``.
+    :param layout: ``"union"`` to use the union layout exactly, or ``"seeded"`` to let each frame
+                   adjust the union layout to its own nodes and edges.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param subgraph_func: An optional function ``f(u, d)`` that returns a subgraph key, as in :func:`~nxv.render`.
+    :param output: An optional path to write the frames to instead of returning them.
+                   If it contains ``{index}``, like ``"frames/{index:04}.svg"``, it is formatted with each frame index.
+                   Otherwise it is a directory, and the frames are written to numbered files in it.
+                   With ``animate``, it is the path of the animated SVG.
+    :param animate: Whether to combine SVG frames into one animated SVG with :func:`~nxv.animate_svg`.
+    :param frame_duration: How long each frame of an animation is shown, in seconds.
+    :param workers: The number of frames to render at once. Defaults to the number of CPUs.
+    :return: If there is no ``output``, the frames, or the animated SVG if ``animate``; otherwise, ``None``.
+    :raises GraphVizInstallationNotFoundError: If nxv cannot find a `GraphViz`_ installation.
+    :raises GraphVizAlgorithmNotFoundError: If nxv cannot find the specified algorithm in a `GraphViz`_ installation.
+    :raises GraphVizFormatNotFoundError: If the `GraphViz`_ installation does not support the specified format.
+    :raises GraphVizError: If `GraphViz`_ failed to run on the given inputs.
+    """
+    algorithm = _resolve_algorithm(algorithm)
+    graphviz_format = _resolve_sequence_format(format, layout, animate)
+    snapshots = list(snapshots)
+    if not snapshots:
+        raise ValueError("At least one snapshot is required to render a sequence.")
+    positions, size = _union_positions(
+        snapshots, style, subgraph_func, algorithm, graphviz_bin
+    )
+    args = ["-n2"] if layout == "union" else []
+
+    def render_frame(index):
+        gv = _frame_gv(snapshots[index], style, subgraph_func, positions, size, layout)
+        if graphviz_format == "raw":
+            frame = gv.encode("utf-8")
+        else:
+            frame = _graphviz.run(gv, "neato", graphviz_format, graphviz_bin, args=args)
+        if output is not None and not animate:
+            path = _frame_path(output, index, graphviz_format)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(frame)
+            return None
+        return frame
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        frames = list(executor.map(render_frame, range(len(snapshots))))
+
+    if animate:
+        animation = animate_svg(frames, frame_duration=frame_duration)
+        if output is None:
+            return animation
+        with open(output, "wb") as f:
+            f.write(animation)
+        return None
+    return None if output is not None else frames
@@ -0,0 +1,319 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Streaming post-processing of `GraphViz`_ SVG output."""
+import codecs
+import hashlib
+import re
+import zlib
+from typing import Iterable, Optional, Union
+
+# Presentation attributes that are moved into CSS classes.
+HOISTED_ATTRIBUTES = {
+    "fill",
+    "fill-opacity",
+    "font-family",
+    "font-size",
+    "font-style",
+    "font-weight",
+    "stroke",
+    "stroke-dasharray",
+    "stroke-opacity",
+    "stroke-width",
+    "text-anchor",
+}
+# Presentation attributes that are lengths, which need a unit in CSS.
+LENGTH_ATTRIBUTES = {"font-size", "stroke-width"}
+# Attributes whose numbers are rounded.
+COORDINATE_ATTRIBUTES = {
+    "cx",
+    "cy",
+    "d",
+    "font-size",
+    "height",
+    "points",
+    "r",
+    "rx",
+    "ry",
+    "stroke-width",
+    "viewBox",
+    "width",
+    "x",
+    "x1",
+    "x2",
+    "y",
+    "y1",
+    "y2",
+}
+
+# Transform functions whose numbers are rounded. Scale factors multiply every coordinate, so they are kept exact.
+ROUNDED_TRANSFORMS = {"translate", "rotate", "skewX", "skewY"}
+
+_CHUNK_SIZE = 1 << 16
+_TAG = re.compile(r"""<[^"'>]*(?:(?:"[^"]*"|'[^']*')[^"'>]*)*>""")
+_TAG_NAME = re.compile(r"</?\s*([^\s/>]+)")
+_ATTRIBUTE = re.compile(r"""([^\s=/>]+)\s*=\s*("[^"]*"|'[^']*')""")
+_NUMBER = re.compile(r"-?\d*\.\d+(?:[eE][-+]?\d+)?")
+_NUMBER_ONLY = re.compile(r"-?\d*\.?\d+")
+_TRANSFORM = re.compile(r"(\w+)\s*\(([^)]*)\)")
+# Values that are safe to copy into a CSS declaration as they are.
+_CSS_SAFE = re.compile(r"[#\w\s,.%()+-]*")
+
+
+def _tag_end(buffer, start):
+    """
+    Find the end of the markup starting at ``buffer[start]``, which is ``"<"``.
+
+    :return: The index just past the markup, or ``None`` if the buffer ends before the markup does.
+    """
+    for opener, closer in (("<!--", "-->"), ("<![CDATA[", "]]>"), ("<?", "?>")):
+        if buffer.startswith(opener, start):
+            end = buffer.find(closer, start + len(opener))
+            return None if end < 0 else end + len(closer)
+    match = _TAG.match(buffer, start)
+    return None if match is None else match.end()
+
+
+def _tokens(chunks):
+    """
+    Split a stream of UTF-8 chunks into markup and text.
+
+    Only one incomplete token is ever buffered, so memory use does not grow with the size of the document.
+
+    :return: Generates ``(is_markup, token)`` pairs.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        pos = 0
+        while True:
+            start = buffer.find("<", pos)
+            if start < 0:
+                break
+            if start > pos:
+                yield False, buffer[pos:start]
+                pos = start
+            end = _tag_end(buffer, start)
+            if end is None:
+                break
+            yield True, buffer[start:end]
+            pos = end
+        buffer = buffer[pos:]
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield False, buffer
+
+
+def _round(match, precision):
+    value = f"{round(float(match.group()), precision):.{precision}f}"
+    if "." in value:
+        value = value.rstrip("0").rstrip(".")
+    return "0" if value == "-0" else value
+
+
+def _round_numbers(value, precision):
+    return _NUMBER.sub(lambda m: _round(m, precision), value)
+
+
+def _round_transform(match, precision):
+    if match.group(1) not in ROUNDED_TRANSFORMS:
+        return match.group()
+    return f"{match.group(1)}({_round_numbers(match.group(2), precision)})"
+
+
+def _class_name(declarations, suffix=""):
+    """
+    Name the class of a tuple of ``(property, value)`` declarations by a hash of them.
+
+    Documents inlined in the same page share one style namespace,
+    so two documents only ever use the same class name for the same declarations.
+    """
+    data = repr((declarations, suffix)).encode("utf-8")
+    return "c" + hashlib.blake2s(data, digest_size=4).hexdigest()
+
+
+class _Optimizer:
+    """The state of a streaming SVG optimization: the classes created so far and the ``<svg>`` nesting depth."""
+
+    def __init__(self, precision, hoist, minify):
+        self.precision = precision
+        self.hoist = hoist
+        self.minify = minify
+        self.classes = {}
+        self.depth = 0
+
+    def style_element(self):
+        rules = []
+        for declarations, name in self.classes.items():
+            body = ";".join(f"{k}:{v}" for k, v in declarations)
+            rules.append(f".{name}{{{body}}}")
+        return "<style><![CDATA[" + "".join(rules) + "]]></style>"
+
+    def class_name(self, declarations):
+        name = self.classes.get(declarations)
+        if name is None:
+            name = _class_name(declarations)
+            # Hash collisions within the document are resolved by rehashing, which is deterministic.
+            names = set(self.classes.values())
+            suffix = 0
+            while name in names:
+                suffix += 1
+                name = _class_name(declarations, str(suffix))
+            self.classes[declarations] = name
+        return name
+
+    def round_value(self, key, value):
+        if key in COORDINATE_ATTRIBUTES:
+            return _round_numbers(value, self.precision)
+        if key == "transform":
+            return _TRANSFORM.sub(lambda m: _round_transform(m, self.precision), value)
+        return value
+
+    def start_tag(self, tag, name):
+        self_closing = tag.endswith("/>")
+        attributes = []
+        declarations = []
+        classes = None
+        class_index = None
+        for key, quoted in _ATTRIBUTE.findall(tag):
+            value = quoted[1:-1]
+            if self.precision is not None:
+                value = self.round_value(key, value)
+            if key == "class":
+                classes = value
+                class_index = len(attributes)
+            elif (
+                self.hoist
+                and key in HOISTED_ATTRIBUTES
+                and quoted[0] == '"'
+                and _CSS_SAFE.fullmatch(value)
+            ):
+                if key in LENGTH_ATTRIBUTES and _NUMBER_ONLY.fullmatch(value):
+                    value += "px"
+                declarations.append((key, value))
+            else:
+                attributes.append(
+                    f'{key}="{value}"' if quoted[0] == '"' else f"{key}='{value}'"
+                )
+        if declarations:
+            hoisted = self.class_name(tuple(declarations))
+            classes = f"{classes} {hoisted}" if classes else hoisted
+        if classes is not None:
+            if class_index is None:
+                class_index = len(attributes)
+            attributes.insert(class_index, f'class="{classes}"')
+        if name == "svg" and not self_closing:
+            self.depth += 1
+        return "<" + " ".join([name] + attributes) + ("/>" if self_closing else ">")
+
+    def end_tag(self, name):
+        if name != "svg":
+            return f"</{name}>"
+        self.depth -= 1
+        if self.depth == 0 and self.classes:
+            return self.style_element() + "</svg>"
+        return "</svg>"
+
+    def process(self, tokens):
+        for is_markup, token in tokens:
+            if not is_markup:
+                if not (self.minify and token.isspace()):
+                    yield token
+            elif token.startswith("<!--"):
+                if not self.minify:
+                    yield token
+            elif token.startswith(("<!", "<?")):
+                yield token
+            else:
+                name = _TAG_NAME.match(token).group(1)
+                if token.startswith("</"):
+                    yield self.end_tag(name)
+                else:
+                    yield self.start_tag(token, name)
+
+
+def _chunks(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = memoryview(data)
+        return (data[i : i + _CHUNK_SIZE] for i in range(0, len(data), _CHUNK_SIZE))
+    return data
+
+
+def _iter_optimize_svg(chunks, *, precision=2, hoist=True, minify=True, compress=False):
+    """
+    Optimize a stream of SVG chunks.
+
+    :return: Generates the chunks of the optimized SVG, or of the gzipped SVG if ``compress`` is ``True``.
+    """
+    optimizer = _Optimizer(precision, hoist, minify)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    batch = []
+    batch_size = 0
+    for piece in optimizer.process(_tokens(chunks)):
+        batch.append(piece)
+        batch_size += len(piece)
+        if batch_size >= _CHUNK_SIZE:
+            data = "".join(batch).encode("utf-8")
+            batch = []
+            batch_size = 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+    data = "".join(batch).encode("utf-8")
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def optimize_svg(
+    svg: Union[bytes, str, Iterable[bytes]],
+    *,
+    precision: Optional[int] = 2,
+    hoist: bool = True,
+    minify: bool = True,
+    compress: bool = False,
+) -> bytes:
+    """
+    Optimize `GraphViz`_ SVG output for size.
+
+    The SVG is processed as a stream of tags, without building a document tree,
+    so it is fast and memory-bounded even on very large files.
+
+    Repeated presentation attributes like ``fill``, ``stroke`` and ``font-family`` are hoisted into CSS classes,
+    declared in a ``<style>`` element at the end of the document. Elements keep any classes they already have.
+    Classes are named by a hash of their declarations, so optimized SVGs can be inlined in the same page.
+    Coordinates are rounded, except for the scale factors of transforms.
+
+    :param svg: The SVG, as bytes, a string, or an iterable of UTF-8 byte chunks.
+    :param precision: The number of decimal places to round coordinates to,
+                      or ``None`` to leave coordinates unchanged.
+    :param hoist: Whether to hoist presentation attributes into CSS classes.
+    :param minify: Whether to strip comments and the whitespace between tags.
+    :param compress: Whether to gzip the result, as in an ``.svgz`` file.
+    :return: The optimized SVG.
+    """
+    return b"".join(
+        _iter_optimize_svg(
+            _chunks(svg),
+            precision=precision,
+            hoist=hoist,
+            minify=minify,
+            compress=compress,
+        )
+    )
@@ -15,6 +15,7 @@
 #
 import heapq
 from collections import OrderedDict
+from functools import lru_cache
 
 import networkx as nx
 
@@ -104,17 +105,55 @@ def boundary(graph, subgraph):
     :param subgraph: A subgraph of the graph.
     :return: The nodes in the subgraph that have neighbors in the graph but not in the subgraph.
     """
-    if not all(graph.has_node(node) for node in subgraph.nodes()):
-        if all(subgraph.has_node(node) for node in graph.nodes()):
-            raise ValueError(
-                "The 'graph' argument is a proper subgraph of the 'subgraph' argument. This is likely "
-                "because the arguments to boundary were passed in the wrong order."
-            )
-        else:
-            raise ValueError("The subgraph contains nodes not in the graph.")
-    return {
-        node for node in subgraph.nodes() if subgraph.degree(node) < graph.degree(node)
-    }
+    return boundaries(graph, [subgraph])[0]
+
+
+def _subgraph_degrees(subgraph):
+    degrees = {node: 0 for node in subgraph.nodes()}
+    edges = subgraph.edges(keys=True) if is_multi_graph(subgraph) else subgraph.edges()
+    for edge in edges:
+        u, v = edge[:2]
+        degrees[u] += 1
+        degrees[v] += 1
+    return degrees
+
+
+def boundaries(graph, subgraphs):
+    """
+    Get the boundary of each of many subgraphs of the same graph.
+
+    This is equivalent to ``[nxv.boundary(graph, subgraph) for subgraph in subgraphs]``,
+    but each node's degree in the graph is computed at most once and the edges of each subgraph are counted
+    in a single pass, which is much faster when there are many subgraphs.
+    Parallel edges of a ``MultiGraph`` or ``MultiDiGraph`` are counted with their multiplicity.
+
+    :param graph: A graph.
+    :param subgraphs: An iterable of subgraphs of the graph.
+    :return: A list containing, for each subgraph, the nodes in the subgraph that have neighbors in the graph
+             but not in the subgraph.
+    """
+    graph_degrees = {}
+    result = []
+    for subgraph in subgraphs:
+        subgraph_degrees = _subgraph_degrees(subgraph)
+        if not all(graph.has_node(node) for node in subgraph_degrees):
+            if all(node in subgraph_degrees for node in graph.nodes()):
+                raise ValueError(
+                    "The 'graph' argument is a proper subgraph of the 'subgraph' argument. This is likely "
+                    "because the arguments to boundary were passed in the wrong order."
+                )
+            else:
+                raise ValueError("The subgraph contains nodes not in the graph.")
+        for node in subgraph_degrees.keys() - graph_degrees.keys():
+            graph_degrees[node] = graph.degree(node)
+        result.append(
+            {
+                node
+                for node, degree in subgraph_degrees.items()
+                if degree < graph_degrees[node]
+            }
+        )
+    return result
 
 
 # directed, multi, ordered
@@ -188,6 +227,9 @@ def to_ordered_graph(graph, node_key=None, edge_key=None, attr_key=None):
     """
     Create an ordered copy of the specified graph, with nodes and edges ordered by the specified key functions.
 
+    To get deterministic output from :func:`~nxv.render` without copying the graph,
+    use its ``node_order``, ``edge_order``, and ``sort_attributes`` parameters instead.
+
     :param graph: The graph to order.
     :param node_key: The node key function, ``node_key(u, d)``. Defaults to the identity function.
     :param edge_key: The edge key function, ``edge_key(u, v, d)``. If the graph has multi-edges, the signature should be
@@ -234,6 +276,11 @@ def _contrast_ratio(l1, l2):
     return (l1 + 0.05) / (l2 + 0.05)
 
 
+@lru_cache(maxsize=64)
+def _options_relative_luminance(options):
+    return tuple(_relative_luminance(option) for option in options)
+
+
 def contrasting_color(channels, *, options=None):
     """
     Get a color that most contrasts with a specified color.
@@ -244,9 +291,43 @@ def contrasting_color(channels, *, options=None):
     """
     if options is None:
         options = ((0, 0, 0), (1, 1, 1))
-    if not options:
+    if len(options) == 0:
         return (0, 0, 0)
     lum = _relative_luminance(channels)
-    return max(
-        options, key=lambda option: _contrast_ratio(lum, _relative_luminance(option))
-    )
+    options_lum = _options_relative_luminance(tuple(map(tuple, options)))
+    index = max(range(len(options)), key=lambda i: _contrast_ratio(lum, options_lum[i]))
+    return options[index]
+
+
+def _relative_luminances(channels):
+    import numpy as np
+
+    # NaN channels count as 0, as in the scalar luminance.
+    x = np.clip(np.nan_to_num(np.asarray(channels, dtype=float)[:, :3]), 0, 1)
+    x = np.where(x <= 0.03928, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+    return x @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrasting_colors(channels, *, options=None):
+    """
+    Get the colors that most contrast with each of an array of colors.
+
+    This is the bulk equivalent of :func:`~nxv.contrasting_color`, and requires `NumPy`_.
+
+    :param channels: An array-like of RGB or RGBA color channels, of shape ``(N, 3)`` or ``(N, 4)``.
+                     Values should be in the range [0, 1].
+    :param options: The possible contrasting colors. Defaults to black and white.
+    :return: A list containing, for each input color, the color option that most contrasts it.
+    """
+    import numpy as np
+
+    if options is None:
+        options = ((0, 0, 0), (1, 1, 1))
+    lum = _relative_luminances(channels)
+    if len(options) == 0:
+        return [(0, 0, 0)] * len(lum)
+    options_lum = _relative_luminances(options)
+    high = np.maximum.outer(lum, options_lum)
+    low = np.minimum.outer(lum, options_lum)
+    indices = np.argmax((high + 0.05) / (low + 0.05), axis=1)
+    return [options[i] for i in indices]
@@ -23,6 +23,15 @@ The idiomatic import for this subpackage is:
 
    import nxv.html_like as H
 
+Labels are immutable and cache their rendered markup.
+When many labels share the same structure, build a :func:`template` once
+with a :func:`placeholder` for each varying value:
+
+.. code-block:: python
+
+   row = H.template(H.table_row([H.table_cell("name"), H.table_cell(H.placeholder("name"))]))
+   label = row(name="Alice")
+
 """
 
 from nxv.html_like._html_like import (
@@ -34,12 +43,14 @@ from nxv.html_like._html_like import (
     join,
     line_break,
     overline,
+    placeholder,
     strikethrough,
     subscript,
     superscript,
     table,
     table_cell,
     table_row,
+    template,
     underline,
     vertical_rule,
 )
@@ -61,4 +72,6 @@ __all__ = [
     "table_cell",
     "vertical_rule",
     "image",
+    "placeholder",
+    "template",
 ]
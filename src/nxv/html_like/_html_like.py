@@ -31,19 +31,54 @@ def render_html_like(value):
 
 
 class HtmlLike:
+    __slots__ = ("_name", "_children", "_attributes", "_str")
+
     def __init__(self, name, children=None, attributes=None):
-        self.name = name
-        self.children = None if children is None else tuple(children)
-        self.attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+        _set = super().__setattr__
+        _set("_name", name)
+        _set("_children", None if children is None else tuple(children))
+        _set(
+            "_attributes",
+            tuple((k, v) for k, v in (attributes or {}).items() if v is not None),
+        )
+        _set("_str", None)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def attributes(self):
+        return dict(self._attributes)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+        # Pickling and copying rebuild the value, since its attributes cannot be set.
+        return HtmlLike, (self._name, self._children, self.attributes)
 
     def __str__(self):
+        # The rendered string is cached, since the same label is often rendered many times.
+        if self._str is None:
+            super().__setattr__("_str", self._render())
+        return self._str
+
+    def _render(self):
         children = (
             None
             if self.children is None
             else "".join(render_html_like(child) for child in self.children)
         )
         attrs = "".join(
-            f' {k}="{render_html_like_str(v)}"' for k, v in self.attributes.items()
+            f' {k}="{render_html_like_str(v)}"' for k, v in self._attributes
         )
         if self.name is None:
             assert not attrs
@@ -56,6 +91,126 @@ class HtmlLike:
         return f"HtmlLike({self.name!r}, children={self.children!r}, attributes={self.attributes!r})"
 
 
+class _Markup(HtmlLike):
+    __slots__ = ()
+
+    def __init__(self, markup):
+        super().__init__(None)
+        super(HtmlLike, self).__setattr__("_str", markup)
+
+    def __reduce__(self):
+        return _Markup, (self._str,)
+
+    def __repr__(self):
+        return f"_Markup({self._str!r})"
+
+
+class Placeholder:
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        super().__setattr__("_name", name)
+
+    @property
+    def name(self):
+        return self._name
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+        return Placeholder, (self._name,)
+
+    def __str__(self):
+        raise TypeError(
+            f"The placeholder {self.name!r} can only be rendered by a template."
+        )
+
+    def __repr__(self):
+        return f"Placeholder({self.name!r})"
+
+
+def _compile(value):
+    """
+    Generates the fragments of the rendered form of a value.
+
+    Each fragment is either a string of static markup,
+    or a :class:`Placeholder` paired with the function used to escape its value.
+    """
+    if isinstance(value, Placeholder):
+        yield value, render_html_like
+        return
+    if not isinstance(value, HtmlLike):
+        yield render_html_like_str(value)
+        return
+    if value._str is not None:
+        yield value._str
+        return
+    if value.name is None:
+        assert not value._attributes
+        for child in value.children or ():
+            yield from _compile(child)
+        return
+    yield f"<{value.name}"
+    for k, v in value._attributes:
+        yield f' {k}="'
+        if isinstance(v, Placeholder):
+            yield v, render_html_like_str
+        else:
+            yield render_html_like_str(v)
+        yield '"'
+    if value.children is None:
+        yield "/>"
+        return
+    yield ">"
+    for child in value.children:
+        yield from _compile(child)
+    yield f"</{value.name}>"
+
+
+class Template:
+    """
+    An HTML-like label with placeholders, precompiled into static markup.
+
+    Calling the template with a value for each placeholder renders a label
+    by escaping the values and joining them with the static markup.
+    """
+
+    __slots__ = ("_parts", "_names")
+
+    def __init__(self, content):
+        parts = []
+        for fragment in _compile(content):
+            if isinstance(fragment, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += fragment
+            else:
+                parts.append(fragment)
+        self._parts = tuple(
+            part if isinstance(part, str) else (part[0].name, part[1]) for part in parts
+        )
+        self._names = frozenset(
+            part[0] for part in self._parts if not isinstance(part, str)
+        )
+
+    @property
+    def names(self):
+        return self._names
+
+    def __call__(self, **values):
+        missing = self._names - values.keys()
+        if missing:
+            raise TypeError(f"Missing values for placeholders: {sorted(missing)}")
+        return _Markup(
+            "".join(
+                part if isinstance(part, str) else part[1](values[part[0]])
+                for part in self._parts
+            )
+        )
+
+    def __repr__(self):
+        return f"Template(names={sorted(self._names)!r})"
+
+
 def join(children):
     return HtmlLike(None, children=children)
 
@@ -118,3 +273,11 @@ def vertical_rule():
 
 def image(attributes=None):
     return HtmlLike("IMG", attributes=attributes)
+
+
+def placeholder(name):
+    return Placeholder(name)
+
+
+def template(content):
+    return Template(content)
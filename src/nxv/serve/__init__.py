@@ -0,0 +1,36 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+The ``nxv.serve`` subpackage provides a local HTTP rendering service,
+for programs that are not written in Python.
+
+It uses only the standard library. To serve on port 8000 with a style from a module:
+
+.. code-block:: bash
+
+   python -m nxv.serve --port 8000 --style mymodule:style
+
+and to render a graph:
+
+.. code-block:: bash
+
+   curl --data @graph.json 'http://127.0.0.1:8000/render?format=svg&algorithm=dot'
+
+"""
+
+from nxv.serve._server import RenderServer, serve
+
+__all__ = ["RenderServer", "serve"]
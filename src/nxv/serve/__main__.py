@@ -0,0 +1,62 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""The ``python -m nxv.serve`` command."""
+import argparse
+
+from nxv._cli import _load_style
+from nxv.serve._server import serve
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m nxv.serve",
+        description="Serve GraphViz renders of node-link JSON graphs over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="The host to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="The port to listen on.")
+    parser.add_argument(
+        "-s",
+        "--style",
+        help="A style to import, as module.path:attribute. "
+        "The attribute may be a Style or a function returning one, and defaults to style.",
+    )
+    parser.add_argument("--graphviz-bin", help="The GraphViz bin directory.")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="The maximum number of graphs to render at once. Defaults to one per CPU.",
+    )
+    parser.add_argument(
+        "--cache-bytes",
+        type=int,
+        default=64 * 1024 * 1024,
+        help="The maximum total size of the cached outputs.",
+    )
+    args = parser.parse_args(argv)
+    style, _ = _load_style(args.style)
+    serve(
+        style,
+        host=args.host,
+        port=args.port,
+        graphviz_bin=args.graphviz_bin,
+        workers=args.workers,
+        cache_bytes=args.cache_bytes,
+    )
+
+
+if __name__ == "__main__":
+    main()
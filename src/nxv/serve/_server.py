@@ -0,0 +1,422 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""A stdlib-only asyncio HTTP server that renders graphs for other processes."""
+import asyncio
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+CONTENT_TYPES = {
+    "dot": "text/vnd.graphviz",
+    "gif": "image/gif",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "plain": "text/plain",
+    "png": "image/png",
+    "raw": "text/vnd.graphviz",
+    "svg": "image/svg+xml",
+    "svgz": "image/svg+xml",
+}
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+# The layout algorithms that clients may request, since the algorithm names the program that is run.
+ALGORITHMS = ("dot", "neato", "fdp", "sfdp", "twopi", "circo", "osage", "patchwork")
+# The number of recent request latencies kept for the percentiles of the metrics.
+LATENCY_WINDOW = 1024
+
+
+class _HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _FairQueue:
+    """
+    A queue of jobs that takes turns between clients.
+
+    Each client has its own first-in first-out queue, and :meth:`get` takes the next job of each waiting client
+    in turn, so a client that submits many or large graphs only delays other clients by one job at a time.
+    """
+
+    def __init__(self):
+        self._queues = collections.OrderedDict()
+        self._size = 0
+        self._ready = asyncio.Event()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def clients(self) -> int:
+        """The number of clients with waiting jobs."""
+        return len(self._queues)
+
+    def put(self, client, job):
+        self._queues.setdefault(client, collections.deque()).append(job)
+        self._size += 1
+        self._ready.set()
+
+    async def get(self):
+        while not self._queues:
+            self._ready.clear()
+            await self._ready.wait()
+        client, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        del self._queues[client]
+        if queue:
+            # The client goes to the back of the line.
+            self._queues[client] = queue
+        self._size -= 1
+        return job
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+class RenderServer:
+    """
+    An HTTP server that renders `NetworkX`_ node-link JSON with `GraphViz`_.
+
+    ``POST /render`` takes a graph as node-link JSON, as written by ``networkx.node_link_data``,
+    and responds with the render output. The ``format`` and ``algorithm`` query parameters
+    default to ``svg`` and ``dot``, and the algorithm must be a `GraphViz`_ layout engine like ``neato``.
+    Requests are identified by the ``X-Client-Id`` header, or by the client address.
+
+    ``GET /metrics`` responds with the metrics of the server as JSON: the ``queue_depth``, the number of
+    ``waiting_clients`` and of renders ``in_flight``, counters of ``requests``, ``errors``, ``cache_hits``,
+    ``deduplicated`` requests and ``renders``, the size of the cache, ``latency`` statistics in seconds
+    over the last requests, and the metrics of the :class:`~nxv.Renderer` of each algorithm and format.
+
+    At most ``workers`` graphs are rendered at once. Waiting requests are queued per client and served in turn,
+    so a client with a huge graph or many graphs does not starve the others.
+    Identical requests that arrive while one is being rendered share its render,
+    and outputs are kept in a least recently used cache, so repeated requests are not rendered again.
+
+    Only the standard library is used, so the server runs wherever nxv does.
+
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param graphviz_bin: The ``bin`` directory of the `GraphViz`_ installation, as in :func:`~nxv.render`.
+    :param workers: The maximum number of graphs to render at once. Defaults to the number of CPUs.
+    :param cache_bytes: The maximum total size of the cached outputs, in bytes.
+    :param max_request_bytes: The maximum size of a request body, in bytes.
+    """
+
+    def __init__(
+        self,
+        style=None,
+        *,
+        graphviz_bin: Optional[str] = None,
+        workers: Optional[int] = None,
+        cache_bytes: int = 64 * 1024 * 1024,
+        max_request_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.style = style
+        self.graphviz_bin = graphviz_bin
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_bytes = cache_bytes
+        self.max_request_bytes = max_request_bytes
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._renderers = {}
+        self._renderers_lock = threading.Lock()
+        self._cache = collections.OrderedDict()
+        self._cache_size = 0
+        self._in_flight = {}
+        self._queue = None
+        self._tasks = []
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._counters = collections.Counter(
+            requests=0, errors=0, cache_hits=0, deduplicated=0, renders=0
+        )
+
+    def _renderer(self, algorithm, format):
+        from nxv import Renderer
+
+        key = (algorithm, format)
+        with self._renderers_lock:
+            renderer = self._renderers.get(key)
+            if renderer is None:
+                renderer = self._renderers[key] = Renderer(
+                    self.style,
+                    algorithm=algorithm,
+                    format=format,
+                    graphviz_bin=self.graphviz_bin,
+                    max_workers=self.workers,
+                )
+        return renderer
+
+    def _render(self, body, algorithm, format):
+        """Parse and render a graph. This runs in a thread of the server's executor."""
+        import networkx as nx
+
+        from nxv import (
+            GraphVizAlgorithmNotFoundError,
+            GraphVizError,
+            GraphVizFormatNotFoundError,
+        )
+
+        try:
+            graph = nx.node_link_graph(json.loads(body.decode("utf-8")))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise _HttpError(400, f"Invalid node-link JSON: {e}")
+        try:
+            output = self._renderer(algorithm, format).render(graph)
+        except (
+            GraphVizAlgorithmNotFoundError,
+            GraphVizError,
+            GraphVizFormatNotFoundError,
+        ) as e:
+            raise _HttpError(400, str(e))
+        return output.encode("utf-8") if isinstance(output, str) else output
+
+    def _cache_put(self, key, output):
+        if len(output) > self.cache_bytes:
+            return
+        self._cache[key] = output
+        self._cache_size += len(output)
+        while self._cache_size > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted)
+
+    async def _work(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            key, body, algorithm, format, future = await self._queue.get()
+            try:
+                output = await loop.run_in_executor(
+                    self._executor, self._render, body, algorithm, format
+                )
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                self._counters["renders"] += 1
+                self._cache_put(key, output)
+                future.set_result(output)
+            finally:
+                del self._in_flight[key]
+                if not future.done():
+                    future.cancel()
+                elif not future.cancelled():
+                    # Waiters may all have gone, so the exception is marked as retrieved.
+                    future.exception()
+
+    async def _output(self, client, algorithm, format, body):
+        key = hashlib.sha256(
+            json.dumps([algorithm, format]).encode("utf-8") + b"\0" + body
+        ).hexdigest()
+        output = self._cache.get(key)
+        if output is not None:
+            self._cache.move_to_end(key)
+            self._counters["cache_hits"] += 1
+            return output
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._counters["deduplicated"] += 1
+        else:
+            future = self._in_flight[key] = asyncio.get_event_loop().create_future()
+            self._queue.put(client, (key, body, algorithm, format, future))
+        # Shielded, so a client that disconnects does not cancel the render shared with other clients.
+        return await asyncio.shield(future)
+
+    def metrics(self) -> dict:
+        """
+        Get the metrics of the server, as served by ``GET /metrics``.
+
+        :return: A dict of plain values.
+        """
+        latencies = sorted(self._latencies)
+        latency = {"count": len(latencies)}
+        if latencies:
+            latency.update(
+                mean=sum(latencies) / len(latencies),
+                p50=_percentile(latencies, 0.5),
+                p95=_percentile(latencies, 0.95),
+                p99=_percentile(latencies, 0.99),
+                max=latencies[-1],
+            )
+        with self._renderers_lock:
+            renderers = {
+                f"{algorithm}/{format}": renderer.metrics()
+                for (algorithm, format), renderer in self._renderers.items()
+            }
+        return {
+            "queue_depth": len(self._queue) if self._queue is not None else 0,
+            "waiting_clients": self._queue.clients if self._queue is not None else 0,
+            "in_flight": len(self._in_flight),
+            **self._counters,
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cache_size,
+            "latency": latency,
+            "renderers": renderers,
+        }
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise _HttpError(400, "Invalid request line.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HttpError(400, "Invalid Content-Length.")
+        if length < 0:
+            raise _HttpError(400, "Invalid Content-Length.")
+        if length > self.max_request_bytes:
+            raise _HttpError(
+                413, f"Request bodies are limited to {self.max_request_bytes} bytes."
+            )
+        body = await reader.readexactly(length)
+        return method, urlsplit(target), headers, body
+
+    async def _respond(self, method, url, headers, body, peer):
+        if url.path == "/metrics":
+            if method != "GET":
+                raise _HttpError(405, "Use GET for /metrics.")
+            return "application/json", json.dumps(self.metrics()).encode("utf-8")
+        if url.path != "/render":
+            raise _HttpError(404, f"No such path: {url.path}")
+        if method != "POST":
+            raise _HttpError(405, "Use POST for /render.")
+        query = parse_qs(url.query)
+        format = query.get("format", ["svg"])[0]
+        algorithm = query.get("algorithm", ["dot"])[0]
+        if format.startswith("ipython/"):
+            raise _HttpError(400, "IPython formats cannot be served.")
+        if algorithm not in ALGORITHMS:
+            raise _HttpError(
+                400,
+                f"Unknown algorithm {algorithm!r}. Valid algorithms are {', '.join(ALGORITHMS)}.",
+            )
+        client = headers.get("x-client-id") or (peer[0] if peer else None)
+        output = await self._output(client, algorithm, format, body)
+        content_type = CONTENT_TYPES.get(
+            format.split(":", 1)[0], "application/octet-stream"
+        )
+        return content_type, output
+
+    async def handle(self, reader, writer):
+        """Handle one HTTP connection. This is the callback passed to ``asyncio.start_server``."""
+        start = time.perf_counter()
+        status, content_type, payload = 200, None, b""
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            self._counters["requests"] += 1
+            method, url, headers, body = request
+            content_type, payload = await self._respond(
+                method, url, headers, body, writer.get_extra_info("peername")
+            )
+        except _HttpError as e:
+            status, payload = e.status, str(e).encode("utf-8")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        except Exception as e:
+            status, payload = 500, f"{type(e).__name__}: {e}".encode("utf-8")
+        finally:
+            if status != 200:
+                self._counters["errors"] += 1
+                content_type = "text/plain; charset=utf-8"
+            if content_type is not None:
+                self._latencies.append(time.perf_counter() - start)
+                head = (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: close\r\n\r\n"
+                )
+                try:
+                    writer.write(head.encode("latin-1") + payload)
+                    await writer.drain()
+                except ConnectionError:
+                    pass
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000):
+        """
+        Start serving, and start the render workers.
+
+        :param host: The host to listen on.
+        :param port: The port to listen on, or 0 for any free port.
+        :return: The ``asyncio.Server``, whose ``sockets`` give the address it listens on.
+        """
+        self._queue = _FairQueue()
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def close(self):
+        """Stop the render workers, and wait for the running renders to finish."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        await asyncio.get_event_loop().run_in_executor(None, self._executor.shutdown)
+        for renderer in self._renderers.values():
+            renderer.close()
+
+
+def serve(style=None, *, host: str = "127.0.0.1", port: int = 8000, **kwargs):
+    """
+    Run a :class:`RenderServer` until interrupted.
+
+    :param style: A style specifying how graph nodes and edges should map to `GraphViz attributes`_.
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param kwargs: Other parameters of :class:`RenderServer`.
+    """
+    loop = asyncio.new_event_loop()
+    server = RenderServer(style, **kwargs)
+    listener = loop.run_until_complete(server.start(host, port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        loop.run_until_complete(server.close())
+        loop.close()
@@ -14,7 +14,8 @@
 # limitations under the License.
 #
 """A collection of built-in styles."""
+from nxv.styles._colormap import colormap
 from nxv.styles._font import font
 from nxv.styles._verbose import verbose
 
-__all__ = ["font", "verbose"]
+__all__ = ["colormap", "font", "verbose"]
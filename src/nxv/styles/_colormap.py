@@ -0,0 +1,108 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import math
+import numbers
+from typing import Optional, Sequence
+
+from nxv._rendering import color
+from nxv._style import Style
+from nxv._util import contrasting_color
+
+
+def _color_attrs(channels, attribute):
+    attrs = {
+        attribute: color(channels),
+        "fontcolor": color(contrasting_color(channels)),
+    }
+    if attribute == "fillcolor":
+        attrs["style"] = "filled"
+    return attrs
+
+
+def _interpolate(palette, levels):
+    if levels in (1, len(palette)) or len(palette) == 1:
+        return [palette[i * len(palette) // levels] for i in range(levels)]
+    result = []
+    for i in range(levels):
+        x = i * (len(palette) - 1) / (levels - 1)
+        j = min(int(x), len(palette) - 2)
+        t = x - j
+        result.append(
+            tuple(a + t * (b - a) for a, b in zip(palette[j], palette[j + 1]))
+        )
+    return result
+
+
+def colormap(
+    attr: str,
+    palette: Sequence[Sequence[float]],
+    *,
+    vmin: float = 0.0,
+    vmax: float = 1.0,
+    levels: Optional[int] = None,
+    attribute: str = "fillcolor",
+    missing: Optional[Sequence[float]] = (0.5, 0.5, 0.5),
+) -> Style:
+    """
+    Colors nodes by a numeric node attribute using a palette.
+
+    The palette is quantized into a lookup table once, including a contrasting ``fontcolor`` for each level,
+    so styling each node is a single index into the table.
+    Nodes without the attribute are not styled, and nodes whose attribute is NaN are given the ``missing`` color.
+
+    :param attr: The name of the numeric node attribute.
+    :param palette: A sequence of RGB or RGBA colors, with channel values in the range [0, 1].
+    :param vmin: The attribute value mapped to the first palette color. Smaller values are clamped.
+    :param vmax: The attribute value mapped to the last palette color. Larger values are clamped.
+    :param levels: The number of levels in the lookup table. If this is larger than the palette,
+                   the palette colors are linearly interpolated. Defaults to the size of the palette.
+    :param attribute: The `GraphViz node attribute <https://graphviz.org/doc/info/attrs.html>`_ to set.
+                      When this is ``"fillcolor"``, nodes are also given ``style="filled"``.
+    :param missing: The RGB or RGBA color of nodes whose attribute is NaN, or ``None`` to not style them.
+    :return: A :class:`~nxv.Style` object that applies this colormap.
+             Styling a node raises :class:`TypeError` if its attribute is not a real number.
+    """
+    if len(palette) == 0:
+        raise ValueError("The palette must contain at least one color.")
+    if levels is None:
+        levels = len(palette)
+    if levels < 1:
+        raise ValueError("The number of levels must be positive.")
+    if not vmin < vmax:
+        raise ValueError("The vmin parameter must be less than the vmax parameter.")
+
+    table = [
+        _color_attrs(channels, attribute) for channels in _interpolate(palette, levels)
+    ]
+    missing_attrs = {} if missing is None else _color_attrs(missing, attribute)
+    scale = levels / (vmax - vmin)
+
+    # The attribute dicts are copied, since callers may modify them.
+    def node(u, d):
+        value = d.get(attr)
+        if value is None:
+            return {}
+        if not isinstance(value, numbers.Real):
+            raise TypeError(
+                f"The {attr!r} attribute of node {u!r} must be a real number, not {value!r}."
+            )
+        if math.isnan(value):
+            return dict(missing_attrs)
+        # Values are clamped before scaling, so infinite values get the first or last color.
+        value = min(max(value, vmin), vmax)
+        return dict(table[min(levels - 1, int((value - vmin) * scale))])
+
+    return Style(node=node)
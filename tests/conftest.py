@@ -0,0 +1,106 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Fixtures for faking GraphViz installations."""
+import os
+import sys
+
+import pytest
+
+from nxv import _graphviz
+
+PROBE_OUTPUTS = {
+    "-V": "dot - graphviz version 2.43.0 (0)\n",
+    "-K?": 'Layout type: "?" not recognized. Use one of: circo dot fdp neato sfdp\n',
+    "-T?": 'Format: "?" not recognized. Use one of: dot plain png svg svgz\n',
+}
+
+
+def clear_graphviz_caches():
+    for func in [
+        _graphviz.try_get_graphviz_algorithm_path,
+        _graphviz.get_graphviz_bins,
+        _graphviz.get_graphviz_algorithm_path,
+        _graphviz.load_graphviz_installation,
+        _graphviz.get_graphviz_installation,
+    ]:
+        func.cache_clear()
+
+
+@pytest.fixture
+def fake_installation(tmp_path, monkeypatch):
+    bin = tmp_path / "bin"
+    bin.mkdir()
+    for name in ["dot", "neato", "sfdp"]:
+        (bin / name).write_text("")
+    monkeypatch.setenv("NXV_CACHE_DIR", str(tmp_path / "cache"))
+    probes = []
+
+    def probe_output(args):
+        probes.append(args)
+        return PROBE_OUTPUTS[args[-1]]
+
+    monkeypatch.setattr(_graphviz, "_probe_output", probe_output)
+    clear_graphviz_caches()
+    yield str(bin), probes
+    clear_graphviz_caches()
+
+
+ECHO_SCRIPT = """#!{python}
+import re
+import sys
+import time
+
+data = sys.stdin.buffer.read()
+output = [arg[2:] for arg in sys.argv if arg.startswith("-o")]
+if b"sleep" in data:
+    time.sleep(60)
+if b"error" in data:
+    # Write some output before failing, as GraphViz can.
+    if output:
+        with open(output[0], "wb") as f:
+            f.write(data[:10])
+    else:
+        sys.stdout.buffer.write(data[:10])
+    sys.stderr.write("Error: syntax error in line 2\\n")
+    sys.exit(1)
+if "-Tplain" in sys.argv:
+    ids = re.findall(rb"^\\s*(node\\d+) \\[", data, re.MULTILINE)
+    lines = [b"graph 1 10 20"]
+    lines.extend(b"node %s %d %d 1 1" % (id, i, i) for i, id in enumerate(ids))
+    data = b"\\n".join(lines + [b"stop"])
+if output:
+    with open(output[0], "wb") as f:
+        f.write(data)
+else:
+    sys.stdout.buffer.write(data)
+"""
+
+
+@pytest.fixture
+def echo_installation(fake_installation):
+    """
+    A fake installation whose algorithms echo their input, fail if the input contains ``error``,
+    and sleep for a minute if the input contains ``sleep``.
+
+    The ``plain`` format instead places the i-th node at ``(i, i)`` inches.
+    """
+    bin, _ = fake_installation
+    for name in ["dot", "neato", "sfdp"]:
+        path = os.path.join(bin, name)
+        with open(path, "w") as f:
+            f.write(ECHO_SCRIPT.format(python=sys.executable))
+        os.chmod(path, 0o755)
+    return bin
@@ -0,0 +1,98 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import textwrap
+
+import networkx as nx
+import pytest
+
+import nxv
+
+
+def test_render_frame():
+    pd = pytest.importorskip("pandas")
+
+    nodes = pd.DataFrame(
+        {
+            "color": ["red", None, "blue"],
+            "width": [1.5, float("nan"), 2.0],
+            "fillcolor": [(1, 0, 0), None, (0, 0, 1)],
+        },
+        index=["a", "b", "c"],
+    )
+    edges = pd.DataFrame(
+        {
+            "source": ["a", "b", "d"],
+            "target": ["b", "c", "a"],
+            "label": ['x"y', "z", None],
+        }
+    )
+    actual = nxv.render_frame(nodes, edges, graph_attrs={"rankdir": "LR"}, format="raw")
+    expected = textwrap.dedent(
+        r"""
+        digraph "G" {
+            graph [rankdir="LR"];
+            node0000 [label="a", color="red", width="1.5", fillcolor="#FF0000"];
+            node0001 [label="b"];
+            node0002 [label="c", color="blue", width="2.0", fillcolor="#0000FF"];
+            node0003 [label="d"];
+            node0000 -> node0001 [label="x\"y"];
+            node0001 -> node0002 [label="z"];
+            node0003 -> node0000 [];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_render_frame_matches_render():
+    pd = pytest.importorskip("pandas")
+
+    graph = nx.Graph()
+    graph.add_node(0, shape="box", label="zero")
+    graph.add_node(1, shape="circle")
+    graph.add_edge(0, 1, color="red")
+    graph.add_edge(1, 2, color="blue")
+    style = nxv.Style(node=lambda u, d: d, edge=lambda u, v, d: d)
+
+    nodes = pd.DataFrame.from_dict(dict(graph.nodes(data=True)), orient="index")
+    edges = nx.to_pandas_edgelist(graph)
+    actual = nxv.render_frame(nodes, edges, directed=False, format="raw")
+    assert actual == nxv.render(graph, style, format="raw")
+
+
+def test_render_sparse():
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    sparse = pytest.importorskip("scipy.sparse")
+
+    adjacency = sparse.csr_matrix(np.array([[0, 1, 0], [1, 0, 2], [0, 2, 0]]))
+    nodes = pd.DataFrame({"shape": ["box"]}, index=[1])
+    actual = nxv.render_sparse(
+        adjacency, nodes, weight="penwidth", directed=False, format="raw"
+    )
+    expected = textwrap.dedent(
+        """
+        graph "G" {
+            graph [];
+            node0000 [label="0"];
+            node0001 [label="1", shape="box"];
+            node0002 [label="2"];
+            node0000 -- node0001 [penwidth="1"];
+            node0001 -- node0002 [penwidth="2"];
+        }
+        """
+    ).strip()
+    assert actual == expected
@@ -0,0 +1,151 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+import nxv
+
+
+def test_render_background(echo_installation):
+    # The fake GraphViz echoes its input, so each stage of the render passes the GraphViz string through.
+    graph = nx.path_graph(3)
+    background_render = nxv.render_background(
+        graph, format="svg", graphviz_bin=echo_installation
+    )
+    assert background_render.handle is None
+    expected = nxv.render(graph, format="raw").encode("utf-8")
+    assert background_render.result(timeout=30) == expected
+    assert background_render.output_format == "svg"
+    assert not background_render.cancel()
+
+
+def test_render_background_png_fallback(echo_installation):
+    graph = nx.path_graph(3)
+    background_render = nxv.render_background(
+        graph, format="svg", graphviz_bin=echo_installation, png_threshold=10
+    )
+    background_render.result(timeout=30)
+    assert background_render.output_format == "png"
+
+
+def test_render_background_cancel(echo_installation):
+    graph = nx.Graph()
+    graph.add_node("sleep")
+    background_render = nxv.render_background(
+        graph, format="svg", graphviz_bin=echo_installation
+    )
+    assert background_render.cancel()
+    with pytest.raises(CancelledError):
+        background_render.result(timeout=30)
+    assert background_render.cancelled()
+
+
+def test_render_background_missing_algorithm(echo_installation):
+    with pytest.raises(nxv.GraphVizAlgorithmNotFoundError):
+        nxv.render_background(
+            nx.path_graph(3),
+            algorithm="circo",
+            format="svg",
+            graphviz_bin=echo_installation,
+        )
+
+
+def test_render_background_ipython(echo_installation):
+    graph = nx.path_graph(3)
+    with patch("nxv._ipython.is_execution_context", return_value=True), patch(
+        "nxv._ipython.display_placeholder"
+    ) as display_placeholder, patch("nxv._ipython.update_display") as update_display:
+        background_render = nxv.render_background(
+            graph, format="ipython/svg", graphviz_bin=echo_installation
+        )
+        output = background_render.result(timeout=30)
+    display_placeholder.assert_called_once_with("Rendering...")
+    update_display.assert_called_once_with(
+        display_placeholder.return_value, output, "ipython/svg"
+    )
+
+
+def test_render_progressive(echo_installation):
+    graph = nx.path_graph(3)
+    stages = list(
+        nxv.render_progressive(graph, format="svg", graphviz_bin=echo_installation)
+    )
+    assert [stage for stage, _ in stages] == ["coarse", "full"]
+    coarse = stages[0][1].decode("utf-8")
+    assert 'splines="false"' in coarse
+    assert 'shape="point"' in coarse
+    assert 'quadtree="fast"' in coarse
+    assert "maxiter" not in coarse
+    assert 'label="0"' not in coarse
+    assert stages[1][1] == nxv.render(graph, format="raw").encode("utf-8")
+
+
+def test_render_progressive_callback(echo_installation):
+    graph = nx.path_graph(3)
+    stages = []
+    background_render = nxv.render_progressive(
+        graph,
+        format="svg",
+        graphviz_bin=echo_installation,
+        callback=lambda stage, output: stages.append(stage),
+    )
+    output = background_render.result(timeout=30)
+    assert stages == ["coarse", "full"]
+    assert output == nxv.render(graph, format="raw").encode("utf-8")
+
+
+def test_render_progressive_cancel(echo_installation):
+    graph = nx.Graph()
+    graph.add_node("sleep")
+    stages = []
+    background_render = nxv.render_progressive(
+        graph,
+        format="svg",
+        graphviz_bin=echo_installation,
+        callback=lambda stage, output: stages.append(stage),
+    )
+    assert background_render.cancel()
+    with pytest.raises(CancelledError):
+        background_render.result(timeout=30)
+    assert stages == []
+
+
+def test_render_progressive_callback_ipython(echo_installation):
+    graph = nx.path_graph(3)
+    threads = []
+
+    def display_placeholder(text):
+        threads.append(threading.current_thread())
+        return "handle"
+
+    with patch("nxv._ipython.is_execution_context", return_value=True), patch(
+        "nxv._ipython.display_placeholder", side_effect=display_placeholder
+    ), patch("nxv._ipython.update_display") as update_display:
+        background_render = nxv.render_progressive(
+            graph,
+            format="ipython/svg",
+            graphviz_bin=echo_installation,
+            callback=lambda stage, output: None,
+        )
+        output = background_render.result(timeout=30)
+    assert threads == [threading.main_thread()]
+    assert background_render.handle == "handle"
+    assert background_render.output_format == "svg"
+    update_display.assert_called_with("handle", output, "ipython/svg")
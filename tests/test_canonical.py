@@ -0,0 +1,97 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import textwrap
+
+import networkx as nx
+
+import nxv
+
+
+def _style():
+    return nxv.Style(
+        node=lambda u, d: {"shape": d.get("shape", "ellipse")},
+        edge=lambda u, v, d: {"label": d.get("label")},
+    )
+
+
+def _graph(reverse=False):
+    nodes = [("a", {"shape": "box"}), ("b", {}), ("c", {})]
+    edges = [("a", "b", {"label": "x"}), ("b", "c", {}), ("c", "a", {"label": "y"})]
+    if reverse:
+        nodes, edges = nodes[::-1], edges[::-1]
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
+
+
+def test_canonical_gv():
+    actual = nxv.canonical_gv(_graph(), _style())
+    expected = textwrap.dedent(
+        """
+        digraph "G" {
+            graph [];
+            node0000 [label="a", shape="box"];
+            node0001 [label="b", shape="ellipse"];
+            node0002 [label="c", shape="ellipse"];
+            node0000 -> node0001 [label="x"];
+            node0001 -> node0002 [label=""];
+            node0002 -> node0000 [label="y"];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_canonical_gv_insertion_order():
+    assert nxv.canonical_gv(_graph(), _style()) == nxv.canonical_gv(
+        _graph(reverse=True), _style()
+    )
+
+
+def test_canonical_gv_subgraphs():
+    graph = nx.Graph()
+    graph.add_edges_from([(2, 1), (1, 0)])
+    actual = nxv.canonical_gv(graph, subgraph_func=lambda u, d: u % 2)
+    expected = textwrap.dedent(
+        """
+        graph "G" {
+            graph [];
+            subgraph "0" {
+                graph [];
+                node0000 [label="0"];
+                node0002 [label="2"];
+            }
+            subgraph "1" {
+                graph [];
+                node0001 [label="1"];
+            }
+            node0000 -- node0001 [];
+            node0001 -- node0002 [];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_fingerprint():
+    assert nxv.fingerprint(_graph(), _style()) == nxv.fingerprint(
+        _graph(reverse=True), _style()
+    )
+    assert nxv.fingerprint(_graph(), _style()) != nxv.fingerprint(_graph())
+    graph = _graph()
+    graph.edges["a", "b"]["label"] = "z"
+    assert nxv.fingerprint(_graph(), _style()) != nxv.fingerprint(graph, _style())
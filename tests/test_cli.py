@@ -0,0 +1,125 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import os
+import sys
+import textwrap
+
+import networkx as nx
+import pytest
+
+from nxv._cli import main
+
+
+def _write_graph(path, edges):
+    graph = nx.DiGraph()
+    graph.add_edges_from(edges)
+    with open(path, "w") as f:
+        json.dump(nx.node_link_data(graph), f)
+
+
+@pytest.fixture
+def style_module(tmp_path, monkeypatch):
+    (tmp_path / "cli_style.py").write_text(
+        textwrap.dedent(
+            """
+            import nxv
+
+            def style():
+                return nxv.Style(node={"shape": "box"})
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "cli_style:style"
+    sys.modules.pop("cli_style", None)
+
+
+def test_cli_single_file(tmp_path, style_module):
+    _write_graph(tmp_path / "g.json", [("a", "b")])
+    output = tmp_path / "out.gv"
+    code = main(
+        [str(tmp_path / "g.json"), "-o", str(output), "-f", "raw", "-s", style_module]
+    )
+    assert code == 0
+    assert 'node0000 [label="a", shape="box"];' in output.read_text()
+
+
+def test_cli_directory_parallel(tmp_path):
+    inputs = tmp_path / "in"
+    (inputs / "nested").mkdir(parents=True)
+    _write_graph(inputs / "a.json", [(1, 2)])
+    _write_graph(inputs / "nested" / "b.json", [(3, 4)])
+    (inputs / "b.edgelist").write_text("x y\ny z\n")
+    (inputs / "ignored.svg").write_text("")
+    code = main([str(inputs), "-o", str(tmp_path / "out"), "-f", "raw", "-j", "2"])
+    assert code == 0
+    assert sorted(
+        os.path.relpath(os.path.join(root, name), tmp_path / "out")
+        for root, _, names in os.walk(tmp_path / "out")
+        for name in names
+    ) == ["a.gv", "b.gv", os.path.join("nested", "b.gv")]
+    assert "--" in (tmp_path / "out" / "b.gv").read_text()
+
+
+@pytest.mark.parametrize("skip", ["mtime", "hash"])
+def test_cli_skip(tmp_path, capsys, skip):
+    _write_graph(tmp_path / "g.json", [(1, 2)])
+    args = [str(tmp_path / "g.json"), "-f", "raw", "--skip", skip]
+    assert main(args) == 0
+    assert main(args) == 0
+    assert "skipped" in capsys.readouterr().err.splitlines()[-1]
+    _write_graph(tmp_path / "g.json", [(1, 3)])
+    os.utime(tmp_path / "g.json", (2**31, 2**31))
+    assert main(args) == 0
+    assert "rendered" in capsys.readouterr().err
+    assert "node0001" in (tmp_path / "g.gv").read_text()
+
+
+def test_cli_failure(tmp_path, capsys):
+    (tmp_path / "g.json").write_text("not json")
+    assert main([str(tmp_path / "g.json"), "-f", "raw"]) == 1
+    assert "failed" in capsys.readouterr().err
+
+
+def test_cli_negative_jobs(tmp_path, capsys):
+    _write_graph(tmp_path / "g.json", [(0, 1)])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "g.json"), "-f", "raw", "--jobs", "-1"])
+    assert "negative" in capsys.readouterr().err
+
+
+def test_cli_output_collision(tmp_path, capsys):
+    for directory in ["a", "b"]:
+        (tmp_path / directory).mkdir()
+    _write_graph(tmp_path / "a" / "g.json", [(0, 1)])
+    (tmp_path / "a" / "g.edgelist").write_text("0 1\n")
+    _write_graph(tmp_path / "b" / "g.json", [(0, 1)])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "a"), "-f", "raw"])
+    assert "same output" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(
+            [
+                str(tmp_path / "a" / "g.json"),
+                str(tmp_path / "b" / "g.json"),
+                "-f",
+                "raw",
+                "-o",
+                str(tmp_path / "out"),
+            ]
+        )
+    assert not (tmp_path / "out").exists()
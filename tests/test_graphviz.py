@@ -0,0 +1,183 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import io
+import json
+import os
+
+import networkx as nx
+import pytest
+
+import nxv
+from nxv import _graphviz
+
+from .conftest import clear_graphviz_caches as _clear_caches
+
+
+def test_graphviz_installation_probe(fake_installation):
+    bin, probes = fake_installation
+    installation = nxv.GraphVizInstallation.find(bin, "neato")
+    assert installation.bin == bin
+    assert installation.version == "2.43.0"
+    assert installation.layouts == {"circo", "dot", "fdp", "neato", "sfdp"}
+    assert installation.formats == {"dot", "plain", "png", "svg", "svgz"}
+    assert installation.supports_format("png:cairo")
+    assert not installation.supports_format("pdf")
+    assert len(probes) == 3
+    assert nxv.GraphVizInstallation.find(bin, "dot") is installation
+    assert len(probes) == 3
+
+
+def test_graphviz_installation_disk_cache(fake_installation):
+    bin, probes = fake_installation
+    installation = nxv.GraphVizInstallation.find(bin)
+    _clear_caches()
+    cached = nxv.GraphVizInstallation.find(bin)
+    assert len(probes) == 3
+    assert cached.to_dict() == installation.to_dict()
+
+    # Modifying the binary invalidates the cache.
+    dot = os.path.join(bin, "dot")
+    os.utime(dot, (0, 0))
+    _clear_caches()
+    nxv.GraphVizInstallation.find(bin)
+    assert len(probes) == 6
+    with open(_graphviz._get_installations_cache_path()) as f:
+        assert json.load(f)[dot]["mtime"] == 0
+
+
+def test_graphviz_installation_without_dot(tmp_path):
+    installation = nxv.GraphVizInstallation.probe(str(tmp_path))
+    assert installation.version is None
+    assert installation.formats is None
+    assert installation.supports_format("anything")
+
+
+def test_run_unsupported_format(fake_installation, monkeypatch):
+    bin, _ = fake_installation
+
+    def popen(*args, **kwargs):
+        raise AssertionError("GraphViz should not be run.")
+
+    monkeypatch.setattr(_graphviz, "Popen", popen)
+    with pytest.raises(nxv.GraphVizFormatNotFoundError):
+        _graphviz.run("digraph {}", "dot", "pdf", bin)
+
+
+def test_render_checks_installation_before_serializing(fake_installation, monkeypatch):
+    bin, _ = fake_installation
+    # gvpr is a GraphViz program, but not a layout engine.
+    open(os.path.join(bin, "gvpr"), "w").close()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The graph should not be serialized.")
+
+    monkeypatch.setattr(nxv._rendering, "_to_gv", fail)
+    monkeypatch.setattr(nxv._rendering, "_iter_gv_from_iterables", fail)
+    monkeypatch.setattr(nxv._arrays, "_serialize_frames", fail)
+    monkeypatch.setattr(nxv.IncrementalRenderer, "to_gv", fail)
+    graph = nx.Graph()
+    graph.add_node(0)
+    renders = [
+        lambda **kwargs: nxv.render(graph, **kwargs),
+        lambda **kwargs: nxv.render_edges([(0, 1)], **kwargs),
+        lambda **kwargs: nxv.IncrementalRenderer(graph).render(**kwargs),
+    ]
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"source": [0], "target": [1]})
+    renders.append(lambda **kwargs: nxv.render_frame(None, frame, **kwargs))
+    for render in renders:
+        with pytest.raises(nxv.GraphVizFormatNotFoundError):
+            render(format="pdf", graphviz_bin=bin)
+        with pytest.raises(nxv.GraphVizAlgorithmNotFoundError):
+            render(algorithm="gvpr", format="svg", graphviz_bin=bin)
+
+
+def test_run_streams_lines(echo_installation):
+    lines = (f"line {i}" for i in range(100_000))
+    actual = _graphviz.run(lines, "dot", "svg", echo_installation)
+    assert actual == "\n".join(f"line {i}" for i in range(100_000)).encode("utf-8")
+
+
+def test_run_output_path(echo_installation, tmp_path):
+    path = tmp_path / "out.svg"
+    assert (
+        _graphviz.run("digraph {}", "dot", "svg", echo_installation, output=path)
+        is None
+    )
+    assert path.read_bytes() == b"digraph {}"
+
+
+def test_run_output_file(echo_installation):
+    output = io.BytesIO()
+    _graphviz.run("digraph {}", "dot", "svg", echo_installation, output=output)
+    assert output.getvalue() == b"digraph {}"
+
+
+def test_run_iter(echo_installation):
+    gv = "x" * 200_000
+    chunks = list(_graphviz.run_iter(gv, "dot", "svg", echo_installation))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == gv.encode("utf-8")
+
+
+def test_run_iter_error(echo_installation):
+    chunks = _graphviz.run_iter(
+        "digraph {\n    error\n}", "dot", "svg", echo_installation
+    )
+    with pytest.raises(nxv.GraphVizError, match=">>>   2 |     error"):
+        list(chunks)
+
+
+def test_error_context():
+    gv = "\n".join(f"line{i}" for i in range(1, 10001))
+    error = _graphviz._error(gv, b"Error: syntax error in line 3\n")
+    assert str(error).splitlines()[-5:] == [
+        "      1 | line1",
+        "      2 | line2",
+        ">>>   3 | line3",
+        "      4 | line4",
+        "      5 | line5",
+    ]
+
+
+def test_render_output(echo_installation, tmp_path):
+    graph = nx.path_graph(3)
+    expected = nxv.render(graph, format="raw").encode("utf-8")
+
+    path = tmp_path / "out.svg"
+    assert (
+        nxv.render(graph, format="svg", graphviz_bin=echo_installation, output=path)
+        is None
+    )
+    assert path.read_bytes() == expected
+
+    output = io.BytesIO()
+    nxv.render(graph, format="svg", graphviz_bin=echo_installation, output=output)
+    assert output.getvalue() == expected
+
+
+def test_render_iter(echo_installation):
+    graph = nx.path_graph(3)
+    profiles = []
+    chunks = nxv.render_iter(
+        graph, format="svg", graphviz_bin=echo_installation, profile=profiles.append
+    )
+    assert not profiles
+    actual = b"".join(chunks)
+    assert actual == nxv.render(graph, format="raw").encode("utf-8")
+    (profile,) = profiles
+    assert profile.output_bytes == len(actual)
+    assert profile.node_count == 3
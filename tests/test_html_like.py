@@ -13,6 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import copy
+import pickle
+
+import networkx as nx
+import pytest
+
 import nxv.html_like as H
 
 
@@ -50,3 +56,73 @@ def test_html_like_repr():
     actual = repr(value)
     expected = "HtmlLike('HR', children=None, attributes={})"
     assert actual == expected
+
+
+def test_html_like_immutable():
+    value = H.bold("x")
+    assert str(value) == "<B>x</B>"
+    with pytest.raises(AttributeError):
+        value.name = "I"
+    with pytest.raises(AttributeError):
+        value.children = ("y",)
+    value.attributes["COLOR"] = "red"
+    assert value.attributes == {}
+    font = H.font("x", attributes={"COLOR": "red"})
+    font.attributes["COLOR"] = "blue"
+    assert font.attributes == {"COLOR": "red"}
+    assert str(font) == '<FONT COLOR="red">x</FONT>'
+    assert str(value) == "<B>x</B>"
+
+
+def test_html_like_pickle_and_copy():
+    template = H.template(H.bold(H.placeholder("name")))
+    values = [
+        H.font(H.join(["a", H.line_break()]), attributes={"COLOR": "red"}),
+        template(name="<x>"),
+        H.placeholder("name"),
+    ]
+    for value in values:
+        for copied in [pickle.loads(pickle.dumps(value)), copy.deepcopy(value)]:
+            assert type(copied) is type(value)
+            assert repr(copied) == repr(value)
+    graph = nx.Graph()
+    graph.add_node(0, label=values[0])
+    assert str(copy.deepcopy(graph).nodes[0]["label"]) == str(values[0])
+
+
+def test_html_like_template():
+    template = H.template(
+        H.table(
+            [
+                H.table_row(
+                    [H.table_cell("name"), H.table_cell(H.placeholder("name"))]
+                ),
+                H.table_row(
+                    [
+                        H.table_cell(
+                            H.placeholder("value"), {"BGCOLOR": H.placeholder("bg")}
+                        )
+                    ]
+                ),
+            ],
+            attributes={"BORDER": 0},
+        )
+    )
+    assert template.names == {"name", "value", "bg"}
+    values = {"name": "a < b", "value": H.bold("&"), "bg": '"red"'}
+    expected = H.table(
+        [
+            H.table_row([H.table_cell("name"), H.table_cell(values["name"])]),
+            H.table_row([H.table_cell(values["value"], {"BGCOLOR": values["bg"]})]),
+        ],
+        attributes={"BORDER": 0},
+    )
+    assert str(template(**values)) == str(expected)
+
+
+def test_html_like_template_missing_value():
+    template = H.template(H.bold(H.placeholder("x")))
+    with pytest.raises(TypeError):
+        template()
+    with pytest.raises(TypeError):
+        str(H.bold(H.placeholder("x")))
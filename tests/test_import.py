@@ -0,0 +1,71 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import os
+import subprocess
+import sys
+
+import nxv
+
+# Modules that must not be imported by ``import nxv``, since they are slow to import.
+HEAVY_MODULES = {"networkx", "numpy", "IPython", "nxv._rendering", "nxv.html_like"}
+
+
+def _run(code, *args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        check=True,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def _imported_modules(code):
+    """Get the names of the modules imported by running code in a fresh interpreter."""
+    output = _run(f"{code}; import json, sys; print(json.dumps(sorted(sys.modules)))")
+    return set(json.loads(output.stdout))
+
+
+def test_import_time():
+    stderr = _run("import nxv", "-X", "importtime").stderr
+    # Lines look like: "import time:       451 |        451 |     warnings"
+    modules = {
+        line.rsplit("|", 1)[1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+    assert "nxv" in modules
+    assert not modules & HEAVY_MODULES
+
+
+def test_import_is_lazy():
+    assert not _imported_modules("import nxv") & HEAVY_MODULES
+
+
+def test_lazy_attributes():
+    modules = _imported_modules("import nxv; nxv.Style")
+    assert "nxv._style" in modules
+    assert "networkx" not in modules
+    assert "networkx" in _imported_modules("import nxv; nxv.render")
+
+
+def test_all_attributes_resolve():
+    for name in nxv.__all__:
+        assert getattr(nxv, name) is not None
+    assert set(nxv.__all__) <= set(dir(nxv))
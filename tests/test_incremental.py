@@ -0,0 +1,128 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import re
+
+import networkx as nx
+import pytest
+
+import nxv
+
+
+def _subgraph_func(u, d):
+    return d.get("cluster")
+
+
+def _normalize(gv):
+    """Replace node ids with node labels and sort the lines within each block, so ids and order do not matter."""
+    labels = dict(re.findall(r'(node\d+) \[label="([^"]*)"', gv))
+    gv = re.sub(r"node\d+", lambda m: labels[m.group()], gv)
+    return sorted(line.strip() for line in gv.splitlines())
+
+
+def _counting_style(calls):
+    def node(u, d):
+        calls.append(u)
+        return {"color": d.get("color", "black")}
+
+    return nxv.Style(
+        node=node,
+        edge=lambda u, v, d: {"label": d.get("label", "")},
+        subgraph=lambda s: {"label": s},
+    )
+
+
+@pytest.mark.parametrize("graph_type", [nx.Graph, nx.DiGraph])
+def test_incremental_renderer_matches_render(graph_type):
+    graph = graph_type()
+    graph.add_node("a", cluster="x")
+    graph.add_node("b", cluster="y")
+    graph.add_node("c")
+    graph.add_edges_from([("a", "b"), ("b", "c", {"label": "bc"})])
+    calls = []
+    style = _counting_style(calls)
+    renderer = nxv.IncrementalRenderer(graph, style, subgraph_func=_subgraph_func)
+    assert renderer.to_gv() == nxv.render(
+        graph, style, subgraph_func=_subgraph_func, format="raw"
+    )
+
+    calls.clear()
+    graph.nodes["a"]["color"] = "red"
+    renderer.mark_node("a")
+    graph.add_edge("c", "d", label="cd")
+    renderer.mark_edge("c", "d")
+    graph.remove_node("b")
+    renderer.mark_node("b")
+    graph.nodes["c"]["cluster"] = "x"
+    renderer.mark_node("c")
+    actual = renderer.to_gv()
+    assert sorted(calls) == ["a", "c", "d"]
+    expected = nxv.render(graph, style, subgraph_func=_subgraph_func, format="raw")
+    assert _normalize(actual) == _normalize(expected)
+
+    calls.clear()
+    assert renderer.to_gv() == actual
+    assert calls == []
+
+
+def test_incremental_renderer_multigraph():
+    graph = nx.MultiGraph()
+    graph.add_edge(0, 1, key="a")
+    graph.add_edge(0, 1, key="b")
+    style = nxv.Style(edge=lambda u, v, k, d: {"label": k})
+    renderer = nxv.IncrementalRenderer(graph, style)
+    graph.remove_edge(0, 1, key="a")
+    graph.add_edge(1, 0, key="c")
+    renderer.mark_edge(1, 0)
+    expected = nxv.render(graph, style, format="raw")
+    assert _normalize(renderer.to_gv()) == _normalize(expected)
+
+
+def test_incremental_renderer_mark_graph():
+    graph = nx.Graph()
+    graph.add_edge(0, 1)
+    renderer = nxv.IncrementalRenderer(graph, nxv.Style(graph=lambda g, d: d))
+    graph.graph["label"] = "changed"
+    renderer.mark_graph()
+    assert renderer.render(format="raw") == nxv.render(
+        graph, nxv.Style(graph=lambda g, d: d), format="raw"
+    )
+
+
+def test_incremental_renderer_node_removed_and_added():
+    graph = nx.Graph()
+    graph.add_edge(5, 5)
+    graph.add_edge(5, 6)
+    renderer = nxv.IncrementalRenderer(graph)
+    renderer.to_gv()
+    graph.remove_node(5)
+    renderer.mark_node(5)
+    graph.add_node(5)
+    renderer.mark_node(5)
+    gv = renderer.to_gv()
+    assert " -- " not in gv
+    assert _normalize(gv) == _normalize(nxv.render(graph, format="raw"))
+
+
+def test_incremental_renderer_edge_to_removed_node():
+    graph = nx.Graph()
+    graph.add_node(0)
+    renderer = nxv.IncrementalRenderer(graph)
+    renderer.to_gv()
+    graph.add_edge(0, 1)
+    renderer.mark_edge(0, 1)
+    graph.remove_node(0)
+    renderer.mark_node(0)
+    assert _normalize(renderer.to_gv()) == _normalize(nxv.render(graph, format="raw"))
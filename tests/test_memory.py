@@ -0,0 +1,136 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Memory budgets for serialization and rendering.
+
+Each test measures the peak Python allocation of an operation with ``tracemalloc``
+and fails if it exceeds a budget proportional to the size of the graph or of the output.
+The budgets have some headroom over the measured footprint, but not enough to hold another copy of the output.
+"""
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tracemalloc
+
+import networkx as nx
+import pytest
+
+import nxv
+from nxv._rendering import _root_style, _to_gv
+
+SIZES = [2_000, 20_000]
+
+# Peak bytes allocated by serialization per byte of GraphViz output.
+TO_GV_BYTES_PER_OUTPUT_BYTE = 4.6
+RENDER_RAW_BYTES_PER_OUTPUT_BYTE = 4.8
+# Peak bytes allocated per edge of the input graph.
+TO_ORDERED_GRAPH_BYTES_PER_EDGE = 1_100
+NEIGHBORHOOD_BYTES_PER_EDGE = 200
+# Peak resident set size of the GraphViz child process per edge of the input graph, plus a fixed allowance.
+RENDER_SVG_CHILD_RSS_BYTES_PER_EDGE = 20_000
+RENDER_SVG_CHILD_RSS_BASE_BYTES = 256 * 2**20
+
+
+def _graph(edges, multi=False):
+    rng = random.Random(0)
+    n = edges // 4
+    graph = nx.MultiDiGraph() if multi else nx.DiGraph()
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from((rng.randrange(n), rng.randrange(n)) for _ in range(edges))
+    return graph
+
+
+def _peak_allocation(func, *args, **kwargs):
+    """Call a function and get its result and the peak bytes it allocated."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak - baseline
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("multi", [False, True])
+def test_memory_to_gv(size, multi):
+    graph = _graph(size, multi=multi)
+    style = nxv.compose([_root_style, None])
+    gv, peak = _peak_allocation(_to_gv, graph, style)
+    assert peak <= TO_GV_BYTES_PER_OUTPUT_BYTE * len(gv)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_memory_render_raw(size):
+    graph = _graph(size)
+    gv, peak = _peak_allocation(nxv.render, graph, format="raw")
+    assert peak <= RENDER_RAW_BYTES_PER_OUTPUT_BYTE * len(gv)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_memory_to_ordered_graph(size):
+    graph = _graph(size, multi=True)
+    _, peak = _peak_allocation(nxv.to_ordered_graph, graph)
+    assert peak <= TO_ORDERED_GRAPH_BYTES_PER_EDGE * size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_memory_neighborhood(size):
+    graph = _graph(size)
+
+    def neighborhood():
+        return sum(1 for _ in nxv.neighborhood(graph, [0]).nodes())
+
+    _, peak = _peak_allocation(neighborhood)
+    assert peak <= NEIGHBORHOOD_BYTES_PER_EDGE * size
+
+
+_CHILD_RSS_SCRIPT = """
+import json, random, resource, sys
+import networkx as nx
+import nxv
+
+rng = random.Random(0)
+edges = int(sys.argv[1])
+graph = nx.DiGraph()
+graph.add_edges_from((rng.randrange(edges // 4), rng.randrange(edges // 4)) for _ in range(edges))
+nxv.render(graph, format="svg", algorithm="sfdp")
+print(json.dumps(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss))
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires the resource module.")
+@pytest.mark.skipif(
+    not (os.environ.get("GRAPHVIZ_BIN") or shutil.which("sfdp")),
+    reason="Requires a GraphViz installation.",
+)
+def test_memory_render_svg_child_rss():
+    size = SIZES[0]
+    # Render in a fresh process, so the peak RSS of its children is only that of this render.
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD_RSS_SCRIPT, str(size)],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    max_rss = json.loads(output) * (1 if sys.platform == "darwin" else 1024)
+    budget = (
+        RENDER_SVG_CHILD_RSS_BASE_BYTES + RENDER_SVG_CHILD_RSS_BYTES_PER_EDGE * size
+    )
+    assert max_rss <= budget
@@ -0,0 +1,137 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+
+import networkx as nx
+
+import nxv
+
+
+def _graph():
+    graph = nx.DiGraph()
+    nx.add_path(graph, [0, 1, 2])
+    return graph
+
+
+def test_render_profile_callback():
+    profiles = []
+    output = nxv.render(_graph(), format="raw", profile=profiles.append)
+    (profile,) = profiles
+    assert isinstance(profile, nxv.RenderProfile)
+    assert list(profile.phases) == ["style", "serialize"]
+    assert profile.node_count == 3
+    assert profile.edge_count == 2
+    assert profile.gv_bytes == len(output.encode("utf-8"))
+    assert profile.output_bytes == len(output)
+    assert profile.to_dict()["phases"]["serialize"]["wall"] >= 0
+    assert "3 nodes, 2 edges" in str(profile)
+
+
+def test_render_profile_style_phase():
+    def node(u, d):
+        time.sleep(0.01)
+        return {}
+
+    profiles = []
+    nxv.render(_graph(), nxv.Style(node=node), format="raw", profile=profiles.append)
+    (profile,) = profiles
+    assert profile.phases["style"]["wall"] >= 0.03
+    assert profile.phases["serialize"]["wall"] < 0.03
+
+
+def test_render_profile_raw_output_bytes():
+    graph = nx.Graph()
+    graph.add_node("\u00e9")
+    profiles = []
+    output = nxv.render(graph, format="raw", profile=profiles.append)
+    assert profiles[0].output_bytes == len(output.encode("utf-8")) > len(output)
+
+
+def test_render_profile_stderr(capsys):
+    nxv.render(_graph(), format="raw", profile=True)
+    assert "nxv render profile (dot, raw)" in capsys.readouterr().err
+
+
+def test_render_hooks():
+    profiles = []
+    nxv.add_render_hook(profiles.append)
+    try:
+        nxv.render(_graph(), format="raw")
+    finally:
+        nxv.remove_render_hook(profiles.append)
+    nxv.render(_graph(), format="raw")
+    assert len(profiles) == 1
+    assert profiles[0].format == "raw"
+
+
+def test_style_profiler():
+    def is_even(u, d):
+        return u % 2 == 0
+
+    def even(u, d):
+        return {"color": "red", "shape": "box"}
+
+    style = nxv.Style(
+        node=nxv.switch(is_even, {True: even, False: {"color": "blue"}}),
+        edge=nxv.chain([{"style": "dashed"}, lambda u, v, d: {"label": str(u)}]),
+    )
+    with nxv.StyleProfiler(file=None) as profiler:
+        nxv.render(_graph(), style, format="raw")
+    stats = {row["layer"].split(" (")[0]: row for row in profiler.stats()}
+    assert stats["test_style_profiler.<locals>.even"]["calls"] == 2
+    assert stats["test_style_profiler.<locals>.even"]["mean_items"] == 2
+    assert any(row["layer"].endswith("[False]") for row in profiler.stats())
+    assert stats["test_style_profiler.<locals>.<lambda>"]["calls"] == 2
+    report = profiler.report()
+    assert report.startswith("nxv style profile")
+    assert "switch on test_style_profiler.<locals>.is_even" in report
+
+
+def test_style_profiler_inactive():
+    with nxv.StyleProfiler(file=None) as profiler:
+        pass
+    nxv.render(_graph(), format="raw")
+    assert profiler.stats() == []
+
+
+def test_style_profiler_threads():
+    barrier = threading.Barrier(2)
+    profilers = {}
+
+    def node(u, d):
+        return {"shape": "box"}
+
+    def work(name):
+        with nxv.StyleProfiler(file=None) as profiler:
+            barrier.wait()
+            for _ in range(50):
+                nxv.render(_graph(), nxv.Style(node=node), format="raw")
+            barrier.wait()
+        profilers[name] = profiler
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in "ab"]
+    with nxv.StyleProfiler(file=None) as main_profiler:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert main_profiler.stats() == []
+    for profiler in profilers.values():
+        stats = {row["layer"].split(" (")[0]: row for row in profiler.stats()}
+        row = stats["test_style_profiler_threads.<locals>.node"]
+        assert row["calls"] == 150
+        assert 0 <= row["own"] <= row["cumulative"]
@@ -0,0 +1,93 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import networkx as nx
+import pytest
+
+import nxv
+from nxv._reduce import _core_numbers
+
+
+def test_reduce_degree():
+    graph = nx.star_graph(5)
+    nx.add_path(graph, [5, 6, 7])
+    reduced = nxv.reduce(graph, 3)
+    assert set(reduced) == {0, 5, 6}
+    assert set(reduced.edges) == {(0, 5), (5, 6)}
+    assert {u for u, d in reduced.nodes(data=True) if d.get("truncated")} == {0, 6}
+    assert not any("truncated" in d for _, d in graph.nodes(data=True))
+
+
+def test_reduce_kcore():
+    graph = nx.complete_graph(4)
+    nx.add_star(graph, [10, 11, 12, 13, 14, 15])
+    reduced = nxv.reduce(graph, 4, strategy="kcore", marker=None)
+    assert set(reduced) == {0, 1, 2, 3}
+    assert not any(d for _, d in reduced.nodes(data=True))
+
+
+def test_core_numbers():
+    graph = nx.MultiDiGraph(nx.complete_graph(4).to_directed())
+    nx.add_path(graph, [3, 4, 5])
+    graph.add_edge(0, 1)
+    graph.add_edge(5, 5)
+    simple = nx.Graph(graph)
+    simple.remove_edges_from(nx.selfloop_edges(simple))
+    assert _core_numbers(graph) == nx.core_number(simple)
+
+
+def test_reduce_pagerank():
+    graph = nx.DiGraph()
+    nx.add_star(graph, [0, 1, 2, 3, 4])
+    graph.add_edges_from([(1, 0), (2, 0), (3, 0), (4, 0)])
+    graph.add_edge(5, 6)
+    assert 0 in nxv.reduce(graph, 1, strategy="pagerank")
+
+
+@pytest.mark.parametrize("strategy", ["random_walk", "edge_sample"])
+def test_reduce_sampled(strategy):
+    graph = nx.gnm_random_graph(200, 400, seed=0)
+    graph.add_nodes_from(range(200, 210))
+    reduced = nxv.reduce(graph, 50, strategy=strategy, seed=1)
+    assert reduced.number_of_nodes() == 50
+    assert set(reduced) == set(nxv.reduce(graph, 50, strategy=strategy, seed=1))
+    for u, d in reduced.nodes(data=True):
+        assert d.get("truncated", False) == (reduced.degree(u) < graph.degree(u))
+
+
+def test_reduce_small_graph():
+    graph = nx.path_graph(3)
+    assert set(nxv.reduce(graph, 10, strategy="random_walk")) == {0, 1, 2}
+    assert len(nxv.reduce(graph, 0)) == 0
+
+
+def test_reduce_invalid_strategy():
+    with pytest.raises(ValueError):
+        nxv.reduce(nx.path_graph(3), 2, strategy="betweenness")
+
+
+def test_reduce_edge_sample_isolated_nodes():
+    graph = nx.empty_graph(1000)
+    nx.add_path(graph, [0, 1, 2, 3])
+    reduced = nxv.reduce(graph, 10, strategy="edge_sample", seed=0)
+    assert reduced.number_of_nodes() == 10
+    assert {0, 1, 2, 3} <= set(reduced)
+    assert len(nxv.reduce(nx.empty_graph(20), 5, strategy="edge_sample")) == 5
+
+
+def test_reduce_random_walk_components():
+    graph = nx.Graph((2 * i, 2 * i + 1) for i in range(5000))
+    reduced = nxv.reduce(graph, 400, strategy="random_walk", seed=0)
+    assert reduced.number_of_nodes() == 400
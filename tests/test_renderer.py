@@ -0,0 +1,95 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import networkx as nx
+import pytest
+
+import nxv
+
+
+def test_renderer_raw():
+    style = nxv.Style(
+        node=lambda u, d: {"shape": "box", "penwidth": d["w"]},
+        edge=lambda u, v, d: {"weight": d["w"]},
+    )
+    graph = nx.DiGraph()
+    graph.add_node(0, w=1)
+    graph.add_node(1, w=True)
+    graph.add_node(2, w=1.0)
+    graph.add_edge(0, 1, w=1)
+    graph.add_edge(1, 2, w=True)
+    renderer = nxv.Renderer(style, format="raw")
+    expected = nxv.render(graph, style, format="raw")
+    assert renderer.render(graph) == expected
+    assert renderer.render(graph) == expected
+    metrics = renderer.metrics()
+    assert metrics["renders"] == 2
+    assert metrics["failures"] == 0
+    assert metrics["in_flight"] == 0
+    assert metrics["nodes"] == 6
+    assert metrics["edges"] == 4
+    assert metrics["gv_bytes"] == 2 * len(expected)
+    assert metrics["output_bytes"] == 2 * len(expected)
+    assert "serialize" in metrics["phases"]
+
+
+def test_renderer_profiles_on_demand(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("The style should not be timed.")
+
+    graph = nx.path_graph(3)
+    renderer = nxv.Renderer(format="raw")
+    with monkeypatch.context() as m:
+        m.setattr(nxv._renderer, "_timed_style", fail)
+        renderer.render(graph)
+    profiles = []
+    renderer.render(graph, profile=profiles.append)
+    nxv.add_render_hook(profiles.append)
+    try:
+        renderer.render(graph)
+    finally:
+        nxv.remove_render_hook(profiles.append)
+    assert [profile.node_count for profile in profiles] == [3, 3]
+    assert all("style" in profile.phases for profile in profiles)
+    assert renderer.metrics()["renders"] == 3
+    assert renderer.metrics()["nodes"] == 9
+
+
+def test_renderer_submit(echo_installation):
+    graphs = [nx.path_graph(i) for i in range(1, 9)]
+    with nxv.Renderer(
+        format="svg", graphviz_bin=echo_installation, max_workers=2
+    ) as renderer:
+        futures = [renderer.submit(graph) for graph in graphs]
+        outputs = [future.result(timeout=30) for future in futures]
+    for graph, output in zip(graphs, outputs):
+        assert output == nxv.render(graph, format="raw").encode("utf-8")
+    assert renderer.metrics()["renders"] == len(graphs)
+
+
+def test_renderer_failure(echo_installation):
+    renderer = nxv.Renderer(format="svg", graphviz_bin=echo_installation)
+    graph = nx.Graph()
+    graph.add_node("error")
+    with pytest.raises(nxv.GraphVizError):
+        renderer.render(graph)
+    assert renderer.metrics()["failures"] == 1
+    assert renderer.metrics()["renders"] == 0
+
+
+def test_renderer_format_not_found(fake_installation):
+    bin, _ = fake_installation
+    with pytest.raises(nxv.GraphVizFormatNotFoundError):
+        nxv.Renderer(format="pdf", graphviz_bin=bin)
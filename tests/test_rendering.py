@@ -85,6 +85,49 @@ def test_render_multi():
     nxv.render(graph, style, format="svg")
 
 
+def test_render_aggregate_multiedges():
+    graph = nx.MultiGraph()
+    graph.add_edge(0, 1, key="a", weight=2, label="x")
+    graph.add_edge(1, 0, key="b", label="y")
+    graph.add_edge(1, 1, key="c")
+    style = nxv.Style(
+        edge=lambda u, v, keys, d: {
+            "label": f"{','.join(keys)} {d['count']} {d['weight']} {'/'.join(d['labels'])}"
+        }
+    )
+    actual = nxv.render(graph, style, format="raw", aggregate_multiedges=True)
+    expected = textwrap.dedent(
+        """
+        graph "G" {
+            graph [];
+            node0000 [label="0"];
+            node0001 [label="1"];
+            node0000 -- node0001 [label="a,b 2 3 x/y"];
+            node0001 -- node0001 [label="c 1 1 "];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_render_aggregate_multiedges_reducer():
+    graph = nx.MultiDiGraph()
+    graph.add_edge(0, 1, amount=5)
+    graph.add_edge(0, 1, amount=7)
+    graph.add_edge(1, 0, amount=1)
+    style = nxv.Style(edge=lambda u, v, keys, d: d)
+    actual = nxv.render(
+        graph,
+        style,
+        format="raw",
+        aggregate_multiedges=lambda u, v, ds: {
+            "penwidth": max(d["amount"] for d in ds)
+        },
+    )
+    assert 'node0000 -> node0001 [penwidth="7"];' in actual
+    assert 'node0001 -> node0000 [penwidth="1"];' in actual
+
+
 def test_render_strange_characters():
     graph = nx.Graph()
     nx.add_path(graph, range(1000))
@@ -169,6 +212,85 @@ def test_subgraph_indentation():
     assert actual == expected
 
 
+def test_render_ordered():
+    graph = nx.DiGraph()
+    graph.add_node("c", label="C", color="red")
+    graph.add_node("a", shape="box", label="A")
+    graph.add_edge("c", "b", weight=2)
+    graph.add_edge("a", "c", weight=1)
+    style = nxv.Style(node=lambda u, d: d, edge=lambda u, v, d: {"weight": d["weight"]})
+    actual = nxv.render(
+        graph,
+        style,
+        format="raw",
+        node_order=lambda u, d: u,
+        edge_order=lambda u, v, d: d["weight"],
+        sort_attributes=True,
+    )
+    expected = textwrap.dedent(
+        """
+        digraph "G" {
+            graph [];
+            node0000 [label="A", shape="box"];
+            node0001 [label="b"];
+            node0002 [color="red", label="C"];
+            node0000 -> node0002 [weight="1"];
+            node0002 -> node0001 [weight="2"];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_render_edges():
+    style = nxv.Style(
+        graph=lambda g, d: {"label": d["title"]},
+        node=lambda u, d: d,
+        edge=lambda u, v, k, d: {"label": f"{k}{d['weight']}"},
+    )
+    actual = nxv.render_edges(
+        (node for node in [("a", {"color": "red"})]),
+        (
+            edge
+            for edge in [
+                ("a", "b", "x", {"weight": 1}),
+                ("b", "c", "y", {"weight": 2}),
+                ("a", "b", "z", {"weight": 3}),
+            ]
+        ),
+        style,
+        directed=False,
+        multi=True,
+        graph_attrs={"title": "Streamed"},
+        format="raw",
+    )
+    expected = textwrap.dedent(
+        """
+        graph "G" {
+            graph [label="Streamed"];
+            node0000 [label="a", color="red"];
+            node0001 [label="b"];
+            node0000 -- node0001 [label="x1"];
+            node0002 [label="c"];
+            node0001 -- node0002 [label="y2"];
+            node0000 -- node0001 [label="z3"];
+        }
+        """
+    ).strip()
+    assert actual == expected
+
+
+def test_render_edges_invalid_edge():
+    with pytest.raises(ValueError):
+        nxv.render_edges(edges=[("a", "b", "k", {})], format="raw")
+
+
+def test_render_edges_svg():
+    edges = ((i, i + 1, {}) for i in range(1_000))
+    actual = nxv.render_edges(edges=edges, format="svg")
+    assert b"node0999" in actual
+
+
 def test_color():
     from nxv._rendering import color
 
@@ -185,6 +307,18 @@ def test_color():
         assert actual == expected
 
 
+def test_colors():
+    pytest.importorskip("numpy")
+    from nxv._rendering import color, colors
+
+    channels = [(0, 0, 0), (1, 1, 1), (0.5, 0.25, 0.125), (0.2, 0.4, 0.6)]
+    assert colors(channels) == [color(c) for c in channels]
+    channels = [(0, 0, 0, 0), (0.5, 0.5, 0.5, 0.5), (1, 1, 1, 1)]
+    assert colors(channels) == ["#00000000", "#80808080", "#FFFFFFFF"]
+    channels = [(float("nan"), 1, 1)]
+    assert colors(channels) == [color(channels[0])] == ["#00FFFF"]
+
+
 def test_render_color():
     graph = nx.Graph()
     graph.add_node(0)
@@ -239,3 +373,33 @@ def test_render_explicit_ipython_format_inside_ipython():
         output = nxv.render(graph, format=format)
         with assert_ipython_display_call(output, f"ipython/{format}"):
             nxv.render(graph, format=f"ipython/{format}")
+
+
+def test_render_raw_output(tmp_path):
+    graph = nx.path_graph(3)
+    expected = nxv.render(graph, format="raw")
+    path = tmp_path / "graph.gv"
+    assert nxv.render(graph, format="raw", output=str(path)) is None
+    assert path.read_text() == expected
+    assert b"".join(nxv.render_iter(graph, format="raw")) == expected.encode("utf-8")
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_render_output_removed_on_error(echo_installation, tmp_path, optimize):
+    graph = nx.Graph()
+    graph.add_node("error")
+    path = tmp_path / "graph.svg"
+    with pytest.raises(nxv.GraphVizError):
+        nxv.render(
+            graph,
+            format="svg",
+            graphviz_bin=echo_installation,
+            optimize=optimize,
+            output=str(path),
+        )
+    assert not path.exists()
+
+
+def test_render_iter_requires_format():
+    with pytest.raises(ValueError):
+        nxv.render_iter(nx.path_graph(3))
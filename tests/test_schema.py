@@ -0,0 +1,166 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import networkx as nx
+import pytest
+
+import nxv
+from nxv._schema import ATTRIBUTES, check_attributes
+
+# The attribute names of the GraphViz attributes documentation.
+DOCUMENTED_ATTRIBUTES = """
+    _background area arrowhead arrowsize arrowtail bb beautify bgcolor center charset class cluster clusterrank
+    color colorscheme comment compound concentrate constraint Damping decorate defaultdist dim dimen dir
+    diredgeconstraints distortion dpi edgehref edgetarget edgetooltip edgeURL epsilon esep fillcolor fixedsize
+    fontcolor fontname fontnames fontpath fontsize forcelabels gradientangle group head_lp headclip headhref
+    headlabel headport headtarget headtooltip headURL height href id image imagepath imagepos imagescale
+    inputscale K label label_scheme labelangle labeldistance labelfloat labelfontcolor labelfontname
+    labelfontsize labelhref labeljust labelloc labeltarget labeltooltip labelURL landscape layer layerlistsep
+    layers layerselect layersep layout len levels levelsgap lhead lheight linelength lp ltail lwidth margin
+    maxiter mclimit mindist minlen mode model newrank nodesep nojustify normalize notranslate nslimit nslimit1
+    oneblock ordering orientation outputorder overlap overlap_scaling overlap_shrink pack packmode pad page
+    pagedir pencolor penwidth peripheries pin pos quadtree quantum rank rankdir ranksep ratio rects regular
+    remincross repulsiveforce resolution root rotate rotation samehead sametail samplepoints scale searchsize
+    sep shape shapefile showboxes sides size skew smoothing sortv splines start style stylesheet tail_lp
+    tailclip tailhref taillabel tailport tailtarget tailtooltip tailURL target TBbalance tooltip truecolor URL
+    vertices viewport voro_margin weight width xdotversion xlabel xlp z
+""".split()
+
+
+@pytest.mark.parametrize(
+    "attrs",
+    [
+        {
+            "label": "x",
+            "shape": "Mrecord",
+            "width": 1.5,
+            "height": "2",
+            "peripheries": 2,
+        },
+        {
+            "style": "rounded,filled",
+            "fillcolor": (255, 0, 0),
+            "pin": "true",
+            "label": None,
+        },
+        {"width": "", "fontsize": 12},
+    ],
+)
+def test_valid_node_attributes(attrs):
+    check_attributes(attrs, "node", "node 0")
+
+
+@pytest.mark.parametrize(
+    "attrs, kind, match",
+    [
+        ({"fillcolour": "red"}, "node", "Did you mean 'fillcolor'"),
+        ({"rank": "same"}, "graph", "not used by graphs"),
+        ({"shape": "boxx"}, "node", "node shape"),
+        ({"width": "wide"}, "node", "a number"),
+        ({"width": float("nan")}, "node", "a number"),
+        ({"peripheries": 1.5}, "node", "an integer"),
+        ({"style": "dashed,wavy"}, "edge", "list of styles"),
+        ({"arrowhead": "pointy"}, "edge", "arrow shape"),
+        ({"dir": "up"}, "edge", "'back', 'both', 'forward', 'none'"),
+        ({"rankdir": "XY"}, "graph", "'BT', 'LR', 'RL', 'TB'"),
+    ],
+)
+def test_invalid_attributes(attrs, kind, match):
+    with pytest.raises(nxv.GraphVizAttributeError, match=match):
+        check_attributes(attrs, kind, "the element")
+
+
+def test_documented_attributes():
+    assert set(DOCUMENTED_ATTRIBUTES) <= set(ATTRIBUTES)
+    check_attributes(
+        {"clusterrank": "local", "oneblock": "true", "TBbalance": "min"},
+        "graph",
+        "the graph",
+    )
+
+
+def test_numpy_numbers():
+    np = pytest.importorskip("numpy")
+    check_attributes(
+        {"penwidth": np.int64(2), "width": np.float32(1.5), "peripheries": np.int32(2)},
+        "node",
+        "node 0",
+    )
+    check_attributes(
+        {"fillcolor": np.array([1.0, 0.5, 0.0]), "shape": "epsf"}, "node", "node 0"
+    )
+    check_attributes(
+        {"constraint": np.bool_(False), "headclip": np.int64(1)}, "edge", "edge 0"
+    )
+    for attrs in [{"width": np.float64("nan")}, {"peripheries": np.float64(1.5)}]:
+        with pytest.raises(nxv.GraphVizAttributeError):
+            check_attributes(attrs, "node", "node 0")
+
+
+def test_valid_subgraph_and_edge_attributes():
+    check_attributes(
+        {"rank": "same", "label": "x", "name": "cluster_0"}, "subgraph", "subgraph 0"
+    )
+    check_attributes(
+        {"arrowhead": "olbox", "arrowtail": "invodot", "dir": "both"}, "edge", "edge"
+    )
+    check_attributes(
+        {"type": "digraph", "rankdir": "LR", "splines": "ortho"}, "graph", "the graph"
+    )
+
+
+def test_checked_attributes_are_not_checked_again():
+    checked = set()
+    check_attributes({"shape": "box"}, "node", "node 0", checked)
+    assert checked == {("node", "shape", str, "box")}
+    with pytest.raises(nxv.GraphVizAttributeError):
+        check_attributes({"shape": "boxx"}, "node", "node 1", checked)
+
+
+def test_render_validate():
+    graph = nx.path_graph(5000)
+    style = nxv.Style(
+        node=lambda u, d: {"shape": "circle" if u < 4000 else "circel"},
+        edge=lambda u, v, d: {"penwidth": 1},
+    )
+    with pytest.raises(nxv.GraphVizAttributeError, match="node 4000"):
+        nxv.render(graph, style, format="raw", validate=True)
+    assert nxv.render(graph, style, format="raw")
+
+
+def test_render_validate_subgraphs():
+    graph = nx.path_graph(4)
+    style = nxv.Style(subgraph=lambda key: {"rankdir": "LR", "colour": "red"})
+    with pytest.raises(nxv.GraphVizAttributeError, match="subgraph 0"):
+        nxv.render(
+            graph,
+            style,
+            format="raw",
+            subgraph_func=lambda u, d: u % 2,
+            validate=True,
+        )
+
+
+def test_renderer_validate():
+    renderer = nxv.Renderer(
+        nxv.Style(edge=lambda u, v, d: {"weight": d.get("weight", 1)}),
+        format="raw",
+        validate=True,
+    )
+    renderer.render(nx.path_graph(3))
+    graph = nx.Graph()
+    graph.add_edge(0, 1, weight="heavy")
+    with pytest.raises(nxv.GraphVizAttributeError, match=r"edge \(0, 1\)"):
+        renderer.render(graph)
@@ -0,0 +1,117 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import re
+
+import networkx as nx
+import pytest
+
+import nxv
+
+
+def _positions(frame):
+    return dict(re.findall(rb'label="(\w+)", pos="([^"]+)"', frame))
+
+
+def _snapshots():
+    first = nx.DiGraph([("a", "b")])
+    second = nx.DiGraph([("a", "b"), ("b", "c")])
+    third = nx.DiGraph([("b", "c")])
+    return [first, second, third]
+
+
+def test_render_sequence(echo_installation):
+    # The fake GraphViz echoes its input, and places the i-th node of the union at (i, i) inches.
+    frames = nxv.render_sequence(
+        _snapshots(), format="svg", graphviz_bin=echo_installation
+    )
+    assert [_positions(frame) for frame in frames] == [
+        {b"a": b"0.00,0.00", b"b": b"72.00,72.00"},
+        {b"a": b"0.00,0.00", b"b": b"72.00,72.00", b"c": b"144.00,144.00"},
+        {b"b": b"72.00,72.00", b"c": b"144.00,144.00"},
+    ]
+    for frame in frames:
+        assert (
+            b'anchor1 [style="invis", shape="point", width="0", height="0", label="", pos="720.00,1440.00"];'
+            in frame
+        )
+
+
+def test_render_sequence_seeded(echo_installation):
+    frames = nxv.render_sequence(
+        _snapshots(), format="svg", layout="seeded", graphviz_bin=echo_installation
+    )
+    assert _positions(frames[1]) == {
+        b"a": b"0.00,0.00",
+        b"b": b"1.00,1.00",
+        b"c": b"2.00,2.00",
+    }
+    assert b'pos="10.00,20.00!"' in frames[1]
+
+
+def test_render_sequence_output(echo_installation, tmp_path):
+    output = tmp_path / "frames"
+    nxv.render_sequence(
+        _snapshots(), format="svg", graphviz_bin=echo_installation, output=str(output)
+    )
+    assert sorted(path.name for path in output.iterdir()) == [
+        "0000.svg",
+        "0001.svg",
+        "0002.svg",
+    ]
+
+
+def test_render_sequence_invalid_layout():
+    with pytest.raises(ValueError):
+        nxv.render_sequence(_snapshots(), format="svg", layout="random")
+
+
+def test_render_sequence_empty():
+    with pytest.raises(ValueError, match="At least one snapshot"):
+        nxv.render_sequence([], format="svg")
+    with pytest.raises(ValueError, match="At least one frame"):
+        nxv.animate_svg([])
+
+
+def test_animate_svg_references():
+    frame = (
+        b'<svg width="10pt" height="10pt"><defs><linearGradient id="l_0"/></defs>'
+        b'<a xlink:href="#node1" href="https://example.com/#x"><path fill="url(#l_0)"/></a>'
+        b'<use href="#l_0" clip-path="url(\'#l_0\')"/><g id="node1"/></svg>'
+    )
+    actual = nxv.animate_svg([frame, frame]).decode("utf-8")
+    for i in range(2):
+        assert f'id="f{i}_l_0"' in actual
+        assert f'fill="url(#f{i}_l_0)"' in actual
+        assert f'xlink:href="#f{i}_node1"' in actual
+        assert f'<use href="#f{i}_l_0"' in actual
+        assert f"clip-path=\"url('#f{i}_l_0')\"" in actual
+    assert actual.count('href="https://example.com/#x"') == 2
+
+
+def test_animate_svg():
+    frames = [
+        b'<?xml version="1.0"?>\n<svg width="10pt" height="20pt" viewBox="0 0 10 20"><g id="graph0"/></svg>\n',
+        b'<svg width="30pt" height="5pt" viewBox="0 0 30 5"><g id="graph0"/></svg>',
+    ]
+    actual = nxv.animate_svg(frames, frame_duration=0.5).decode("utf-8")
+    assert actual.startswith('<svg width="30pt" height="20pt" viewBox="0 0 30 20"')
+    assert actual.count("<animate ") == 2
+    assert 'values="visible;hidden" keyTimes="0;0.5" dur="1s"' in actual
+    assert (
+        '<svg width="10" height="20" viewBox="0 0 10 20"><g id="f0_graph0"/></svg>'
+        in actual
+    )
+    assert 'id="f1_graph0"' in actual
@@ -0,0 +1,152 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import json
+
+import networkx as nx
+
+import nxv
+from nxv.serve import RenderServer
+from nxv.serve._server import _FairQueue
+
+
+async def _request(port, method, path, body=b"", headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {path} HTTP/1.1", f"Content-Length: {len(body)}"]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, payload
+
+
+def _serve(server, client):
+    async def main():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await client(port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+def _body(graph):
+    return json.dumps(nx.node_link_data(graph)).encode("utf-8")
+
+
+def test_serve_render(echo_installation):
+    graph = nx.path_graph(3)
+    server = RenderServer(graphviz_bin=echo_installation, workers=2)
+
+    async def client(port):
+        first = await _request(port, "POST", "/render?format=svg", _body(graph))
+        second = await _request(port, "POST", "/render?format=svg", _body(graph))
+        return first, second
+
+    first, second = _serve(server, client)
+    expected = nxv.render(graph, format="raw").encode("utf-8")
+    assert first == (200, expected)
+    assert second == (200, expected)
+    metrics = server.metrics()
+    assert metrics["renders"] == 1
+    assert metrics["cache_hits"] == 1
+    assert metrics["latency"]["count"] == 2
+    assert metrics["renderers"]["dot/svg"]["renders"] == 1
+
+
+def test_serve_deduplicates(echo_installation):
+    graph = nx.path_graph(3)
+    server = RenderServer(graphviz_bin=echo_installation, workers=2)
+
+    async def client(port):
+        requests = [
+            _request(port, "POST", "/render?format=svg", _body(graph)) for _ in range(5)
+        ]
+        return await asyncio.gather(*requests)
+
+    responses = _serve(server, client)
+    assert all(status == 200 for status, _ in responses)
+    assert len({payload for _, payload in responses}) == 1
+    metrics = server.metrics()
+    assert metrics["renders"] == 1
+    assert metrics["deduplicated"] + metrics["cache_hits"] == 4
+
+
+def test_serve_errors(echo_installation):
+    graph = nx.Graph()
+    graph.add_node("error")
+    server = RenderServer(graphviz_bin=echo_installation, workers=1)
+
+    async def client(port):
+        return [
+            await _request(port, "POST", "/render", b"{"),
+            await _request(port, "POST", "/render", _body(graph)),
+            await _request(port, "GET", "/render"),
+            await _request(port, "GET", "/nowhere"),
+            await _request(port, "GET", "/metrics"),
+        ]
+
+    responses = _serve(server, client)
+    assert [status for status, _ in responses] == [400, 400, 405, 404, 200]
+    assert b"syntax error" in responses[1][1]
+    metrics = json.loads(responses[-1][1])
+    assert metrics["errors"] == 4
+    assert metrics["queue_depth"] == 0
+    assert metrics["cache_entries"] == 0
+
+
+def test_serve_rejects_unsafe_requests(echo_installation):
+    server = RenderServer(graphviz_bin=echo_installation, workers=1)
+    body = _body(nx.path_graph(2))
+
+    async def client(port):
+        return [
+            await _request(port, "POST", "/render?algorithm=/usr/bin/env", body),
+            await _request(port, "POST", "/render?algorithm=python3", body),
+            await _request(port, "POST", "/render", headers={"Content-Length": "-1"}),
+        ]
+
+    responses = _serve(server, client)
+    assert [status for status, _ in responses] == [400, 400, 400]
+    assert b"Unknown algorithm" in responses[0][1]
+
+
+def test_fair_queue():
+    async def main():
+        queue = _FairQueue()
+        for job in ["a1", "a2", "a3"]:
+            queue.put("a", job)
+        queue.put("b", "b1")
+        queue.put("c", "c1")
+        assert len(queue) == 5
+        assert queue.clients == 3
+        return [await queue.get() for _ in range(5)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(main()) == ["a1", "b1", "c1", "a2", "a3"]
+    finally:
+        loop.close()
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import pytest
+
 import nxv
 
 
@@ -39,3 +41,56 @@ def test_styles_verbose():
     assert style.node(1, {"a": "b"}) == {"label": "1\n{'a': 'b'}", "shape": "box"}
     assert style.edge(1, 2, {"a": "b"}) == {"label": "{'a': 'b'}"}
     assert style.edge(1, 2, "key", {"a": "b"}) == {"label": "key\n{'a': 'b'}"}
+
+
+def test_styles_colormap():
+    style = nxv.styles.colormap("x", [(0, 0, 0), (1, 1, 1)], vmin=0, vmax=10)
+    assert style.node(1, {}) == {}
+    assert style.node(1, {"x": -5}) == {
+        "fillcolor": "#000000",
+        "fontcolor": "#FFFFFF",
+        "style": "filled",
+    }
+    assert style.node(1, {"x": 4.9})["fillcolor"] == "#000000"
+    assert style.node(1, {"x": 5})["fillcolor"] == "#FFFFFF"
+    assert style.node(1, {"x": 50})["fontcolor"] == "#000000"
+
+
+def test_styles_colormap_missing():
+    style = nxv.styles.colormap("x", [(0, 0, 0), (1, 1, 1)])
+    assert style.node(1, {"x": float("nan")}) == {
+        "fillcolor": "#808080",
+        "fontcolor": "#000000",
+        "style": "filled",
+    }
+    style = nxv.styles.colormap("x", [(0, 0, 0), (1, 1, 1)], missing=None)
+    assert style.node(1, {"x": float("nan")}) == {}
+
+
+def test_styles_colormap_infinite():
+    style = nxv.styles.colormap("x", [(0, 0, 0), (1, 1, 1)])
+    assert style.node(1, {"x": float("-inf")})["fillcolor"] == "#000000"
+    assert style.node(1, {"x": float("inf")})["fillcolor"] == "#FFFFFF"
+    with pytest.raises(TypeError):
+        style.node(1, {"x": "0.5"})
+
+
+def test_styles_colormap_numpy_palette():
+    np = pytest.importorskip("numpy")
+    style = nxv.styles.colormap("x", np.array([[0.0, 0, 0], [1, 1, 1]]))
+    assert style.node(1, {"x": np.float64(0.75)})["fillcolor"] == "#FFFFFF"
+    with pytest.raises(ValueError):
+        nxv.styles.colormap("x", np.empty((0, 3)))
+
+
+def test_styles_colormap_copies():
+    style = nxv.styles.colormap("x", [(0, 0, 0), (1, 1, 1)])
+    style.node(1, {"x": 0})["label"] = "changed"
+    assert "label" not in style.node(2, {"x": 0})
+
+
+def test_styles_colormap_levels():
+    style = nxv.styles.colormap(
+        "x", [(0, 0, 0), (1, 1, 1)], levels=3, attribute="color"
+    )
+    assert style.node(1, {"x": 0.5}) == {"color": "#808080", "fontcolor": "#000000"}
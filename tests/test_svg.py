@@ -0,0 +1,122 @@
+#
+# Copyright 2020 Two Sigma Open Source, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import gzip
+import re
+import textwrap
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+import nxv
+from nxv._svg import _class_name
+
+SVG = textwrap.dedent(
+    """
+    <?xml version="1.0" encoding="UTF-8" standalone="no"?>
+    <!-- Generated by graphviz -->
+    <svg width="62pt" height="44pt" viewBox="0.00 0.00 62.00 44.00" xmlns="http://www.w3.org/2000/svg">
+    <g id="graph0" class="graph" transform="translate(4 40)">
+    <!-- node0000 -->
+    <g id="node1" class="node">
+    <ellipse fill="none" stroke="black" cx="27" cy="-18" rx="27.123" ry="18"/>
+    <text text-anchor="middle" x="27" y="-14.3" font-family="Times,serif" font-size="14.00">a &amp; b</text>
+    </g>
+    <path fill="none" stroke="black" d="M27,-71.7C27,-63.98 27,-54.71 27,-46.11"/>
+    </g>
+    </svg>
+    """
+).strip()
+
+
+C0 = _class_name((("fill", "none"), ("stroke", "black")))
+C1 = _class_name(
+    (("text-anchor", "middle"), ("font-family", "Times,serif"), ("font-size", "14px"))
+)
+
+
+def test_optimize_svg():
+    actual = nxv.optimize_svg(SVG, precision=1).decode("utf-8")
+    expected = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>'
+        '<svg width="62pt" height="44pt" viewBox="0 0 62 44" xmlns="http://www.w3.org/2000/svg">'
+        '<g id="graph0" class="graph" transform="translate(4 40)">'
+        '<g id="node1" class="node">'
+        f'<ellipse cx="27" cy="-18" rx="27.1" ry="18" class="{C0}"/>'
+        f'<text x="27" y="-14.3" class="{C1}">a &amp; b</text>'
+        "</g>"
+        f'<path d="M27,-71.7C27,-64 27,-54.7 27,-46.1" class="{C0}"/>'
+        "</g>"
+        "<style><![CDATA["
+        f".{C0}{{fill:none;stroke:black}}"
+        f".{C1}{{text-anchor:middle;font-family:Times,serif;font-size:14px}}"
+        "]]></style>"
+        "</svg>"
+    )
+    assert actual == expected
+
+
+def test_optimize_svg_shared_classes():
+    other = SVG.replace('fill="none"', 'fill="red"')
+    names = [
+        set(re.findall(r'class="(c[0-9a-f]+)"', nxv.optimize_svg(svg).decode("utf-8")))
+        for svg in [SVG, other]
+    ]
+    assert names[0] & names[1] == {C1}
+
+
+def test_optimize_svg_transform():
+    svg = '<svg><g transform="scale(1.333333 1.333333) rotate(0.123) translate(4.567 112.001)"/></svg>'
+    actual = nxv.optimize_svg(svg, precision=1).decode("utf-8")
+    assert (
+        'transform="scale(1.333333 1.333333) rotate(0.1) translate(4.6 112)"' in actual
+    )
+
+
+def test_optimize_svg_noop():
+    actual = nxv.optimize_svg(SVG, precision=None, hoist=False, minify=False)
+    assert actual.decode("utf-8") == SVG
+
+
+def test_optimize_svg_chunks():
+    data = SVG.encode("utf-8")
+    expected = nxv.optimize_svg(data)
+    for size in range(1, 64):
+        chunks = [data[i : i + size] for i in range(0, len(data), size)]
+        assert nxv.optimize_svg(chunks) == expected
+
+
+def test_optimize_svg_compress():
+    actual = nxv.optimize_svg(SVG, compress=True)
+    assert gzip.decompress(actual) == nxv.optimize_svg(SVG)
+
+
+def test_render_optimize_requires_svg():
+    graph = nx.Graph()
+    graph.add_node(0)
+    with pytest.raises(ValueError):
+        nxv.render(graph, format="raw", optimize=True)
+
+
+def test_render_optimize(fake_installation):
+    bin, _ = fake_installation
+    graph = nx.Graph()
+    graph.add_node(0)
+    with patch("nxv._graphviz.run", return_value=SVG.encode("utf-8")):
+        actual = nxv.render(
+            graph, format="svg", graphviz_bin=bin, optimize={"compress": True}
+        )
+    assert gzip.decompress(actual) == nxv.optimize_svg(SVG)
@@ -83,6 +83,33 @@ def test_boundary_invalid_subgraph():
     assert str(info.value) == "The subgraph contains nodes not in the graph."
 
 
+def test_boundaries():
+    g = nx.Graph()
+    g.add_edges_from([(1, 2), (1, 3), (2, 3), (3, 4), (4, 5)])
+    h1 = g.subgraph({1, 2, 3})
+    h2 = g.subgraph({3, 4})
+    h3 = g.subgraph({4, 5})
+    assert _util.boundaries(g, [h1, h2, h3]) == [{3}, {3, 4}, {4}]
+
+
+def test_boundaries_multi():
+    g = nx.MultiGraph()
+    g.add_edges_from([(1, 2), (1, 2), (2, 3)])
+    h = nx.MultiGraph()
+    h.add_edges_from([(1, 2), (2, 3)])
+    assert _util.boundaries(g, [g.subgraph({1, 2}), h]) == [{2}, {1, 2}]
+
+
+def test_boundaries_invalid_subgraph():
+    g = nx.Graph()
+    g.add_edges_from([(1, 2), (2, 3)])
+    h = nx.Graph()
+    h.add_nodes_from([1, 7])
+    with pytest.raises(ValueError) as info:
+        _util.boundaries(g, [g.subgraph({1, 2}), h])
+    assert str(info.value) == "The subgraph contains nodes not in the graph."
+
+
 def test_to_ordered_graph():
     g = nx.Graph()
     g.add_edges_from([(2, 0), (1, 2), (1, 0)])
@@ -121,3 +148,23 @@ def test_contrasting_color_custom_options():
     assert _util.contrasting_color(
         (0.01, 0.01, 0.01), options=((1, 0, 0), (1, 0, 1), (0, 0, 1))
     ) == (1, 0, 1)
+
+
+def test_contrasting_colors():
+    np = pytest.importorskip("numpy")
+    channels = np.array(
+        [(0, 0, 0), (1, 0, 0), (0, 0, 1), (1, 1, 1), (0.01, 0.01, 0.01)], dtype=float
+    )
+    for options in [None, ((1, 0, 0), (1, 0, 1), (0, 0, 1))]:
+        actual = _util.contrasting_colors(channels, options=options)
+        expected = [_util.contrasting_color(c, options=options) for c in channels]
+        assert actual == expected
+    assert _util.contrasting_colors(channels[:2], options=()) == [(0, 0, 0)] * 2
+    options = np.array([(0, 0, 0), (1, 1, 1)], dtype=float)
+    assert _util.contrasting_colors(channels[:1], options=options)[0].tolist() == [
+        1,
+        1,
+        1,
+    ]
+    assert _util.contrasting_color(channels[0], options=options).tolist() == [1, 1, 1]
+    assert _util.contrasting_colors([(float("nan"), 0, 0)]) == [(1, 1, 1)]